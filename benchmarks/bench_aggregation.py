@@ -0,0 +1,70 @@
+"""
+Benchmark provider and age-range aggregation of capitation reports.
+
+Compares the old formatter approach (regroup the row dicts, then separate
+sum() passes per provider for quantity and totalAmount) with the single
+aggregation pass over a CapitationTable, which also yields age-range totals,
+the provider x age-range pivot and grand totals.
+
+Usage:
+    python benchmarks/bench_aggregation.py [providers ...]
+"""
+
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic_data import make_capitation_rows
+from mcp_server.aggregation import NUMPY_AVAILABLE, _aggregate_python, aggregate
+from mcp_server.report_table import CapitationTable
+
+def old_totals(rows):
+    providers = {}
+    for row in rows:
+        provider_name = row.get("providerName", "Unknown")
+        if provider_name not in providers:
+            providers[provider_name] = []
+        providers[provider_name].append(row)
+    return [
+        (
+            sum(row.get("quantity", 0) for row in provider_rows),
+            sum(row.get("totalAmount", 0) for row in provider_rows)
+        )
+        for provider_rows in providers.values()
+    ]
+
+def best_of(func, arg, repeat=5):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(arg)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100, 1000, 5000, 20000]
+    print(f"numpy available: {NUMPY_AVAILABLE}")
+    print(f"{'providers':>9} {'rows':>8} {'old ms':>9} {'python ms':>10} {'aggregate ms':>13} {'us/row':>7}")
+
+    for providers in sizes:
+        rows = make_capitation_rows(providers)
+        table = CapitationTable(rows)
+
+        totals = aggregate(table)
+        expected = old_totals(rows)
+        assert totals.provider_quantity == [quantity for quantity, _ in expected], "quantity totals differ"
+        assert all(abs(a - b) < 1e-6 for a, (_, b) in zip(totals.provider_amount, expected)), "amount totals differ"
+
+        old_ms = best_of(old_totals, rows) * 1000
+        python_ms = best_of(_aggregate_python, table) * 1000
+        aggregate_ms = best_of(aggregate, table) * 1000
+        print(
+            f"{providers:>9} {len(rows):>8} {old_ms:>9.2f} {python_ms:>10.2f} {aggregate_ms:>13.2f} "
+            f"{aggregate_ms * 1000 / len(rows):>7.3f}"
+        )
+
+if __name__ == "__main__":
+    main()
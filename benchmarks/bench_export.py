@@ -0,0 +1,52 @@
+"""
+Benchmark streaming report exports.
+
+Streams a capitation report as CSV, XLSX and PDF without collecting the
+output and reports the size, time and peak traced memory of the export
+itself (the report data is built beforehand). Peak memory should stay flat
+as the number of providers grows.
+
+Usage:
+    python benchmarks/bench_export.py [providers ...]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic_data import make_capitation_report
+from mcp_server.export import EXPORT_FORMATS, capitation_report_sheet, iter_export
+from mcp_server.report_table import CapitationTable
+
+def run(report, export_format, trace):
+    if trace:
+        tracemalloc.start()
+    start = time.perf_counter()
+    size = 0
+    for chunk in iter_export(capitation_report_sheet(report), export_format):
+        size += len(chunk)
+    elapsed = time.perf_counter() - start
+    peak = 0
+    if trace:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return size, elapsed, peak
+
+def main():
+    counts = [int(arg) for arg in sys.argv[1:]] or [1_000, 20_000]
+    print(f"{'providers':>10} {'format':>7} {'output MB':>10} {'time s':>8} {'peak MB':>8}")
+
+    for providers in counts:
+        report = make_capitation_report(providers)
+        # Build the table up front, as the tools have already done after viewing a report
+        CapitationTable.for_report(report).aggregates
+        for export_format in EXPORT_FORMATS:
+            size, elapsed, _ = run(report, export_format, trace=False)
+            _, _, peak = run(report, export_format, trace=True)
+            print(f"{providers:>10} {export_format:>7} {size / 1e6:>10.1f} {elapsed:>8.2f} {peak / 1e6:>8.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark upstream response decoding for large capitation reports.
+
+Compares the old path (response.text() followed by response.json(), i.e.
+the body decoded to str twice and parsed with the stdlib), the single
+read + single fast decode path, and incremental parsing of the results
+array from 64 KB chunks.
+
+Usage:
+    python benchmarks/bench_json_decode.py [providers ...]
+"""
+
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic_data import make_capitation_report
+from mcp_server.json_stream import FAST_JSON_AVAILABLE, ResultsStreamParser, decode_json
+
+CHUNK_SIZE = 64 * 1024
+
+def old_path(path):
+    with open(path, "rb") as f:
+        body = f.read()
+    response_text = body.decode("utf-8")
+    return json.loads(body.decode("utf-8"))
+
+def single_decode(path):
+    with open(path, "rb") as f:
+        body = f.read()
+    return decode_json(body)
+
+def streamed(path):
+    parser = ResultsStreamParser()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            parser.feed(chunk)
+    return parser.close()
+
+def measure(func, path, repeat=3):
+    """Return (best CPU seconds, peak traced bytes, row count) for one decode path."""
+    cpu = None
+    for _ in range(repeat):
+        gc.collect()
+        started = time.process_time()
+        result = func(path)
+        elapsed = time.process_time() - started
+        cpu = elapsed if cpu is None else min(cpu, elapsed)
+        rows = len(result["data"]["results"])
+        del result
+
+    # Peak memory is measured in a separate run; tracing slows decoding down a lot
+    gc.collect()
+    tracemalloc.start()
+    result = func(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return cpu, peak, rows
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1000, 5000, 20000]
+    print(f"msgspec available: {FAST_JSON_AVAILABLE}")
+    print(f"{'providers':>9} {'body MB':>8} {'mode':<14} {'rows':>8} {'cpu ms':>9} {'peak MB':>9}")
+
+    for providers in sizes:
+        with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as f:
+            f.write(json.dumps(make_capitation_report(providers)).encode("utf-8"))
+            path = f.name
+        try:
+            body_mb = os.path.getsize(path) / 1e6
+            expected = single_decode(path)
+            assert streamed(path) == expected, "streamed result differs from single decode"
+
+            for name, func in (("text+json", old_path), ("single-decode", single_decode), ("streamed", streamed)):
+                cpu, peak, rows = measure(func, path)
+                print(f"{providers:>9} {body_mb:>8.1f} {name:<14} {rows:>8} {cpu * 1000:>9.1f} {peak / 1e6:>9.1f}")
+        finally:
+            os.unlink(path)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Compare payload sizes of the full and compact report markup.
+
+The full layout repeats inline styles on every cell and keeps template
+indentation; the compact layout uses the shared classes in style.css and
+minified templates. The structured mode sends the report data as JSON for
+the browser to render. Sizes are shown raw and gzip-compressed (as sent
+when the transport compresses).
+
+Usage:
+    python benchmarks/bench_render_size.py [providers ...]
+"""
+
+import gzip
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic_data import make_capitation_report
+from mcp_server.rendering import render_income_providers_simple_table, render_report_summary
+from mcp_server.report_table import CapitationTable
+from mcp_server.structured import capitation_report_payload, embed_payload, income_providers_payload
+
+def sizes(html):
+    raw = html.encode("utf-8")
+    return len(raw), len(gzip.compress(raw))
+
+def show(label, full, compact, structured):
+    full_raw, full_gz = sizes(full)
+    compact_raw, compact_gz = sizes(compact)
+    structured_raw, structured_gz = sizes(structured)
+    print(
+        f"{label:<34} {full_raw / 1024:>9.1f} {compact_raw / 1024:>11.1f} {structured_raw / 1024:>9.1f} "
+        f"{full_gz / 1024:>9.1f} {compact_gz / 1024:>11.1f} {structured_gz / 1024:>8.1f}"
+    )
+
+def main():
+    # A typical monthly report covers a few dozen providers across the standard age ranges
+    counts = [int(arg) for arg in sys.argv[1:]] or [30, 200]
+    print(
+        f"{'payload':<34} {'full KB':>9} {'compact KB':>11} {'json KB':>9} "
+        f"{'full gz':>9} {'compact gz':>11} {'json gz':>8}"
+    )
+
+    for providers in counts:
+        report = make_capitation_report(providers)
+        table = CapitationTable(report["data"]["results"])
+        total_records = report["data"]["totalRecords"]
+        show(
+            f"capitation report, {providers} providers",
+            render_report_summary(table, total_records),
+            render_report_summary(table, total_records, compact=True),
+            embed_payload(capitation_report_payload(report))
+        )
+
+        roster = {
+            "totalRecords": providers,
+            "results": [{"fullName": name} for name in table.providers]
+        }
+        show(
+            f"income providers, {providers} providers",
+            render_income_providers_simple_table(roster),
+            render_income_providers_simple_table(roster, compact=True),
+            embed_payload(income_providers_payload(roster))
+        )
+
+if __name__ == "__main__":
+    main()
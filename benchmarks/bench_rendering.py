@@ -0,0 +1,81 @@
+"""
+Benchmark report summary rendering from 10 to 10,000 providers.
+
+Compares the previous renderer (string += per section and row, provider
+position looked up with list(providers.keys()).index(...)) with the
+precompiled-template, list-join renderer. Time per provider should stay flat
+for the new renderer as the report grows.
+
+Usage:
+    python benchmarks/bench_rendering.py [providers ...]
+"""
+
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic_data import make_capitation_report
+from mcp_server.rendering import SUMMARY_TEMPLATES, render_report_summary
+from mcp_server.report_table import CapitationTable
+
+def old_render(report):
+    """The previous rendering loop, reduced to its string building pattern."""
+    data = report["data"]
+    providers = {}
+    for result in data["results"]:
+        providers.setdefault(result.get("providerName", "Unknown"), []).append(result)
+
+    html_output = SUMMARY_TEMPLATES.header(total_records=data["totalRecords"])
+    for provider_name, provider_results in providers.items():
+        provider_total_quantity = sum(result.get("quantity", 0) for result in provider_results)
+        provider_total_amount = sum(result.get("totalAmount", 0) for result in provider_results)
+        margin_class = "mt-3" if list(providers.keys()).index(provider_name) > 0 else ""
+        html_output += SUMMARY_TEMPLATES.provider_open(margin_class=margin_class, provider_name=provider_name)
+        for result in provider_results:
+            html_output += SUMMARY_TEMPLATES.row(
+                age_range=result.get("ageRange", "N/A"),
+                capitation_amount=result.get("capitationAmount", 0),
+                quantity=result.get("quantity", 0),
+                total_amount=result.get("totalAmount", 0)
+            )
+        html_output += SUMMARY_TEMPLATES.provider_close(
+            total_quantity=provider_total_quantity,
+            total_amount=provider_total_amount
+        )
+    html_output += SUMMARY_TEMPLATES.footer()
+    return html_output
+
+def new_render(report):
+    """Build the table and render it, as format_report_summary does."""
+    table = CapitationTable(report["data"]["results"])
+    return render_report_summary(table, report["data"]["totalRecords"])
+
+def best_of(func, arg, repeat=3):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(arg)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10, 100, 1000, 5000, 10000]
+    print(f"{'providers':>9} {'KB':>8} {'old ms':>9} {'new ms':>9} {'old us/prov':>12} {'new us/prov':>12}")
+
+    for providers in sizes:
+        report = make_capitation_report(providers)
+        html = new_render(report)
+        assert html == old_render(report), "renderers disagree"
+
+        old_s = best_of(old_render, report)
+        new_s = best_of(new_render, report)
+        print(
+            f"{providers:>9} {len(html.encode()) / 1024:>8.0f} {old_s * 1000:>9.1f} {new_s * 1000:>9.1f} "
+            f"{old_s * 1e6 / providers:>12.1f} {new_s * 1e6 / providers:>12.1f}"
+        )
+
+if __name__ == "__main__":
+    main()
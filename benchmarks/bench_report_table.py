@@ -0,0 +1,80 @@
+"""
+Benchmark memory held by capitation report rows.
+
+Compares the retained size of the decoded dict-per-row results list with the
+columnar CapitationTable built from it, and the time to group rows by
+provider and total them both ways.
+
+Usage:
+    python benchmarks/bench_report_table.py [providers ...]
+"""
+
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic_data import make_capitation_rows
+from mcp_server.json_stream import decode_json
+from mcp_server.report_table import CapitationTable
+
+def retained(build):
+    """Return (object, bytes still allocated after build() returns)."""
+    gc.collect()
+    tracemalloc.start()
+    obj = build()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, current
+
+def group_dicts(rows):
+    providers = {}
+    for row in rows:
+        providers.setdefault(row.get("providerName", "Unknown"), []).append(row)
+    return [
+        (name, sum(r.get("quantity", 0) for r in group), sum(r.get("totalAmount", 0) for r in group))
+        for name, group in providers.items()
+    ]
+
+def group_table(table):
+    return [
+        (provider.name, provider.total_quantity, provider.total_amount)
+        for provider in table.group_by_provider()
+    ]
+
+def best_of(func, arg, repeat=3):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(arg)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1000, 5000, 20000]
+    print(f"{'providers':>9} {'rows':>8} {'dict MB':>9} {'table MB':>9} {'ratio':>6} {'dict grp ms':>12} {'table grp ms':>13}")
+
+    for providers in sizes:
+        body = json.dumps(make_capitation_rows(providers)).encode("utf-8")
+
+        # Decode inside the traced region so the dicts are fresh allocations, as after a fetch
+        rows, dict_bytes = retained(lambda: decode_json(body))
+        table, table_bytes = retained(lambda: CapitationTable(rows))
+        assert table.to_rows() == rows, "table does not round-trip"
+        assert group_table(table) == group_dicts(rows), "grouped totals differ"
+
+        dict_ms = best_of(group_dicts, rows) * 1000
+        table_ms = best_of(group_table, table) * 1000
+        print(
+            f"{providers:>9} {len(rows):>8} {dict_bytes / 1e6:>9.1f} {table_bytes / 1e6:>9.1f} "
+            f"{dict_bytes / table_bytes:>6.1f} {dict_ms:>12.1f} {table_ms:>13.1f}"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+"""
+Local stand-in for the indici API, for offline load tests and benchmarks.
+
+Serves ProviderCapitationReport, GetAllIncomeProvidersForProviderCapitaionReport
+and Login/AdLogin with synthetic data shaped like the upstream responses.
+Report sizes, the latency distribution (log-normal around a median), the
+injected error rate and a token-bucket rate limit are configurable, so the
+whole stack can be exercised end-to-end on one machine with no network:
+
+    python benchmarks/mock_indici_api.py --port 5010 --providers 200 --latency-ms 150 --error-rate 0.01
+    INDICI_API_BASE_URL=http://127.0.0.1:5010 python run_app.py
+
+Identical report requests return identical bodies with a strong ETag, so
+response caching and conditional requests behave as they would upstream.
+Counters are served at /mock/stats.
+
+Usage:
+    python benchmarks/mock_indici_api.py [--help]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import os
+import random
+import sys
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from datetime import date
+from typing import Dict, List, Optional
+
+from aiohttp import web
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic_data import AGE_RANGES, make_capitation_rows, make_provider_names
+
+logger = logging.getLogger(__name__)
+
+# Rendered report bodies kept for repeated requests
+BODY_CACHE_SIZE = 256
+
+@dataclass
+class MockSettings:
+    """Behaviour of the mock API."""
+    practices: int = 3
+    providers: int = 40
+    rows_per_provider: int = len(AGE_RANGES)
+    latency_ms: float = 120.0
+    latency_sigma: float = 0.5
+    latency_per_1k_rows_ms: float = 2.0
+    error_rate: float = 0.0
+    error_status: int = 503
+    rate_limit: float = 0.0
+    rate_burst: int = 20
+    seed: int = 42
+
+class TokenBucket:
+    """Requests-per-second limiter; the event loop is single-threaded, so no locking."""
+
+    def __init__(self, rate: float, burst: int):
+        """Initialize a full bucket."""
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+
+    def take(self) -> float:
+        """
+        Take a token if one is available.
+
+        Returns:
+            0 if the request may proceed, otherwise seconds until a token is free
+        """
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+class MockIndiciAPI:
+    """aiohttp application serving synthetic indici API responses."""
+
+    def __init__(self, settings: MockSettings):
+        """Initialize the mock from its settings."""
+        self.settings = settings
+        self.rng = random.Random(settings.seed)
+        self.bucket = TokenBucket(settings.rate_limit, settings.rate_burst) if settings.rate_limit > 0 else None
+        self._rosters: Dict[int, List[str]] = {}
+        self._bodies: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self.counters = {
+            "requests": 0,
+            "reports": 0,
+            "rosters": 0,
+            "ad_logins": 0,
+            "not_modified": 0,
+            "injected_errors": 0,
+            "rate_limited": 0,
+            "bytes_sent": 0
+        }
+
+    def create_app(self) -> web.Application:
+        """Build the aiohttp application."""
+        app = web.Application(middlewares=[self._upstream_behaviour])
+        app.router.add_get("/api/Reports/ProviderCapitationReport", self.provider_capitation_report)
+        app.router.add_get(
+            "/api/Reports/GetAllIncomeProvidersForProviderCapitaionReport",
+            self.income_providers
+        )
+        app.router.add_post("/api/Login/AdLogin", self.ad_login)
+        app.router.add_get("/", self.root)
+        app.router.add_get("/mock/stats", self.stats)
+        return app
+
+    def _latency(self) -> float:
+        """Draw a response delay in seconds from a log-normal distribution around the median."""
+        if self.settings.latency_ms <= 0:
+            return 0.0
+        median = self.settings.latency_ms / 1000
+        return median * math.exp(self.rng.gauss(0, self.settings.latency_sigma))
+
+    @web.middleware
+    async def _upstream_behaviour(self, request: web.Request, handler) -> web.StreamResponse:
+        """Apply the rate limit, latency and injected errors to API routes."""
+        if not request.path.startswith("/api/"):
+            return await handler(request)
+
+        self.counters["requests"] += 1
+        wait = self.bucket.take() if self.bucket else 0.0
+        if wait:
+            self.counters["rate_limited"] += 1
+            return web.json_response(
+                {"success": False, "error": "Too many requests"},
+                status=429,
+                headers={"Retry-After": str(max(1, math.ceil(wait)))}
+            )
+
+        await asyncio.sleep(self._latency())
+        if self.settings.error_rate and self.rng.random() < self.settings.error_rate:
+            self.counters["injected_errors"] += 1
+            return web.json_response(
+                {"success": False, "error": "Injected upstream error"},
+                status=self.settings.error_status
+            )
+
+        response = await handler(request)
+        if isinstance(response, web.Response) and isinstance(response.body, bytes):
+            self.counters["bytes_sent"] += len(response.body)
+        return response
+
+    def roster(self, practice_id: int) -> List[str]:
+        """Provider names of a practice (empty for unknown practices)."""
+        if not 1 <= practice_id <= self.settings.practices:
+            return []
+        if practice_id not in self._rosters:
+            self._rosters[practice_id] = make_provider_names(self.settings.providers, self.settings.seed + practice_id)
+        return self._rosters[practice_id]
+
+    @staticmethod
+    def _practice_id(request: web.Request) -> Optional[int]:
+        try:
+            return int(request.query.get("practiceId", ""))
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _upstream_date(value: Optional[str], default: date) -> str:
+        """Echo a date the way the API does (YYYY-MM-DDT00:00:00)."""
+        try:
+            parsed = date.fromisoformat(value[:10]) if value else default
+        except ValueError:
+            parsed = default
+        return f"{parsed.isoformat()}T00:00:00"
+
+    def _report_body(self, practice_id: int, query: Dict[str, str]) -> tuple:
+        """Build (or reuse) the JSON body, ETag and row count of a report."""
+        key = (practice_id, tuple(sorted(query.items())))
+        cached = self._bodies.get(key)
+        if cached is not None:
+            self._bodies.move_to_end(key)
+            return cached
+
+        today = date.today()
+        names = self.roster(practice_id)
+        wanted = {name.strip().casefold() for name in query.get("providerName", "").split(",") if name.strip()}
+        selected = [name for name in names if not wanted or name.casefold() in wanted]
+
+        # Same parameters, same numbers; different ranges or locations get different ones
+        seed = int.from_bytes(hashlib.sha1(repr(key).encode()).digest()[:4], "big")
+        rows = make_capitation_rows(len(selected), self.settings.rows_per_provider, seed, selected)
+        rows.sort(key=lambda row: row["providerName"].casefold())
+        payload = {
+            "success": True,
+            "data": {
+                "totalRecords": len(rows),
+                "providerName": query.get("providerName", ""),
+                "dateFrom": self._upstream_date(query.get("dateFrom"), today.replace(month=1, day=1)),
+                "dateTo": self._upstream_date(query.get("dateTo"), today),
+                "results": rows
+            }
+        }
+        body = json.dumps(payload, separators=(",", ":")).encode()
+        entry = (body, f'"{hashlib.sha1(body).hexdigest()}"', len(rows))
+        self._bodies[key] = entry
+        if len(self._bodies) > BODY_CACHE_SIZE:
+            self._bodies.popitem(last=False)
+        return entry
+
+    async def provider_capitation_report(self, request: web.Request) -> web.Response:
+        """GET /api/Reports/ProviderCapitationReport"""
+        practice_id = self._practice_id(request)
+        if practice_id is None:
+            return web.json_response({"success": False, "error": "practiceId is required"}, status=400)
+
+        self.counters["reports"] += 1
+        body, etag, rows = self._report_body(practice_id, dict(request.query))
+        if request.headers.get("If-None-Match") == etag:
+            self.counters["not_modified"] += 1
+            return web.Response(status=304, headers={"ETag": etag})
+
+        # Larger reports take longer to produce upstream
+        if self.settings.latency_per_1k_rows_ms:
+            await asyncio.sleep(rows / 1000 * self.settings.latency_per_1k_rows_ms / 1000)
+        return web.Response(body=body, content_type="application/json", headers={"ETag": etag})
+
+    async def income_providers(self, request: web.Request) -> web.Response:
+        """GET /api/Reports/GetAllIncomeProvidersForProviderCapitaionReport"""
+        practice_id = self._practice_id(request)
+        if practice_id is None:
+            return web.json_response({"success": False, "error": "practiceId is required"}, status=400)
+
+        self.counters["rosters"] += 1
+        results = [
+            {"patientID": practice_id * 100000 + index, "fullName": name, "providerID": f"P{practice_id:02d}{index:05d}"}
+            for index, name in enumerate(self.roster(practice_id))
+        ]
+        return web.json_response({"success": True, "data": {"totalRecords": len(results), "results": results}})
+
+    async def ad_login(self, request: web.Request) -> web.Response:
+        """POST /api/Login/AdLogin"""
+        try:
+            payload = await request.json()
+        except (ValueError, UnicodeDecodeError):
+            payload = {}
+        username = str(payload.get("userName") or "").strip()
+        if not username:
+            return web.json_response({"success": False, "error": "userName is required"}, status=400)
+
+        self.counters["ad_logins"] += 1
+        parts = [part.capitalize() for part in username.split("@")[0].replace("_", ".").split(".") if part]
+        first_name, family_name = (parts[0], " ".join(parts[1:])) if parts else ("Mock", "User")
+        practices = [
+            {"practiceID": practice_id, "practiceName": f"Mock Practice {practice_id}", "isPrimary": practice_id == 1}
+            for practice_id in range(1, self.settings.practices + 1)
+        ]
+        return web.json_response({
+            "success": True,
+            "data": {
+                "user": {
+                    "fullName": f"{first_name} {family_name}".strip(),
+                    "firstName": first_name,
+                    "familyName": family_name,
+                    "email": username,
+                    "profileType": "Doctor"
+                },
+                "practices": practices
+            }
+        })
+
+    async def root(self, request: web.Request) -> web.Response:
+        """GET / (the health probe's light path)"""
+        return web.Response(text="OK")
+
+    async def stats(self, request: web.Request) -> web.Response:
+        """GET /mock/stats"""
+        return web.json_response({"settings": asdict(self.settings), **self.counters})
+
+def main():
+    """Command line entry point."""
+    defaults = MockSettings()
+    parser = argparse.ArgumentParser(description="Run a local stand-in for the indici API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5010)
+    parser.add_argument("--practices", type=int, default=defaults.practices, help="Practices 1..N have data")
+    parser.add_argument("--providers", type=int, default=defaults.providers, help="Providers per practice")
+    parser.add_argument("--rows-per-provider", type=int, default=defaults.rows_per_provider)
+    parser.add_argument("--latency-ms", type=float, default=defaults.latency_ms, help="Median response latency")
+    parser.add_argument("--latency-sigma", type=float, default=defaults.latency_sigma,
+                        help="Log-normal shape; 0 gives a fixed latency, 1 a long tail")
+    parser.add_argument("--latency-per-1k-rows-ms", type=float, default=defaults.latency_per_1k_rows_ms,
+                        help="Extra report latency per 1000 rows")
+    parser.add_argument("--error-rate", type=float, default=defaults.error_rate, help="Fraction of API requests that fail")
+    parser.add_argument("--error-status", type=int, default=defaults.error_status)
+    parser.add_argument("--rate-limit", type=float, default=defaults.rate_limit,
+                        help="Requests per second before answering 429 (0 disables)")
+    parser.add_argument("--rate-burst", type=int, default=defaults.rate_burst)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    args = parser.parse_args()
+
+    settings = MockSettings(**{
+        name: getattr(args, name) for name in asdict(defaults)
+    })
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    logger.info(f"Mock indici API settings: {asdict(settings)}")
+    web.run_app(MockIndiciAPI(settings).create_app(), host=args.host, port=args.port, access_log=None)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Synthetic indici API payloads for benchmarks."""
+
+import random
+from typing import Any, Dict, List, Optional
+
+AGE_RANGES = [
+    "00-04", "05-14", "15-24", "25-44", "45-64", "65-74", "75+"
+]
+
+FIRST_NAMES = [
+    "Aroha", "Ahmad", "Amelia", "Ben", "Charlotte", "Daniel", "Emma", "Fatima", "Grace", "Hemi",
+    "Isla", "James", "Jane", "John", "Kiri", "Liam", "Mere", "Michael", "Noah", "Olivia",
+    "Priya", "Rawiri", "Sarah", "Tane", "Wei"
+]
+
+FAMILY_NAMES = [
+    "Brown", "Chen", "Clarke", "Harris", "Khan", "King", "Lee", "Martin", "Ngata", "Nguyen",
+    "Parata", "Patel", "Scott", "Singh", "Smith", "Taylor", "Thompson", "Walker", "Williams", "Wilson"
+]
+
+def make_provider_names(providers: int, seed: int = 42) -> List[str]:
+    """
+    Build distinct, realistic provider names.
+
+    Args:
+        providers: Number of names
+        seed: Random seed so runs are comparable
+
+    Returns:
+        List of names such as "Dr Priya Patel"; a number is appended once
+        the first/family name combinations run out
+    """
+    rng = random.Random(seed)
+    combinations = [(first, family) for first in FIRST_NAMES for family in FAMILY_NAMES]
+    rng.shuffle(combinations)
+    names = []
+    for p in range(providers):
+        first, family = combinations[p % len(combinations)]
+        title = "Dr " if rng.random() < 0.7 else ""
+        suffix = f" {p // len(combinations) + 1}" if p >= len(combinations) else ""
+        names.append(f"{title}{first} {family}{suffix}")
+    return names
+
+def make_capitation_rows(
+    providers: int,
+    rows_per_provider: int = len(AGE_RANGES),
+    seed: int = 42,
+    provider_names: Optional[List[str]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Build ProviderCapitationReport result rows.
+
+    Args:
+        providers: Number of distinct providers
+        rows_per_provider: Rows per provider (age ranges are cycled)
+        seed: Random seed so runs are comparable
+        provider_names: Names to use instead of "Doctor 00000 FINANCE - CN" (optional)
+
+    Returns:
+        List of row dicts shaped like the upstream "results" array
+    """
+    rng = random.Random(seed)
+    rows = []
+    for p in range(providers):
+        provider_name = provider_names[p] if provider_names else f"Doctor {p:05d} FINANCE - CN"
+        for r in range(rows_per_provider):
+            capitation_amount = round(rng.uniform(5, 120), 2)
+            quantity = rng.randint(0, 400)
+            rows.append({
+                "providerName": provider_name,
+                "ageRange": AGE_RANGES[r % len(AGE_RANGES)],
+                "capitationAmount": capitation_amount,
+                "quantity": quantity,
+                "totalAmount": round(capitation_amount * quantity, 2)
+            })
+    return rows
+
+def make_capitation_report(providers: int, rows_per_provider: int = len(AGE_RANGES), seed: int = 42) -> Dict[str, Any]:
+    """Build a full ProviderCapitationReport response."""
+    rows = make_capitation_rows(providers, rows_per_provider, seed)
+    return {
+        "success": True,
+        "data": {
+            "totalRecords": len(rows),
+            "providerName": "",
+            "dateFrom": "2024-01-01T00:00:00",
+            "dateTo": "2024-12-31T00:00:00",
+            "results": rows
+        }
+    }
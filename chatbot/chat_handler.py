@@ -41,6 +41,7 @@ class MCPChatHandler:
         self.performance_metrics = {
             "total_requests": 0,
             "intent_processed": 0,
+            "local_date_processed": 0,
             "groq_processed": 0,
             "qwen_processed": 0,
             "errors": 0,
@@ -266,6 +267,14 @@ class MCPChatHandler:
 
             logger.info(f"Processing message: '{message[:50]}...' (Intent: {use_intent}, Groq: {use_groq}, QWEN: {use_qwen})")
 
+            # A plain report request with one locally resolved period skips the LLM round trip;
+            # anything more specific keeps the LLM routing, with the resolved dates in its prompt
+            if self.config_manager.use_local_date_resolution():
+                report_request = self.intent_classifier.classify_report_request(message)
+                if report_request is not None:
+                    self.performance_metrics["local_date_processed"] += 1
+                    return await self._call_capitation_report_tool(report_request.parameters)
+
             # Process based on configuration with fallback support
             response = None
             last_error = None
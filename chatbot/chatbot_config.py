@@ -55,6 +55,10 @@ class SimpleConfigManager:
         """Check if QWEN model should be used."""
         return self.config.get("model_selection", {}).get("use_qwen", False)
 
+    def use_local_date_resolution(self) -> bool:
+        """Check if plain date-based report requests should skip the configured models."""
+        return self.config.get("model_selection", {}).get("local_date_resolution", True)
+
     def get_fallback_order(self) -> List[str]:
         """Get fallback order for model selection."""
         return self.config.get("model_selection", {}).get("fallback_order", ["intent", "groq", "qwen"])
@@ -137,6 +141,7 @@ class SimpleConfigManager:
                 "use_groq": False,
                 "use_intent": True,
                 "use_qwen": False,
+                "local_date_resolution": True,
                 "fallback_order": ["intent", "groq", "qwen"]
             },
             "sidebar_configuration": {
@@ -180,6 +185,7 @@ class SimpleConfigManager:
             "use_intent_approach": self.use_intent_approach(),
             "use_groq": self.use_groq(),
             "use_qwen": self.use_qwen(),
+            "local_date_resolution": self.use_local_date_resolution(),
             "fallback_order": self.get_fallback_order(),
             "sidebar_items_count": len(self.get_sidebar_items())
         }
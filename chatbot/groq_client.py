@@ -10,6 +10,7 @@ from groq import Groq
 from datetime import datetime
 
 from mcp_server.config import config
+from mcp_server.dates import find_relative_dates
 from .prompts import ERROR_MESSAGES
 
 logger = logging.getLogger(__name__)
@@ -86,6 +87,12 @@ class GroqChatbot:
         current_year_from = current_year_dates["date_from"]
         current_year_to = current_year_dates["date_to"]
 
+        # Date expressions are resolved locally, so the model only copies the range
+        resolved_dates_note = "".join(
+            f'\n- Requested period "{resolved.text}": {resolved.date_from} to {resolved.date_to} (use these exact dates)'
+            for resolved in find_relative_dates(message)
+        )
+
         # Enhanced but concise LLM prompt for intelligent intent recognition
         conversation_prompt = f"""
 ANALYZE USER MESSAGE: "{processed_message}"
@@ -93,7 +100,7 @@ ORIGINAL MESSAGE: "{message}"
 
 CURRENT DATES:
 - Month: {current_month_from} to {current_month_to}
-- Year: {current_year_from} to {current_year_to}
+- Year: {current_year_from} to {current_year_to}{resolved_dates_note}
 
 TOOLS AVAILABLE:
 {available_tools}
@@ -101,8 +108,9 @@ TOOLS AVAILABLE:
 RESPONSE RULES:
 1. Provider capitation/financial reports → TOOL_CALL: get_provider_capitation_report|{{params}}
 2. Provider lists → TOOL_CALL: get_all_income_providers|{{}}
-3. Health/status check → TOOL_CALL: health_check|{{}}
-4. Greetings/casual → Direct friendly response
+3. Same report for several practices, providers or locations → TOOL_CALL: get_batch_capitation_report|{{params}}
+4. Health/status check → TOOL_CALL: health_check|{{}}
+5. Greetings/casual → Direct friendly response
 
 PARAMETER EXTRACTION:
 - practice_id: ALWAYS include and set to 1 (0 is invalid)
@@ -122,6 +130,7 @@ EXAMPLES:
 "printable provider report" → TOOL_CALL: get_provider_capitation_report|{{"practice_id": 1, "print_report": true}}
 "monthly financial report" → TOOL_CALL: get_provider_capitation_report|{{"practice_id": 1, "date_from": "{current_month_from}", "date_to": "{current_month_to}"}}
 "print yearly summary" → TOOL_CALL: get_provider_capitation_report|{{"practice_id": 1, "date_from": "{current_year_from}", "date_to": "{current_year_to}", "print_report": true}}
+"capitation report for Dr. Smith and Dr. Jones" → TOOL_CALL: get_batch_capitation_report|{{"practice_ids": [1], "provider_names": ["Dr. Smith", "Dr. Jones"]}}
 "what providers do we have" → TOOL_CALL: get_all_income_providers|{{"practice_id": 1}}
 "is system working" → TOOL_CALL: health_check|{{}}
 "hello" → Hi! I'm your indici Reports assistant. How can I help you today?
@@ -10,8 +10,21 @@ from dataclasses import dataclass
 from enum import Enum
 from datetime import datetime, date
 
+from mcp_server.dates import find_relative_dates, resolve_relative
+
 logger = logging.getLogger(__name__)
 
+# What may remain of a message once its date expression is removed for the
+# report to be run without the LLM, e.g. "print the provider capitation report for"
+PLAIN_REPORT_REQUEST = re.compile(
+    r"(?:(?:please|pls|can you|could you)\s+)?"
+    r"(?:(?P<print>print)\s+(?:me\s+)?|(?:generate|get|show|run|give|create|pull|fetch|display)\s+(?:me\s+)?)?"
+    r"(?:(?:the|a|my|our)\s+)?"
+    r"(?:provider\s+capitation|capitation|provider)\s+report"
+    r"(?:\s+(?:for|from|of|covering|over|in|during))?(?:\s+the)?"
+    r"(?:\s+please)?[.!]?"
+)
+
 class IntentType(Enum):
     """Enumeration of all supported intents."""
     PROVIDER_CAPITATION_REPORT = "provider_capitation_report"
@@ -251,6 +264,39 @@ class ProfessionalIntentClassifier:
                 fallback_reason=f"Classification error: {str(e)}"
             )
     
+    def classify_report_request(self, message: str) -> Optional[IntentResult]:
+        """
+        Recognise a capitation report request that needs no LLM.
+
+        Only a plain report request with exactly one date expression
+        ("capitation report for last quarter", "print provider report since
+        March") is answered directly. Anything else (a practice, location,
+        provider, sort order, several periods or a question) is left to the
+        configured approach, which gets the resolved dates as context.
+
+        Args:
+            message: User input message
+
+        Returns:
+            IntentResult with the report parameters, or None
+        """
+        processed_message = self.preprocess_message(message)
+        date_ranges = find_relative_dates(processed_message)
+        if len(date_ranges) != 1:
+            return None
+
+        date_range = date_ranges[0]
+        remainder = " ".join(processed_message.replace(date_range.text, " ", 1).split())
+        request = PLAIN_REPORT_REQUEST.fullmatch(remainder)
+        if request is None:
+            return None
+
+        parameters = dict(zip(("date_from", "date_to"), date_range.iso()))
+        if request.group("print"):
+            parameters["print_report"] = True
+        logger.info(f"Report request resolved locally: {parameters}")
+        return IntentResult(IntentType.PROVIDER_CAPITATION_REPORT, 0.9, parameters)
+    
     def _match_pattern(self, message: str, intent_type: IntentType, pattern: IntentPattern) -> IntentResult:
         """Match message against a specific intent pattern."""
         confidence = 0.0
@@ -295,26 +341,35 @@ class ProfessionalIntentClassifier:
         if keyword_score > 0:
             confidence += min(keyword_score / len(pattern.keywords), 1.0) * 0.3
         
+        # Resolve date expressions locally; they take precedence over a bare "monthly" or "yearly"
+        name_message = message
+        if "monthly" in pattern.parameter_extractors or "yearly" in pattern.parameter_extractors:
+            date_range = resolve_relative(message)
+            if date_range:
+                parameters["date_from"], parameters["date_to"] = date_range.iso()
+                # Keep words like "for last quarter" out of the provider name
+                name_message = message.replace(date_range.text, " ")
+
         # Extract parameters
         for param_name, param_pattern in pattern.parameter_extractors.items():
             if param_name == "print_report":
                 if re.search(param_pattern, message, re.IGNORECASE):
                     parameters["print_report"] = True
             elif param_name == "monthly":
-                if re.search(param_pattern, message, re.IGNORECASE):
+                if "date_from" not in parameters and re.search(param_pattern, message, re.IGNORECASE):
                     parameters["date_from"] = self._get_current_month_start()
                     parameters["date_to"] = self._get_current_date()
             elif param_name == "yearly":
-                if re.search(param_pattern, message, re.IGNORECASE):
+                if "date_from" not in parameters and re.search(param_pattern, message, re.IGNORECASE):
                     parameters["date_from"] = self._get_current_year_start()
                     parameters["date_to"] = self._get_current_date()
             elif param_name == "provider_name":
-                match = re.search(param_pattern, message, re.IGNORECASE)
-                if match:
+                for match in re.finditer(param_pattern, name_message, re.IGNORECASE):
                     provider_name = match.group(1).strip().title()
                     # Clean up common false positives
-                    if provider_name.lower() not in ["capitation", "report", "provider", "monthly", "yearly"]:
+                    if provider_name and provider_name.lower() not in ["capitation", "report", "provider", "monthly", "yearly"]:
                         parameters["provider_name"] = provider_name
+                        break
         
         return IntentResult(intent_type, min(confidence, 1.0), parameters)
     
@@ -3,7 +3,7 @@
 import asyncio
 import json
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import aiohttp
 from datetime import datetime
 
@@ -54,7 +54,7 @@ class MCPClient:
                     "type": "object",
                     "properties": {
                         "practice_id": {"type": "integer", "description": "Practice ID (required)"},
-                        "date_from": {"type": "string", "description": "Start date (optional)"},
+                        "date_from": {"type": "string", "description": "Start date, or a relative expression such as \"last quarter\" (optional)"},
                         "date_to": {"type": "string", "description": "End date (optional)"},
                         "provider_name": {"type": "string", "description": "Provider Name(s) (optional)"},
                         "location_id": {"type": "string", "description": "Location ID(s) (optional)"},
@@ -64,6 +64,23 @@ class MCPClient:
                     "required": ["practice_id"]
                 }
             },
+            {
+                "name": "get_batch_capitation_report",
+                "description": "Get the same Provider Capitation Report for several practices, providers or locations at once, combined into one report with per-entity sections and totals",
+                "inputSchema": {
+                    "type": "object",
+                    "properties": {
+                        "practice_ids": {"type": "array", "items": {"type": "integer"}, "description": "Practice IDs (defaults to [1])"},
+                        "provider_names": {"type": "array", "items": {"type": "string"}, "description": "Provider names, one section each (optional)"},
+                        "location_ids": {"type": "array", "items": {"type": "string"}, "description": "Location IDs, one section each (optional)"},
+                        "date_from": {"type": "string", "description": "Start date, or a relative expression such as \"last quarter\" (optional)"},
+                        "date_to": {"type": "string", "description": "End date (optional)"},
+                        "practice_location_id": {"type": "integer", "description": "Practice Location ID (optional)"},
+                        "sort_by": {"type": "string", "description": "Sort by field (optional)"}
+                    },
+                    "required": []
+                }
+            },
             {
                 "name": "generate_provider_capitation_report",
                 "description": "Generate Provider Capitation Report using JSON request body",
@@ -114,6 +131,57 @@ class MCPClient:
             }
         ]
     
+    def _format_report(self, result: Dict[str, Any]) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """
+        Format a capitation report for chat delivery.
+
+        In structured mode the message carries the report data for the browser
+        to render; otherwise it carries (compact) HTML.
+
+        Returns:
+            Tuple of (message text, structured data or None)
+        """
+        from mcp_server.config import config
+        from mcp_server.structured import embed_payload
+        from mcp_server.tools import indici_tools
+
+        if config.render_response_mode == "structured":
+            data = indici_tools.format_report_data(result)
+            return embed_payload(data), data
+        return indici_tools.format_report_summary(result, compact=config.render_compact_html), None
+
+    def _format_batch_report(self, result: Dict[str, Any]) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """
+        Format a batch capitation report for chat delivery.
+
+        Returns:
+            Tuple of (message text, structured data or None)
+        """
+        from mcp_server.config import config
+        from mcp_server.structured import embed_payload
+        from mcp_server.tools import indici_tools
+
+        if config.render_response_mode == "structured":
+            data = indici_tools.format_batch_report_data(result)
+            return embed_payload(data), data
+        return indici_tools.format_batch_report(result, compact=config.render_compact_html), None
+
+    def _format_income_providers(self, data: Dict[str, Any]) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """
+        Format an income providers list for chat delivery.
+
+        Returns:
+            Tuple of (message text, structured data or None)
+        """
+        from mcp_server.config import config
+        from mcp_server.structured import embed_payload
+        from mcp_server.tools import indici_tools
+
+        if config.render_response_mode == "structured":
+            structured = indici_tools.format_income_providers_data(data)
+            return embed_payload(structured), structured
+        return indici_tools.format_income_providers_simple_table(data, compact=config.render_compact_html), None
+
     async def call_tool(self, name: str, arguments: Dict[str, Any]) -> 'MCPToolResult':
         """Call a tool on the MCP server."""
         try:
@@ -130,26 +198,31 @@ class MCPClient:
 
                 if print_report:
                     # Format for display in chat
-                    formatted_result = indici_tools.format_report_summary(result)
-                    # Generate print content for popup and auto-trigger
-                    print_content = indici_tools.format_print_report(result)
+                    formatted_result, data = self._format_report(result)
+                    # Keep the report so the print layout is rendered only when the window opens
+                    handle = indici_tools.register_print_report(result)
                     # Add automatic popup trigger to the display result
-                    popup_result = indici_tools.add_auto_print_popup(formatted_result, print_content)
-                    return MCPToolResult(content=[MCPTextContent(text=popup_result)])
+                    popup_result = indici_tools.add_print_trigger(formatted_result, handle)
+                    return MCPToolResult(content=[MCPTextContent(text=popup_result)], data=data)
                 else:
                     # Format for display only
-                    formatted_result = indici_tools.format_report_summary(result)
-                    return MCPToolResult(content=[MCPTextContent(text=formatted_result)])
+                    formatted_result, data = self._format_report(result)
+                    return MCPToolResult(content=[MCPTextContent(text=formatted_result)], data=data)
             
+            elif name == "get_batch_capitation_report":
+                result = await indici_tools.get_batch_capitation_report(**arguments)
+                formatted_result, data = self._format_batch_report(result)
+                return MCPToolResult(content=[MCPTextContent(text=formatted_result)], data=data)
+
             elif name == "generate_provider_capitation_report":
                 result = await indici_tools.generate_provider_capitation_report(**arguments)
-                formatted_result = indici_tools.format_report_summary(result)
-                return MCPToolResult(content=[MCPTextContent(text=formatted_result)])
+                formatted_result, data = self._format_report(result)
+                return MCPToolResult(content=[MCPTextContent(text=formatted_result)], data=data)
 
             elif name == "get_all_income_providers":
                 result = await indici_tools.get_all_income_providers(**arguments)
-                formatted_result = indici_tools.format_income_providers_simple_table(result.get("data", {}))
-                return MCPToolResult(content=[MCPTextContent(text=formatted_result)])
+                formatted_result, data = self._format_income_providers(result.get("data", {}))
+                return MCPToolResult(content=[MCPTextContent(text=formatted_result)], data=data)
 
             elif name == "health_check":
                 result = await indici_tools.health_check()
@@ -200,8 +273,10 @@ class MCPTextContent:
 class MCPToolResult:
     """Represents a tool result from MCP."""
     
-    def __init__(self, content: List[MCPTextContent]):
+    def __init__(self, content: List[MCPTextContent], data: Optional[Dict[str, Any]] = None):
         self.content = content
+        # Structured tool output, when the result was produced in structured mode
+        self.data = data
 
 # Global MCP client instance
 mcp_client = MCPClient()
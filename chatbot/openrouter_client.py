@@ -11,6 +11,7 @@ from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional
 
 from mcp_server.config import config
+from mcp_server.dates import find_relative_dates
 
 logger = logging.getLogger(__name__)
 
@@ -127,6 +128,12 @@ class OpenRouterChatbot:
         current_year_from = current_year_dates["date_from"]
         current_year_to = current_year_dates["date_to"]
 
+        # Date expressions are resolved locally, so the model only copies the range
+        resolved_dates_note = "".join(
+            f'\n- Requested period "{resolved.text}": {resolved.date_from} to {resolved.date_to} (use these exact dates)'
+            for resolved in find_relative_dates(message)
+        )
+
         conversation_prompt = f"""You are an intelligent assistant for the Indici Reports system. Your primary role is to help users generate Provider Capitation Reports and manage income provider data.
 
 IMPORTANT INSTRUCTIONS:
@@ -135,7 +142,7 @@ IMPORTANT INSTRUCTIONS:
 3. For conversational responses, respond naturally without the TOOL_CALL prefix
 4. Always use practice_id: 1 as the default unless specified otherwise (0 is invalid)
 5. Current month dates: {current_month_from} to {current_month_to}
-6. Current year dates: {current_year_from} to {current_year_to}
+6. Current year dates: {current_year_from} to {current_year_to}{resolved_dates_note}
 
 CRITICAL DATE RULES:
 - If user doesn't specify dates, DO NOT include date_from or date_to parameters (let API use defaults)
@@ -162,6 +169,7 @@ EXAMPLES:
 - "Show report for Av VOC PROVIDER" → TOOL_CALL: get_provider_capitation_report|{{"practice_id": 1, "provider_name": "Av VOC PROVIDER"}}
 - "Print report" → TOOL_CALL: get_provider_capitation_report|{{"practice_id": 1, "print_report": true}}
 - "List income providers" → TOOL_CALL: get_all_income_providers|{{"practice_id": 1, "practice_location_id": 0}}
+- "Compare capitation reports for practices 128 and 129 last quarter" → TOOL_CALL: get_batch_capitation_report|{{"practice_ids": [128, 129], "date_from": "last quarter"}}
 
 User Message: {processed_message}
 
@@ -0,0 +1,393 @@
+"""
+Persistent store of monthly capitation aggregates for closed months.
+
+Closed months of capitation data don't change, so their per-provider,
+per-age-range totals are kept in SQLite and combined with a live fetch of
+the open month instead of being re-fetched for every yearly report.
+
+Command line usage:
+    python -m mcp_server.aggregate_store backfill --practice-id 1 --from 2024-01 --to 2024-12
+    python -m mcp_server.aggregate_store rebuild --practice-id 1 --from 2024-01 --to 2024-12
+    python -m mcp_server.aggregate_store invalidate --practice-id 1 --month 2024-03
+    python -m mcp_server.aggregate_store list
+
+The command line invalidation only touches the database; use the web
+endpoint /api/aggregates/invalidate to also clear a running app's report cache.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+from contextlib import closing
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from .config import config
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS stored_months (
+    practice_id INTEGER NOT NULL,
+    scope TEXT NOT NULL,
+    month TEXT NOT NULL,
+    envelope TEXT NOT NULL,
+    stored_at TEXT NOT NULL,
+    PRIMARY KEY (practice_id, scope, month)
+);
+CREATE TABLE IF NOT EXISTS monthly_aggregates (
+    practice_id INTEGER NOT NULL,
+    scope TEXT NOT NULL,
+    month TEXT NOT NULL,
+    row_order INTEGER NOT NULL,
+    provider_name TEXT NOT NULL,
+    age_range TEXT NOT NULL,
+    capitation_amount REAL NOT NULL,
+    quantity INTEGER NOT NULL,
+    total_amount REAL NOT NULL,
+    PRIMARY KEY (practice_id, scope, month, row_order)
+);
+"""
+
+def month_key(value: date) -> str:
+    """Format a date as the YYYY-MM month key used by the store."""
+    return value.strftime("%Y-%m")
+
+def month_bounds(month: str) -> Tuple[date, date]:
+    """
+    Get the first and last day of a YYYY-MM month.
+
+    Args:
+        month: Month key, e.g. "2024-03"
+
+    Returns:
+        Tuple of (first_day, last_day)
+    """
+    first = datetime.strptime(month, "%Y-%m").date()
+    next_month = date(first.year + 1, 1, 1) if first.month == 12 else date(first.year, first.month + 1, 1)
+    return first, next_month - timedelta(days=1)
+
+def is_full_closed_month(start: date, end: date, today: Optional[date] = None) -> bool:
+    """Whether (start, end) covers exactly one calendar month that has already ended."""
+    today = today or date.today()
+    first, last = month_bounds(month_key(start))
+    return start == first and end == last and last < today
+
+class MonthlyAggregateStore:
+    """
+    SQLite-backed monthly aggregates keyed by practice, query scope and month.
+
+    The scope captures the remaining report filters (practice location,
+    locations, provider names, sort order) so a filtered report never reads
+    totals stored for a different filter.
+    """
+
+    def __init__(self, path: str, enabled: bool = True):
+        """Initialize the store; the database file is created on first use."""
+        self.path = path
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._initialized = False
+        self._counters = {
+            "month_hits": 0,
+            "month_misses": 0,
+            "months_stored": 0
+        }
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection, creating the schema if needed."""
+        if not self._initialized:
+            with self._lock:
+                if not self._initialized:
+                    directory = os.path.dirname(self.path)
+                    if directory:
+                        os.makedirs(directory, exist_ok=True)
+                    with closing(sqlite3.connect(self.path, timeout=10)) as connection:
+                        connection.executescript(_SCHEMA)
+                        connection.commit()
+                    self._initialized = True
+        return sqlite3.connect(self.path, timeout=10)
+
+    @staticmethod
+    def scope_for(params: Dict[str, Any]) -> str:
+        """
+        Build the scope string for report query parameters.
+
+        Args:
+            params: Report query parameters (dates are ignored)
+
+        Returns:
+            Stable JSON string of the non-date filters
+        """
+        scope = {
+            key: value for key, value in params.items()
+            if key not in ("practiceId", "dateFrom", "dateTo") and value is not None
+        }
+        return json.dumps(scope, sort_keys=True)
+
+    def get_month(self, params: Dict[str, Any], month: str) -> Optional[Dict[str, Any]]:
+        """
+        Load a stored month as an API-shaped report response.
+
+        Args:
+            params: Report query parameters (practiceId and filters)
+            month: Month key, e.g. "2024-03"
+
+        Returns:
+            Report response for the month, or None if it is not stored
+        """
+        if not self.enabled:
+            return None
+
+        practice_id = params.get("practiceId")
+        scope = self.scope_for(params)
+        with closing(self._connect()) as connection:
+            stored = connection.execute(
+                "SELECT envelope FROM stored_months WHERE practice_id = ? AND scope = ? AND month = ?",
+                (practice_id, scope, month)
+            ).fetchone()
+            if stored is None:
+                self._counters["month_misses"] += 1
+                return None
+
+            rows = connection.execute(
+                "SELECT provider_name, age_range, capitation_amount, quantity, total_amount "
+                "FROM monthly_aggregates WHERE practice_id = ? AND scope = ? AND month = ? ORDER BY row_order",
+                (practice_id, scope, month)
+            ).fetchall()
+
+        self._counters["month_hits"] += 1
+        results = [
+            {
+                "providerName": provider_name,
+                "ageRange": age_range,
+                "capitationAmount": capitation_amount,
+                "quantity": quantity,
+                "totalAmount": total_amount
+            }
+            for provider_name, age_range, capitation_amount, quantity, total_amount in rows
+        ]
+        envelope = json.loads(stored[0])
+        data = envelope.get("data") or {}
+        data["totalRecords"] = len(results)
+        data["results"] = results
+        envelope["data"] = data
+        return envelope
+
+    def put_month(self, params: Dict[str, Any], month: str, result: Dict[str, Any]) -> None:
+        """
+        Store the totals of a closed month, replacing any previous version.
+
+        Args:
+            params: Report query parameters (practiceId and filters)
+            month: Month key, e.g. "2024-03"
+            result: Successful report response for exactly that month
+        """
+        if not self.enabled:
+            return
+
+        practice_id = params.get("practiceId")
+        scope = self.scope_for(params)
+        data = result.get("data") or {}
+        envelope = {**result, "data": {key: value for key, value in data.items() if key != "results"}}
+        rows = [
+            (
+                practice_id, scope, month, order,
+                row.get("providerName", "Unknown"),
+                row.get("ageRange", "N/A"),
+                row.get("capitationAmount", 0) or 0,
+                row.get("quantity", 0) or 0,
+                row.get("totalAmount", 0) or 0
+            )
+            for order, row in enumerate(data.get("results") or [])
+        ]
+
+        with closing(self._connect()) as connection:
+            with connection:
+                self._delete(connection, practice_id, month, scope)
+                connection.execute(
+                    "INSERT INTO stored_months (practice_id, scope, month, envelope, stored_at) VALUES (?, ?, ?, ?, ?)",
+                    (practice_id, scope, month, json.dumps(envelope), datetime.now().isoformat())
+                )
+                connection.executemany(
+                    "INSERT INTO monthly_aggregates (practice_id, scope, month, row_order, provider_name, "
+                    "age_range, capitation_amount, quantity, total_amount) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+        self._counters["months_stored"] += 1
+        logger.info(f"Stored capitation aggregates for practice {practice_id}, month {month} ({len(rows)} rows)")
+
+    def invalidate_month(self, practice_id: int, month: str, scope: Optional[str] = None) -> int:
+        """
+        Remove a stored month, e.g. after upstream corrections.
+
+        Args:
+            practice_id: Practice ID
+            month: Month key, e.g. "2024-03"
+            scope: Only remove this query scope (all scopes if None)
+
+        Returns:
+            Number of stored month entries removed
+        """
+        with closing(self._connect()) as connection:
+            with connection:
+                removed = self._delete(connection, practice_id, month, scope)
+        logger.info(f"Invalidated {removed} stored month(s) for practice {practice_id}, month {month}")
+        return removed
+
+    def _delete(self, connection: sqlite3.Connection, practice_id: int, month: str, scope: Optional[str]) -> int:
+        """Delete a month's rows inside an open transaction."""
+        clause = "practice_id = ? AND month = ?"
+        args: Tuple = (practice_id, month)
+        if scope is not None:
+            clause += " AND scope = ?"
+            args += (scope,)
+        connection.execute(f"DELETE FROM monthly_aggregates WHERE {clause}", args)
+        return connection.execute(f"DELETE FROM stored_months WHERE {clause}", args).rowcount
+
+    def list_months(self, practice_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        List stored months.
+
+        Args:
+            practice_id: Only list this practice (all practices if None)
+
+        Returns:
+            List of dicts with practice_id, scope, month and stored_at
+        """
+        query = "SELECT practice_id, scope, month, stored_at FROM stored_months"
+        args: Tuple = ()
+        if practice_id is not None:
+            query += " WHERE practice_id = ?"
+            args = (practice_id,)
+        query += " ORDER BY practice_id, scope, month"
+        with closing(self._connect()) as connection:
+            return [
+                {"practice_id": row[0], "scope": row[1], "month": row[2], "stored_at": row[3]}
+                for row in connection.execute(query, args).fetchall()
+            ]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get store statistics for monitoring.
+
+        Returns:
+            Dict with the enabled flag, database path and hit/miss counters
+        """
+        return {
+            "enabled": self.enabled,
+            "path": self.path,
+            **self._counters
+        }
+
+def _month_range(month_from: str, month_to: str) -> List[str]:
+    """All month keys from month_from to month_to inclusive."""
+    months = []
+    current, _ = month_bounds(month_from)
+    last, _ = month_bounds(month_to)
+    while current <= last:
+        months.append(month_key(current))
+        _, month_end = month_bounds(month_key(current))
+        current = month_end + timedelta(days=1)
+    return months
+
+async def backfill(
+    practice_id: int,
+    month_from: str,
+    month_to: str,
+    practice_location_id: Optional[int] = None,
+    rebuild: bool = False
+) -> Dict[str, Any]:
+    """
+    Fetch closed months from the API and store their aggregates.
+
+    Args:
+        practice_id: Practice ID
+        month_from: First month key (YYYY-MM)
+        month_to: Last month key (YYYY-MM)
+        practice_location_id: Practice Location ID (optional)
+        rebuild: Re-fetch months that are already stored
+
+    Returns:
+        Dict with stored, skipped and failed month lists
+    """
+    from .http_client import http_client
+    from .tools import aggregate_store as store, indici_tools
+
+    summary = {"stored": [], "skipped": [], "failed": []}
+    for month in _month_range(month_from, month_to):
+        start, end = month_bounds(month)
+        if end >= date.today():
+            summary["skipped"].append(month)
+            continue
+
+        params = {"practiceId": practice_id}
+        if practice_location_id is not None:
+            params["practiceLocationId"] = practice_location_id
+
+        if not rebuild and store.get_month(params, month) is not None:
+            summary["skipped"].append(month)
+            continue
+
+        result = await indici_tools.fetch_month_aggregates(params, start, end, refresh=True)
+        if result.get("success", True):
+            summary["stored"].append(month)
+        else:
+            summary["failed"].append({"month": month, "error": result.get("error", "Unknown error")})
+
+    await http_client.close()
+    return summary
+
+def main():
+    """Command line entry point for backfill, rebuild and invalidation."""
+    parser = argparse.ArgumentParser(description="Manage the monthly capitation aggregate store.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    for name in ("backfill", "rebuild"):
+        sub = subparsers.add_parser(name, help=f"{name.capitalize()} closed months from the indici API")
+        sub.add_argument("--practice-id", type=int, required=True)
+        sub.add_argument("--practice-location-id", type=int)
+        sub.add_argument("--from", dest="month_from", required=True, help="First month (YYYY-MM)")
+        sub.add_argument("--to", dest="month_to", required=True, help="Last month (YYYY-MM)")
+
+    invalidate = subparsers.add_parser("invalidate", help="Drop a stored month after upstream corrections")
+    invalidate.add_argument("--practice-id", type=int, required=True)
+    invalidate.add_argument("--month", required=True, help="Month (YYYY-MM)")
+
+    listing = subparsers.add_parser("list", help="List stored months")
+    listing.add_argument("--practice-id", type=int)
+
+    args = parser.parse_args()
+    # Under "python -m" this module runs as __main__; use the instance the tools layer shares
+    from .aggregate_store import aggregate_store as store
+    logging.basicConfig(level=getattr(logging, config.logging_level), format=config.logging_format)
+
+    if args.command in ("backfill", "rebuild"):
+        # Backfill writes regardless of the enabled setting, which only controls the report path
+        store.enabled = True
+        summary = asyncio.run(backfill(
+            args.practice_id,
+            args.month_from,
+            args.month_to,
+            practice_location_id=args.practice_location_id,
+            rebuild=args.command == "rebuild"
+        ))
+        print(json.dumps(summary, indent=2))
+    elif args.command == "invalidate":
+        removed = store.invalidate_month(args.practice_id, args.month)
+        print(f"Removed {removed} stored month(s)")
+    else:
+        print(json.dumps(store.list_months(args.practice_id), indent=2))
+
+# Global instance
+aggregate_store = MonthlyAggregateStore(
+    path=config.aggregate_store_path,
+    enabled=config.aggregate_store_enabled
+)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""Single-pass provider and age-range aggregation of capitation report rows."""
+
+from dataclasses import dataclass
+from typing import Any, List
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+@dataclass
+class ReportAggregates:
+    """
+    All groupings of a capitation report.
+
+    Per-provider lists are indexed by provider code and per-age-range lists by
+    age-range code, matching CapitationTable.providers and .age_ranges. Pivots
+    are lists of rows, one per provider, with one column per age range.
+    Quantities stay integers when every row quantity is an integer.
+    """
+
+    provider_quantity: List[Any]
+    provider_amount: List[float]
+    age_quantity: List[Any]
+    age_amount: List[float]
+    pivot_quantity: List[List[Any]]
+    pivot_amount: List[List[float]]
+    grand_quantity: Any
+    grand_amount: float
+
+    @property
+    def provider_share(self) -> List[float]:
+        """Each provider's share of the grand total amount (0..1)."""
+        return _shares(self.provider_amount, self.grand_amount)
+
+    @property
+    def age_share(self) -> List[float]:
+        """Each age range's share of the grand total amount (0..1)."""
+        return _shares(self.age_amount, self.grand_amount)
+
+def _shares(amounts: List[float], grand_amount: float) -> List[float]:
+    """Divide amounts by the grand total, treating a zero total as zero shares."""
+    if not grand_amount:
+        return [0.0] * len(amounts)
+    return [amount / grand_amount for amount in amounts]
+
+def aggregate(table) -> ReportAggregates:
+    """
+    Compute every grouping of a CapitationTable in one pass.
+
+    Uses NumPy bincounts over the table's column buffers when NumPy is
+    installed (the columns are read without copying), otherwise a single
+    Python loop. Sums are accumulated in row order either way.
+
+    Args:
+        table: CapitationTable to aggregate
+
+    Returns:
+        ReportAggregates for the table
+    """
+    if NUMPY_AVAILABLE:
+        return _aggregate_numpy(table)
+    return _aggregate_python(table)
+
+def _aggregate_numpy(table) -> ReportAggregates:
+    """Vectorized aggregation using bincount over provider, age and pivot cell codes."""
+    providers = len(table.providers)
+    ages = len(table.age_ranges)
+
+    provider_index = np.frombuffer(table.provider_index, dtype=np.uint32).astype(np.intp)
+    age_index = np.frombuffer(table.age_index, dtype=np.uint32).astype(np.intp)
+    amount = np.frombuffer(table.total_amount, dtype=np.float64)
+    integer_quantity = not isinstance(table.quantity, list)
+    if integer_quantity:
+        quantity = np.frombuffer(table.quantity, dtype=np.int64)
+    else:
+        quantity = np.asarray(table.quantity, dtype=np.float64)
+
+    # One bincount per measure over the provider x age cell; everything else is a reduction of it
+    cell = provider_index * ages + age_index
+    pivot_amount = np.bincount(cell, weights=amount, minlength=providers * ages).reshape(providers, ages)
+    pivot_quantity = np.bincount(cell, weights=quantity, minlength=providers * ages).reshape(providers, ages)
+    provider_amount = np.bincount(provider_index, weights=amount, minlength=providers)
+    provider_quantity = np.bincount(provider_index, weights=quantity, minlength=providers)
+    age_amount = np.bincount(age_index, weights=amount, minlength=ages)
+    age_quantity = np.bincount(age_index, weights=quantity, minlength=ages)
+
+    if integer_quantity:
+        # bincount weights are float64, exact for any realistic patient count
+        pivot_quantity = pivot_quantity.astype(np.int64).tolist()
+        provider_quantity = provider_quantity.astype(np.int64).tolist()
+        age_quantity = age_quantity.astype(np.int64).tolist()
+        grand_quantity = int(quantity.sum())
+    else:
+        # Groups without fractional rows keep integer totals, as a plain sum() would
+        fractional = np.fromiter((isinstance(q, float) for q in table.quantity), dtype=bool, count=len(table.quantity))
+        pivot_quantity = _restore_ints(
+            pivot_quantity.ravel(), np.bincount(cell, weights=fractional, minlength=providers * ages)
+        )
+        pivot_quantity = [pivot_quantity[p * ages:(p + 1) * ages] for p in range(providers)]
+        provider_quantity = _restore_ints(provider_quantity, np.bincount(provider_index, weights=fractional, minlength=providers))
+        age_quantity = _restore_ints(age_quantity, np.bincount(age_index, weights=fractional, minlength=ages))
+        grand_quantity = float(quantity.sum())
+
+    return ReportAggregates(
+        provider_quantity=provider_quantity,
+        provider_amount=provider_amount.tolist(),
+        age_quantity=age_quantity,
+        age_amount=age_amount.tolist(),
+        pivot_quantity=pivot_quantity,
+        pivot_amount=pivot_amount.tolist(),
+        grand_quantity=grand_quantity,
+        grand_amount=float(provider_amount.sum())
+    )
+
+def _restore_ints(totals, fractional_counts) -> List[Any]:
+    """Convert totals to int where the group had no fractional values."""
+    return [
+        total if count else int(total)
+        for total, count in zip(totals.tolist(), fractional_counts.tolist())
+    ]
+
+def _aggregate_python(table) -> ReportAggregates:
+    """Aggregation in a single Python loop over the columns."""
+    providers = len(table.providers)
+    ages = len(table.age_ranges)
+
+    provider_quantity = [0] * providers
+    provider_amount = [0.0] * providers
+    age_quantity = [0] * ages
+    age_amount = [0.0] * ages
+    pivot_quantity = [[0] * ages for _ in range(providers)]
+    pivot_amount = [[0.0] * ages for _ in range(providers)]
+
+    for p, a, q, t in zip(table.provider_index, table.age_index, table.quantity, table.total_amount):
+        provider_quantity[p] += q
+        provider_amount[p] += t
+        age_quantity[a] += q
+        age_amount[a] += t
+        pivot_quantity[p][a] += q
+        pivot_amount[p][a] += t
+
+    return ReportAggregates(
+        provider_quantity=provider_quantity,
+        provider_amount=provider_amount,
+        age_quantity=age_quantity,
+        age_amount=age_amount,
+        pivot_quantity=pivot_quantity,
+        pivot_amount=pivot_amount,
+        grand_quantity=sum(provider_quantity),
+        grand_amount=sum(provider_amount)
+    )
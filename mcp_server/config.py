@@ -2,7 +2,7 @@
 
 import json
 import os
-from typing import Dict, Any
+from typing import Dict, Any, List
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -94,6 +94,369 @@ class Config:
         """Get IndiciAPI timeout from environment or config."""
         env_val = os.getenv("INDICI_API_TIMEOUT")
         return int(env_val) if env_val else self._config["indici_api"]["timeout"]
+
+    @property
+    def indici_api_stream_results(self) -> bool:
+        """Get whether report rows are stream-decoded as the response arrives, from environment or config."""
+        env_val = os.getenv("INDICI_API_STREAM_RESULTS")
+        if env_val:
+            return env_val.lower() in ('true', '1', 'yes', 'on')
+        return self._config["indici_api"].get("stream_results", False)
+
+    @property
+    def indici_api_pool_limit(self) -> int:
+        """Get total connection limit of the IndiciAPI HTTP pool from environment or config."""
+        env_val = os.getenv("INDICI_API_POOL_LIMIT")
+        return int(env_val) if env_val else self._config["indici_api"].get("http_pool", {}).get("limit", 100)
+
+    @property
+    def indici_api_pool_limit_per_host(self) -> int:
+        """Get per-host connection limit of the IndiciAPI HTTP pool from environment or config."""
+        env_val = os.getenv("INDICI_API_POOL_LIMIT_PER_HOST")
+        return int(env_val) if env_val else self._config["indici_api"].get("http_pool", {}).get("limit_per_host", 20)
+
+    @property
+    def indici_api_keepalive_timeout(self) -> float:
+        """Get keep-alive timeout (seconds) for pooled IndiciAPI connections from environment or config."""
+        env_val = os.getenv("INDICI_API_KEEPALIVE_TIMEOUT")
+        return float(env_val) if env_val else self._config["indici_api"].get("http_pool", {}).get("keepalive_timeout", 30)
+
+    @property
+    def indici_api_dns_cache_ttl(self) -> int:
+        """Get DNS cache TTL (seconds) for the IndiciAPI HTTP pool from environment or config."""
+        env_val = os.getenv("INDICI_API_DNS_CACHE_TTL")
+        return int(env_val) if env_val else self._config["indici_api"].get("http_pool", {}).get("dns_cache_ttl", 300)
+
+    @property
+    def report_cache_max_entries(self) -> int:
+        """Get maximum number of cached capitation reports from environment or config."""
+        env_val = os.getenv("REPORT_CACHE_MAX_ENTRIES")
+        return int(env_val) if env_val else self._config.get("report_cache", {}).get("max_entries", 256)
+
+    @property
+    def report_cache_ttl(self) -> float:
+        """Get cache TTL (seconds) for reports over closed date ranges from environment or config."""
+        env_val = os.getenv("REPORT_CACHE_TTL")
+        return float(env_val) if env_val else self._config.get("report_cache", {}).get("ttl", 900)
+
+    @property
+    def report_cache_live_ttl(self) -> float:
+        """Get cache TTL (seconds) for reports whose range includes today from environment or config."""
+        env_val = os.getenv("REPORT_CACHE_LIVE_TTL")
+        return float(env_val) if env_val else self._config.get("report_cache", {}).get("live_ttl", 60)
+
+    @property
+    def print_handle_ttl(self) -> float:
+        """Get how long (seconds) a report stays available to the on-demand print view from environment or config."""
+        env_val = os.getenv("PRINT_HANDLE_TTL")
+        return float(env_val) if env_val else self._config.get("report_cache", {}).get("print_handle_ttl", 1800)
+    
+    @property
+    def report_sharding_enabled(self) -> bool:
+        """Get whether long capitation report ranges are fetched as month shards by default."""
+        env_val = os.getenv("REPORT_SHARDING_ENABLED")
+        if env_val:
+            return env_val.lower() in ('true', '1', 'yes', 'on')
+        return self._config.get("report_sharding", {}).get("enabled", False)
+
+    @property
+    def report_sharding_min_months(self) -> int:
+        """Get the minimum number of months a range must span before it is sharded."""
+        env_val = os.getenv("REPORT_SHARDING_MIN_MONTHS")
+        return int(env_val) if env_val else self._config.get("report_sharding", {}).get("min_months", 3)
+
+    @property
+    def report_sharding_max_concurrency(self) -> int:
+        """Get the maximum number of month shards fetched concurrently."""
+        env_val = os.getenv("REPORT_SHARDING_MAX_CONCURRENCY")
+        return int(env_val) if env_val else self._config.get("report_sharding", {}).get("max_concurrency", 4)
+
+    @property
+    def aggregate_store_enabled(self) -> bool:
+        """Get whether closed months of sharded reports are kept in the persistent monthly aggregate store."""
+        env_val = os.getenv("AGGREGATE_STORE_ENABLED")
+        if env_val:
+            return env_val.lower() in ('true', '1', 'yes', 'on')
+        return self._config.get("aggregate_store", {}).get("enabled", False)
+
+    @property
+    def aggregate_store_path(self) -> str:
+        """Get the SQLite database path of the monthly aggregate store."""
+        return os.getenv("AGGREGATE_STORE_PATH") or self._config.get("aggregate_store", {}).get("path", "data/aggregates.sqlite3")
+
+    @property
+    def render_compact_html(self) -> bool:
+        """Get whether chat responses use class-based, minified report HTML."""
+        env_val = os.getenv("RENDER_COMPACT_HTML")
+        if env_val:
+            return env_val.lower() in ('true', '1', 'yes', 'on')
+        return self._config.get("rendering", {}).get("compact_html", True)
+
+    @property
+    def render_response_mode(self) -> str:
+        """Get how chat tool results are delivered: "structured" (JSON rendered in the browser) or "html"."""
+        return os.getenv("RENDER_RESPONSE_MODE") or self._config.get("rendering", {}).get("response_mode", "structured")
+
+    @property
+    def roster_cache_fresh_ttl(self) -> float:
+        """Get age (seconds) after which a cached provider roster is refreshed in the background."""
+        env_val = os.getenv("ROSTER_CACHE_FRESH_TTL")
+        return float(env_val) if env_val else self._config.get("roster_cache", {}).get("fresh_ttl", 300)
+
+    @property
+    def roster_cache_max_age(self) -> float:
+        """Get hard max age (seconds) after which a cached provider roster is no longer served."""
+        env_val = os.getenv("ROSTER_CACHE_MAX_AGE")
+        return float(env_val) if env_val else self._config.get("roster_cache", {}).get("max_age", 3600)
+
+    @property
+    def provider_name_resolution_enabled(self) -> bool:
+        """Get whether free-text provider names are matched against the cached roster before report calls."""
+        env_val = os.getenv("PROVIDER_NAME_RESOLUTION_ENABLED")
+        if env_val:
+            return env_val.lower() in ('true', '1', 'yes', 'on')
+        return self._config.get("provider_name_resolution", {}).get("enabled", True)
+
+    @property
+    def provider_name_resolution_settings(self) -> Dict[str, float]:
+        """Get provider name index thresholds (min_score, ambiguity_margin, suggest_score) from environment or config."""
+        settings = self._config.get("provider_name_resolution", {})
+        defaults = {"min_score": 0.75, "ambiguity_margin": 0.08, "suggest_score": 0.5}
+        resolved = {}
+        for name, default in defaults.items():
+            env_val = os.getenv(f"PROVIDER_NAME_RESOLUTION_{name.upper()}")
+            resolved[name] = float(env_val) if env_val else float(settings.get(name, default))
+        return resolved
+
+    @property
+    def batch_reports_max_entities(self) -> int:
+        """Get maximum number of practice/provider/location reports in one batch from environment or config."""
+        env_val = os.getenv("BATCH_REPORTS_MAX_ENTITIES")
+        return int(env_val) if env_val else self._config.get("batch_reports", {}).get("max_entities", 25)
+
+    @property
+    def batch_reports_max_concurrency(self) -> int:
+        """Get maximum number of batch reports fetched at once from environment or config."""
+        env_val = os.getenv("BATCH_REPORTS_MAX_CONCURRENCY")
+        return int(env_val) if env_val else self._config.get("batch_reports", {}).get("max_concurrency", 4)
+
+    @property
+    def ad_login_cache_ttl(self) -> float:
+        """Get how long (seconds) a user's AD login profile and practices are reused from environment or config."""
+        env_val = os.getenv("AD_LOGIN_CACHE_TTL")
+        return float(env_val) if env_val else self._config.get("ad_login_cache", {}).get("ttl", 600)
+
+    @property
+    def ad_login_cache_max_entries(self) -> int:
+        """Get maximum number of cached AD logins from environment or config."""
+        env_val = os.getenv("AD_LOGIN_CACHE_MAX_ENTRIES")
+        return int(env_val) if env_val else self._config.get("ad_login_cache", {}).get("max_entries", 1024)
+
+    @property
+    def retry_max_attempts(self) -> int:
+        """Get maximum attempts (including the first) for idempotent indici API GETs from environment or config."""
+        env_val = os.getenv("RETRY_MAX_ATTEMPTS")
+        return int(env_val) if env_val else self._config.get("resilience", {}).get("retry_max_attempts", 3)
+
+    @property
+    def retry_base_delay(self) -> float:
+        """Get base backoff delay (seconds) between retries from environment or config."""
+        env_val = os.getenv("RETRY_BASE_DELAY")
+        return float(env_val) if env_val else self._config.get("resilience", {}).get("retry_base_delay", 0.25)
+
+    @property
+    def retry_max_delay(self) -> float:
+        """Get maximum backoff delay (seconds) between retries from environment or config."""
+        env_val = os.getenv("RETRY_MAX_DELAY")
+        return float(env_val) if env_val else self._config.get("resilience", {}).get("retry_max_delay", 4.0)
+
+    @property
+    def retry_deadline(self) -> float:
+        """Get time (seconds) after the first attempt beyond which no retry is started from environment or config."""
+        env_val = os.getenv("RETRY_DEADLINE")
+        return float(env_val) if env_val else self._config.get("resilience", {}).get("retry_deadline", 30.0)
+
+    @property
+    def circuit_failure_threshold(self) -> int:
+        """Get consecutive failures that open an endpoint's circuit breaker from environment or config."""
+        env_val = os.getenv("CIRCUIT_FAILURE_THRESHOLD")
+        return int(env_val) if env_val else self._config.get("resilience", {}).get("circuit_failure_threshold", 5)
+
+    @property
+    def circuit_recovery_timeout(self) -> float:
+        """Get time (seconds) an open circuit breaker fails fast before probing from environment or config."""
+        env_val = os.getenv("CIRCUIT_RECOVERY_TIMEOUT")
+        return float(env_val) if env_val else self._config.get("resilience", {}).get("circuit_recovery_timeout", 30.0)
+
+    @property
+    def circuit_half_open_max_calls(self) -> int:
+        """Get number of probe calls a half-open circuit breaker lets through from environment or config."""
+        env_val = os.getenv("CIRCUIT_HALF_OPEN_MAX_CALLS")
+        return int(env_val) if env_val else self._config.get("resilience", {}).get("circuit_half_open_max_calls", 1)
+
+    @property
+    def upstream_max_concurrency(self) -> int:
+        """Get maximum concurrent requests to the indici API from environment or config."""
+        env_val = os.getenv("UPSTREAM_MAX_CONCURRENCY")
+        return int(env_val) if env_val else self._config.get("upstream_scheduler", {}).get("max_concurrency", 8)
+
+    @property
+    def upstream_per_practice_concurrency(self) -> int:
+        """Get maximum concurrent indici API requests for one practice from environment or config."""
+        env_val = os.getenv("UPSTREAM_PER_PRACTICE_CONCURRENCY")
+        return int(env_val) if env_val else self._config.get("upstream_scheduler", {}).get("per_practice_concurrency", 4)
+
+    @property
+    def upstream_background_concurrency(self) -> int:
+        """Get maximum concurrent background and prefetch indici API requests from environment or config."""
+        env_val = os.getenv("UPSTREAM_BACKGROUND_CONCURRENCY")
+        return int(env_val) if env_val else self._config.get("upstream_scheduler", {}).get("background_concurrency", 2)
+
+    @property
+    def upstream_queue_timeout(self) -> float:
+        """Get maximum time (seconds) a request waits for an upstream slot from environment or config."""
+        env_val = os.getenv("UPSTREAM_QUEUE_TIMEOUT")
+        return float(env_val) if env_val else self._config.get("upstream_scheduler", {}).get("queue_timeout", 30.0)
+
+    @property
+    def conditional_requests_enabled(self) -> bool:
+        """Get whether upstream GETs are revalidated with ETag/Last-Modified or content hashes from environment or config."""
+        env_val = os.getenv("CONDITIONAL_REQUESTS_ENABLED")
+        if env_val:
+            return env_val.lower() in ('true', '1', 'yes', 'on')
+        return self._config.get("conditional_requests", {}).get("enabled", True)
+
+    @property
+    def conditional_requests_ttl(self) -> float:
+        """Get how long (seconds) validators of upstream answers are kept from environment or config."""
+        env_val = os.getenv("CONDITIONAL_REQUESTS_TTL")
+        return float(env_val) if env_val else self._config.get("conditional_requests", {}).get("ttl", 86400)
+
+    @property
+    def conditional_requests_max_entries(self) -> int:
+        """Get maximum number of upstream answers kept for revalidation from environment or config."""
+        env_val = os.getenv("CONDITIONAL_REQUESTS_MAX_ENTRIES")
+        return int(env_val) if env_val else self._config.get("conditional_requests", {}).get("max_entries", 512)
+
+    @property
+    def cache_warmer_enabled(self) -> bool:
+        """Get whether common reports are precomputed on a schedule from environment or config."""
+        env_val = os.getenv("CACHE_WARMER_ENABLED")
+        if env_val:
+            return env_val.lower() in ('true', '1', 'yes', 'on')
+        return self._config.get("cache_warmer", {}).get("enabled", False)
+
+    @property
+    def cache_warmer_schedule(self) -> str:
+        """Get the cron expression (minute hour day month weekday, server time) of cache warming runs."""
+        return os.getenv("CACHE_WARMER_SCHEDULE") or self._config.get("cache_warmer", {}).get("schedule", "0 6 * * 1-5")
+
+    @property
+    def cache_warmer_practices(self) -> List[Dict[str, int]]:
+        """Get practices always warmed, as practice_id/practice_location_id dicts, from environment or config."""
+        env_val = os.getenv("CACHE_WARMER_PRACTICES")
+        if env_val:
+            # "128,129:2" -> practice 128 (location 1) and practice 129 at location 2
+            practices = []
+            for item in env_val.split(","):
+                practice_id, _, location_id = item.strip().partition(":")
+                if practice_id:
+                    practices.append({"practice_id": int(practice_id), "practice_location_id": int(location_id or 1)})
+            return practices
+        practices = self._config.get("cache_warmer", {}).get("practices", [])
+        return [
+            item if isinstance(item, dict) else {"practice_id": int(item), "practice_location_id": 1}
+            for item in practices
+        ]
+
+    @property
+    def cache_warmer_recent_window(self) -> float:
+        """Get how far back (seconds) practices used in chat are also warmed from environment or config."""
+        env_val = os.getenv("CACHE_WARMER_RECENT_WINDOW")
+        return float(env_val) if env_val else self._config.get("cache_warmer", {}).get("recent_window", 259200)
+
+    @property
+    def cache_warmer_live_ttl(self) -> float:
+        """Get cache TTL (seconds) of warmed reports whose range includes today from environment or config."""
+        env_val = os.getenv("CACHE_WARMER_LIVE_TTL")
+        return float(env_val) if env_val else self._config.get("cache_warmer", {}).get("live_ttl", 14400)
+
+    @property
+    def adaptive_timeouts_enabled(self) -> bool:
+        """Get whether upstream timeouts adapt to observed latency from environment or config."""
+        env_val = os.getenv("ADAPTIVE_TIMEOUTS_ENABLED")
+        if env_val:
+            return env_val.lower() in ('true', '1', 'yes', 'on')
+        return self._config.get("adaptive_timeouts", {}).get("enabled", True)
+
+    @property
+    def adaptive_timeouts_window(self) -> int:
+        """Get number of recent latencies kept per endpoint and range size from environment or config."""
+        env_val = os.getenv("ADAPTIVE_TIMEOUTS_WINDOW")
+        return int(env_val) if env_val else self._config.get("adaptive_timeouts", {}).get("window", 200)
+
+    @property
+    def adaptive_timeouts_min_samples(self) -> int:
+        """Get number of latencies needed before timeouts and hedging adapt from environment or config."""
+        env_val = os.getenv("ADAPTIVE_TIMEOUTS_MIN_SAMPLES")
+        return int(env_val) if env_val else self._config.get("adaptive_timeouts", {}).get("min_samples", 20)
+
+    @property
+    def adaptive_timeouts_min_timeout(self) -> float:
+        """Get lowest adaptive timeout (seconds) from environment or config."""
+        env_val = os.getenv("ADAPTIVE_TIMEOUTS_MIN_TIMEOUT")
+        return float(env_val) if env_val else self._config.get("adaptive_timeouts", {}).get("min_timeout", 5.0)
+
+    @property
+    def adaptive_timeouts_multiplier(self) -> float:
+        """Get multiple of the observed p99 latency used as timeout from environment or config."""
+        env_val = os.getenv("ADAPTIVE_TIMEOUTS_MULTIPLIER")
+        return float(env_val) if env_val else self._config.get("adaptive_timeouts", {}).get("multiplier", 3.0)
+
+    @property
+    def hedging_enabled(self) -> bool:
+        """Get whether slow GETs are hedged with a second identical request from environment or config."""
+        env_val = os.getenv("HEDGING_ENABLED")
+        if env_val:
+            return env_val.lower() in ('true', '1', 'yes', 'on')
+        return self._config.get("hedging", {}).get("enabled", False)
+
+    @property
+    def hedging_percentile(self) -> float:
+        """Get latency percentile after which a hedged request is sent from environment or config."""
+        env_val = os.getenv("HEDGING_PERCENTILE")
+        return float(env_val) if env_val else self._config.get("hedging", {}).get("percentile", 95.0)
+
+    @property
+    def hedging_min_delay(self) -> float:
+        """Get minimum wait (seconds) before a hedged request is sent from environment or config."""
+        env_val = os.getenv("HEDGING_MIN_DELAY")
+        return float(env_val) if env_val else self._config.get("hedging", {}).get("min_delay", 0.5)
+
+    @property
+    def hedging_max_ratio(self) -> float:
+        """Get maximum share of GETs that may be hedged from environment or config."""
+        env_val = os.getenv("HEDGING_MAX_RATIO")
+        return float(env_val) if env_val else self._config.get("hedging", {}).get("max_ratio", 0.1)
+    
+    @property
+    def health_probe_interval(self) -> float:
+        """Get interval (seconds) between background IndiciAPI health probes from environment or config."""
+        env_val = os.getenv("HEALTH_PROBE_INTERVAL")
+        return float(env_val) if env_val else self._config.get("health_probe", {}).get("interval", 30)
+
+    @property
+    def health_probe_timeout(self) -> float:
+        """Get timeout (seconds) of a single IndiciAPI health probe from environment or config."""
+        env_val = os.getenv("HEALTH_PROBE_TIMEOUT")
+        return float(env_val) if env_val else self._config.get("health_probe", {}).get("timeout", 5)
+
+    @property
+    def health_probe_path(self) -> str:
+        """Get the light IndiciAPI path probed by the health check from environment or config (defaults to the API root)."""
+        return (os.getenv("HEALTH_PROBE_PATH")
+                or self._config.get("health_probe", {}).get("path")
+                or "/")
     
     @property
     def mcp_server_host(self) -> str:
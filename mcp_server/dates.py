@@ -0,0 +1,358 @@
+"""Date parsing and deterministic resolution of relative date expressions."""
+
+import re
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import List, NamedTuple, Optional, Tuple
+
+# First month of the New Zealand financial year (1 April - 31 March)
+FINANCIAL_YEAR_START_MONTH = 4
+
+_ISO_SHAPE = re.compile(r"^(\d{4})([-/])(\d{1,2})\2(\d{1,2})$")
+_SLASH_SHAPE = re.compile(r"^(\d{1,2})/(\d{1,2})/(\d{4})$")
+
+MONTHS = {
+    "jan": 1, "january": 1, "feb": 2, "february": 2, "mar": 3, "march": 3,
+    "apr": 4, "april": 4, "may": 5, "jun": 6, "june": 6, "jul": 7, "july": 7,
+    "aug": 8, "august": 8, "sep": 9, "sept": 9, "september": 9, "oct": 10, "october": 10,
+    "nov": 11, "november": 11, "dec": 12, "december": 12
+}
+NUMBER_WORDS = {
+    "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6,
+    "seven": 7, "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12,
+    "eighteen": 18, "twenty-four": 24
+}
+
+_MONTH = r"(?P<{0}>" + "|".join(sorted(MONTHS, key=len, reverse=True)) + r")"
+_YEAR = r"(?P<{0}>(?:19|20)\d{{2}})"
+_DATE = r"(?P<{0}>\d{{4}}[-/]\d{{1,2}}[-/]\d{{1,2}}|\d{{1,2}}/\d{{1,2}}/\d{{4}})"
+_UNTIL = r"\s*(?:to|until|till|through|thru|and|-)\s*"
+_NUMBER = r"(?P<count>\d{1,2}|" + "|".join(NUMBER_WORDS) + r")"
+_LAST = r"(?:last|previous|prior|past)"
+_THIS = r"(?:this|current)"
+_FINANCIAL = r"(?:financial|fiscal)\s+year"
+# A month name without a year followed by a capitalised word is more likely a
+# person ("for May Chen", "for Jan Smith") than a month
+_NOT_NAME = r"(?!\s+(?-i:[A-Z]))"
+
+def _pattern(template: str) -> "re.Pattern":
+    """Compile a case-insensitive expression template, filling in the shared month, year and date groups."""
+    return re.compile(r"\b" + template.format(
+        month=_MONTH.format("month"), month2=_MONTH.format("month2"),
+        year=_YEAR.format("year"), year2=_YEAR.format("year2"),
+        date=_DATE.format("date"), date2=_DATE.format("date2"),
+        until=_UNTIL, number=_NUMBER, last=_LAST, this=_THIS, financial=_FINANCIAL, not_name=_NOT_NAME
+    ) + r"\b", re.IGNORECASE)
+
+class DateRange(NamedTuple):
+    """A resolved date range."""
+    date_from: date
+    date_to: date
+    label: str
+    text: str
+
+    def iso(self) -> Tuple[str, str]:
+        """Range as (date_from, date_to) ISO strings."""
+        return self.date_from.isoformat(), self.date_to.isoformat()
+
+@lru_cache(maxsize=1024)
+def parse_date(value: Optional[str]) -> Optional[date]:
+    """
+    Parse a date in any supported format.
+
+    Supported formats are YYYY-MM-DD, YYYY/MM/DD, DD/MM/YYYY (or MM/DD/YYYY
+    when that is the only valid reading) and ISO datetimes. The format is
+    picked from the shape of the string rather than by trying each one.
+
+    Args:
+        value: Date string
+
+    Returns:
+        The date, or None if the value is empty or not a valid date
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if 'T' in value:
+        try:
+            return datetime.fromisoformat(value.replace('Z', '+00:00')).date()
+        except ValueError:
+            return None
+
+    match = _ISO_SHAPE.match(value)
+    if match:
+        candidates = [(int(match.group(1)), int(match.group(3)), int(match.group(4)))]
+    else:
+        match = _SLASH_SHAPE.match(value)
+        if not match:
+            return None
+        first, second, year = (int(group) for group in match.groups())
+        candidates = [(year, second, first), (year, first, second)]
+
+    for year, month, day in candidates:
+        try:
+            return date(year, month, day)
+        except ValueError:
+            continue
+    return None
+
+def to_iso(value: Optional[str]) -> Optional[str]:
+    """
+    Normalize a date string to YYYY-MM-DD.
+
+    Args:
+        value: Date string in any format parse_date() accepts
+
+    Returns:
+        ISO date string, or None if the value can't be parsed
+    """
+    parsed = parse_date(value)
+    return parsed.isoformat() if parsed else None
+
+def month_end(year: int, month: int) -> date:
+    """Last day of a month."""
+    if month == 12:
+        return date(year, 12, 31)
+    return date(year, month + 1, 1) - timedelta(days=1)
+
+def add_months(day: date, months: int) -> date:
+    """First day of the month a number of months from a date's month."""
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+def month_to_date(today: Optional[date] = None) -> Tuple[date, date]:
+    """
+    Get the current month up to today, the range chat uses for "this month".
+
+    Args:
+        today: Reference date (defaults to today)
+
+    Returns:
+        Tuple of (first day of the month, today)
+    """
+    today = today or date.today()
+    return today.replace(day=1), today
+
+def year_to_date(today: Optional[date] = None) -> Tuple[date, date]:
+    """
+    Get the current calendar year up to today, the range chat uses for "this year".
+
+    Args:
+        today: Reference date (defaults to today)
+
+    Returns:
+        Tuple of (1 January, today)
+    """
+    today = today or date.today()
+    return date(today.year, 1, 1), today
+
+def financial_year(ending_year: int) -> Tuple[date, date]:
+    """
+    Bounds of a New Zealand financial year.
+
+    Args:
+        ending_year: Year the financial year ends in (FY2024 runs 1 April 2023 - 31 March 2024)
+
+    Returns:
+        Tuple of (first day, last day)
+    """
+    return date(ending_year - 1, FINANCIAL_YEAR_START_MONTH, 1), month_end(ending_year, FINANCIAL_YEAR_START_MONTH - 1)
+
+def financial_year_of(day: date) -> int:
+    """Ending year of the financial year a date falls in."""
+    return day.year + 1 if day.month >= FINANCIAL_YEAR_START_MONTH else day.year
+
+def _recent_year(month: int, today: date) -> int:
+    """Year of the most recent occurrence of a month that has started."""
+    return today.year if month <= today.month else today.year - 1
+
+def _full_year(text: Optional[str]) -> Optional[int]:
+    """Expand a two- or four-digit year."""
+    if not text:
+        return None
+    year = int(text)
+    return year + 2000 if year < 100 else year
+
+def _count(text: str) -> int:
+    return int(text) if text.isdigit() else NUMBER_WORDS[text.lower()]
+
+def _explicit_range(match: "re.Match", today: date) -> Optional[Tuple[date, date]]:
+    start, end = parse_date(match.group("date")), parse_date(match.group("date2"))
+    return (start, end) if start and end else None
+
+def _month_range(match: "re.Match", today: date) -> Tuple[date, date]:
+    first, last = MONTHS[match.group("month").lower()], MONTHS[match.group("month2").lower()]
+    first_year, last_year = _full_year(match.group("year")), _full_year(match.group("year2"))
+    wraps = last < first
+    if first_year is None and last_year is None:
+        first_year = _recent_year(first, today)
+    if first_year is None:
+        first_year = last_year - 1 if wraps else last_year
+    if last_year is None:
+        last_year = first_year + 1 if wraps else first_year
+    return date(first_year, first, 1), month_end(last_year, last)
+
+def _since_month(match: "re.Match", today: date) -> Tuple[date, date]:
+    month = MONTHS[match.group("month").lower()]
+    year = _full_year(match.group("year")) or _recent_year(month, today)
+    return date(year, month, 1), today
+
+def _since_date(match: "re.Match", today: date) -> Optional[Tuple[date, date]]:
+    start = parse_date(match.group("date"))
+    return (start, today) if start else None
+
+def _this_financial_year(match: "re.Match", today: date) -> Tuple[date, date]:
+    return financial_year(financial_year_of(today))[0], today
+
+def _last_financial_year(match: "re.Match", today: date) -> Tuple[date, date]:
+    return financial_year(financial_year_of(today) - 1)
+
+def _financial_year_match(match: "re.Match", today: date) -> Tuple[date, date]:
+    """Resolve "FY24", "financial year 2023/24" and "2023/24 financial year"."""
+    groups = match.groupdict()
+    if groups["end"]:
+        return financial_year(_full_year(groups["end"]))
+    start = groups["start"] or groups["start2"]
+    end = groups["end2"] or groups["end3"]
+    if end is None:
+        # "financial year 2024" names the ending year, like FY2024
+        return financial_year(int(start))
+    ending = int(end)
+    if ending < 100:
+        ending += int(start) // 100 * 100
+        if ending <= int(start):
+            ending += 100
+    return financial_year(ending)
+
+def _quarter_start(day: date) -> date:
+    return date(day.year, (day.month - 1) // 3 * 3 + 1, 1)
+
+def _this_quarter(match: "re.Match", today: date) -> Tuple[date, date]:
+    return _quarter_start(today), today
+
+def _last_quarter(match: "re.Match", today: date) -> Tuple[date, date]:
+    start = add_months(_quarter_start(today), -3)
+    return start, month_end(start.year, start.month + 2)
+
+def _named_quarter(match: "re.Match", today: date) -> Tuple[date, date]:
+    first_month = (int(match.group("quarter")) - 1) * 3 + 1
+    year = _full_year(match.group("year")) or _recent_year(first_month, today)
+    return date(year, first_month, 1), month_end(year, first_month + 2)
+
+def _last_months(match: "re.Match", today: date) -> Optional[Tuple[date, date]]:
+    months = _count(match.group("count"))
+    if not months:
+        return None
+    this_month = today.replace(day=1)
+    return add_months(this_month, -months), this_month - timedelta(days=1)
+
+def _this_month(match: "re.Match", today: date) -> Tuple[date, date]:
+    return month_to_date(today)
+
+def _last_month(match: "re.Match", today: date) -> Tuple[date, date]:
+    start = add_months(today, -1)
+    return start, month_end(start.year, start.month)
+
+def _named_month(match: "re.Match", today: date) -> Tuple[date, date]:
+    month = MONTHS[(match.group("month") or match.group("month2")).lower()]
+    year = _full_year(match.group("year")) or _recent_year(month, today)
+    return date(year, month, 1), month_end(year, month)
+
+def _this_year(match: "re.Match", today: date) -> Tuple[date, date]:
+    return year_to_date(today)
+
+def _last_year(match: "re.Match", today: date) -> Tuple[date, date]:
+    return date(today.year - 1, 1, 1), date(today.year - 1, 12, 31)
+
+def _named_year(match: "re.Match", today: date) -> Tuple[date, date]:
+    year = int(match.group("year"))
+    return date(year, 1, 1), date(year, 12, 31)
+
+# Expressions in priority order: where two found expressions overlap the
+# earlier one in this list wins, so explicit ranges beat single months and
+# "last 3 months" beats "last month". Separate expressions are taken in the
+# order they appear in the text.
+# Quarters are calendar quarters; financial years run April to March.
+_EXPRESSIONS = [
+    ("explicit range", _pattern(r"(?:(?:from|between)\s+)?{date}{until}{date2}"), _explicit_range),
+    ("month range", _pattern(r"(?:(?:from|between)\s+)?{month}(?:\s+{year})?{until}{month2}(?:\s+{year2})?"), _month_range),
+    ("since date", _pattern(r"since\s+{date}"), _since_date),
+    ("since month", _pattern(r"since\s+{month}(?:\s+{year}|{not_name})"), _since_month),
+    ("this financial year", _pattern(r"(?:{this}\s+(?:{financial}|fy)|{financial}\s+to\s+date|fytd)"), _this_financial_year),
+    ("last financial year", _pattern(r"{last}\s+(?:{financial}|fy)"), _last_financial_year),
+    ("financial year", _pattern(
+        r"(?:fy\s*'?(?P<end>\d{{4}}|\d{{2}})|{financial}\s+(?P<start>\d{{4}})(?:\s*[/-]\s*(?P<end2>\d{{4}}|\d{{2}}))?"
+        r"|(?P<start2>\d{{4}})\s*[/-]\s*(?P<end3>\d{{4}}|\d{{2}})\s+{financial})"
+    ), _financial_year_match),
+    ("this quarter", _pattern(r"(?:{this}\s+quarter|quarter\s+to\s+date|qtd)"), _this_quarter),
+    ("last quarter", _pattern(r"{last}\s+quarter"), _last_quarter),
+    ("quarter", _pattern(r"q(?P<quarter>[1-4])(?:\s+{year})?"), _named_quarter),
+    ("last months", _pattern(r"{last}\s+{number}\s+months?"), _last_months),
+    ("this month", _pattern(r"(?:{this}\s+month|month\s+to\s+date|mtd)"), _this_month),
+    ("last month", _pattern(r"{last}\s+month"), _last_month),
+    ("month", _pattern(r"(?:(?:(?:in|for|during|of)\s+)?{month}\s+{year}|(?:in|for|during|of)\s+{month2}{not_name})"), _named_month),
+    ("this year", _pattern(r"(?:{this}\s+(?:calendar\s+)?year|year\s+to\s+date|ytd)"), _this_year),
+    ("last year", _pattern(r"{last}\s+(?:calendar\s+)?year"), _last_year),
+    ("year", _pattern(r"(?:(?:in|for|during)|calendar\s+year)\s+{year}"), _named_year)
+]
+
+def resolve_relative(text: Optional[str], today: Optional[date] = None) -> Optional[DateRange]:
+    """
+    Resolve the first date expression in free text to a concrete range.
+
+    Understands explicit ranges ("2024-01-01 to 2024-03-31"), month ranges
+    ("March to June", "Nov 2024 - Feb 2025"), "since <month>" and
+    "since <date>", the current, previous and named financial year
+    ("FY24", "2023/24 financial year"), calendar quarters ("last quarter",
+    "Q3 2024"), "last N months" (the N full months before this one),
+    "this/last month", single months ("for March", "May 2024") and
+    "this/last year". Months and quarters without a year are the most recent
+    ones that have started; a month without a year right before a
+    capitalised word ("for May Chen") is taken as a name. Ranges up to now
+    end today.
+
+    Args:
+        text: Free text such as a chat message or a tool argument
+        today: Reference date (defaults to today)
+
+    Returns:
+        DateRange of the expression that appears first, or None if the text
+        contains no recognised expression
+    """
+    ranges = find_relative_dates(text, today)
+    return ranges[0] if ranges else None
+
+def find_relative_dates(text: Optional[str], today: Optional[date] = None) -> List[DateRange]:
+    """
+    Resolve every date expression in free text.
+
+    Args:
+        text: Free text such as a chat message
+        today: Reference date (defaults to today)
+
+    Returns:
+        DateRanges in the order they appear in the text (empty if none)
+    """
+    if not text:
+        return []
+    # Case is kept so a month name can be told apart from a person's name
+    return list(_resolve_all(" ".join(text.split()), today or date.today()))
+
+@lru_cache(maxsize=512)
+def _resolve_all(text: str, today: date) -> Tuple[DateRange, ...]:
+    found = []
+    taken: List[Tuple[int, int]] = []
+    for label, pattern, resolve in _EXPRESSIONS:
+        for match in pattern.finditer(text):
+            start, end = match.span()
+            if any(start < taken_end and taken_start < end for taken_start, taken_end in taken):
+                continue
+            try:
+                bounds = resolve(match, today)
+            except (ValueError, KeyError):
+                bounds = None
+            if bounds and bounds[0] <= bounds[1]:
+                taken.append((start, end))
+                found.append((start, DateRange(bounds[0], bounds[1], label, match.group(0))))
+    found.sort(key=lambda item: item[0])
+    return tuple(date_range for _, date_range in found)
@@ -0,0 +1,491 @@
+"""
+Streaming exports of capitation reports and income provider lists.
+
+Each export is a generator of byte chunks so the web layer can send it as a
+chunked response. Rows are read straight from the report data the tools
+already hold (the columnar table for capitation reports) and written one at a
+time into a small buffer that is flushed every EXPORT_CHUNK_SIZE bytes, so the
+export adds a constant amount of memory whatever the row count.
+
+Formats:
+    csv  - flat rows, one per result
+    xlsx - a single worksheet written through zipfile in streaming mode
+    pdf  - a print layout grouped by provider, built from the standard
+           Helvetica fonts so no extra dependency is needed
+"""
+
+import csv
+import io
+import unicodedata
+import zipfile
+import zlib
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from xml.sax.saxutils import escape
+
+from .report_table import CapitationTable
+
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+EXPORT_FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "pdf": "application/pdf"
+}
+
+Row = Sequence[Any]
+Group = Tuple[str, Iterator[Row], Optional[Row]]
+
+@dataclass
+class ExportSheet:
+    """
+    Tabular export source.
+
+    Rows are produced in groups (one per provider for capitation reports).
+    Flat formats put the group name in group_column; the PDF layout uses it
+    as a section heading followed by the group's totals row.
+    """
+    title: str
+    subtitle: str
+    columns: List[str]
+    groups: Callable[[], Iterator[Group]]
+    group_column: Optional[str] = None
+    grand_total: Optional[Row] = None
+    # Columns shown with two decimals in XLSX and PDF output
+    money_columns: Tuple[int, ...] = ()
+
+    def header(self) -> List[str]:
+        """Column names of the flat (CSV/XLSX) layout."""
+        return ([self.group_column] if self.group_column else []) + self.columns
+
+    def flat_rows(self) -> Iterator[Row]:
+        """Yield rows of the flat layout, without group totals."""
+        for name, rows, _ in self.groups():
+            if self.group_column:
+                for row in rows:
+                    yield (name, *row)
+            else:
+                yield from rows
+
+def capitation_report_sheet(report_data: Dict[str, Any]) -> ExportSheet:
+    """
+    Build the export source of a capitation report.
+
+    Args:
+        report_data: The report response data
+
+    Returns:
+        ExportSheet grouped by provider
+    """
+    data = report_data.get("data") or {}
+    date_from = (data.get("dateFrom") or "").split("T")[0]
+    date_to = (data.get("dateTo") or "").split("T")[0]
+    table = CapitationTable.for_report(report_data) if data.get("results") else None
+    grand_total = None
+
+    def groups() -> Iterator[Group]:
+        if table is None:
+            return
+        age_ranges = table.age_ranges
+        age_index = table.age_index
+        capitation_amount = table.capitation_amount
+        quantity = table.quantity
+        total_amount = table.total_amount
+        for provider in table.group_by_provider():
+            rows = (
+                (age_ranges[age_index[i]], capitation_amount[i], quantity[i], total_amount[i])
+                for i in provider.indices
+            )
+            yield provider.name, rows, ("Total", None, provider.total_quantity, round(provider.total_amount, 2))
+
+    if table is not None:
+        totals = table.aggregates
+        grand_total = ("Grand Total", None, totals.grand_quantity, round(totals.grand_amount, 2))
+
+    return ExportSheet(
+        title="Provider Capitation Report",
+        subtitle=f"Period Date: {date_from} to {date_to}" if date_from and date_to else "",
+        columns=["Age Range", "Capitation Amount", "Quantity", "Total Amount"],
+        groups=groups,
+        group_column="Provider",
+        grand_total=grand_total,
+        money_columns=(1, 3)
+    )
+
+def income_providers_sheet(data: Dict[str, Any]) -> ExportSheet:
+    """
+    Build the export source of an income providers list.
+
+    Args:
+        data: API response data containing income providers list
+
+    Returns:
+        ExportSheet with one group holding every provider
+    """
+    data = data or {}
+    results = data.get("results") or []
+
+    def groups() -> Iterator[Group]:
+        rows = (
+            (result.get("patientID", ""), result.get("fullName", ""), result.get("providerID", ""))
+            for result in results
+        )
+        yield "", rows, None
+
+    return ExportSheet(
+        title="Income Providers",
+        subtitle=f"Practice ID: {data.get('practiceId', 'N/A')} | Total Records: {data.get('totalRecords', len(results))}",
+        columns=["Patient ID", "Provider Name", "Provider ID"],
+        groups=groups
+    )
+
+def iter_export(sheet: ExportSheet, export_format: str) -> Iterator[bytes]:
+    """
+    Stream a sheet in the requested format.
+
+    Args:
+        sheet: Export source
+        export_format: One of EXPORT_FORMATS
+
+    Returns:
+        Iterator of byte chunks
+    """
+    if export_format == "csv":
+        return iter_csv(sheet)
+    if export_format == "xlsx":
+        return iter_xlsx(sheet)
+    if export_format == "pdf":
+        return iter_pdf(sheet)
+    raise ValueError(f"Unsupported export format: {export_format}")
+
+class _ChunkBuffer:
+    """Write target that hands out its contents in chunks."""
+
+    def __init__(self):
+        self._parts: List[bytes] = []
+        self._size = 0
+
+    def write(self, data: bytes) -> int:
+        if data:
+            self._parts.append(bytes(data))
+            self._size += len(data)
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def full(self) -> bool:
+        return self._size >= EXPORT_CHUNK_SIZE
+
+    def drain(self) -> bytes:
+        chunk = b"".join(self._parts)
+        self._parts.clear()
+        self._size = 0
+        return chunk
+
+
+def iter_csv(sheet: ExportSheet) -> Iterator[bytes]:
+    """Stream a sheet as UTF-8 CSV (with a BOM so Excel detects the encoding)."""
+    text = io.StringIO()
+    writer = csv.writer(text)
+    text.write("\ufeff")
+    writer.writerow(sheet.header())
+    for row in sheet.flat_rows():
+        writer.writerow(row)
+        if text.tell() >= EXPORT_CHUNK_SIZE:
+            yield text.getvalue().encode("utf-8")
+            text.seek(0)
+            text.truncate()
+    yield text.getvalue().encode("utf-8")
+
+
+_XLSX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '</Types>'
+)
+
+_XLSX_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+
+_XLSX_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="{name}" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+
+_XLSX_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+    '<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>'
+    '</Relationships>'
+)
+
+# Cell styles: 0 default, 1 bold header, 2 two-decimal number
+_XLSX_STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+    '<font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="3"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/>'
+    '<xf numFmtId="4" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/></cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+
+def _column_letter(index: int) -> str:
+    letters = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+def _xlsx_cell(ref: str, value: Any, style: int) -> str:
+    if value is None or value == "":
+        return ""
+    style_attr = f' s="{style}"' if style else ""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return f'<c r="{ref}"{style_attr}><v>{value}</v></c>'
+    return f'<c r="{ref}" t="inlineStr"{style_attr}><is><t>{escape(str(value))}</t></is></c>'
+
+def iter_xlsx(sheet: ExportSheet) -> Iterator[bytes]:
+    """Stream a sheet as a single-worksheet XLSX workbook."""
+    buffer = _ChunkBuffer()
+    header = sheet.header()
+    letters = [_column_letter(i) for i in range(len(header))]
+    offset = 1 if sheet.group_column else 0
+    styles = [2 if i - offset in sheet.money_columns else 0 for i in range(len(header))]
+    # Excel limits sheet names to 31 characters
+    sheet_name = escape(sheet.title[:31])
+
+    # The buffer has no tell(), so zipfile writes in streaming mode (data descriptors)
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as workbook:
+        workbook.writestr("[Content_Types].xml", _XLSX_CONTENT_TYPES)
+        workbook.writestr("_rels/.rels", _XLSX_ROOT_RELS)
+        workbook.writestr("xl/workbook.xml", _XLSX_WORKBOOK.format(name=sheet_name))
+        workbook.writestr("xl/_rels/workbook.xml.rels", _XLSX_WORKBOOK_RELS)
+        workbook.writestr("xl/styles.xml", _XLSX_STYLES)
+        yield buffer.drain()
+
+        with workbook.open("xl/worksheets/sheet1.xml", "w", force_zip64=True) as part:
+            cells = "".join(_xlsx_cell(f"{letter}1", name, 1) for letter, name in zip(letters, header))
+            part.write(
+                '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                f'<sheetData><row r="1">{cells}</row>'.encode("utf-8")
+            )
+            for number, row in enumerate(sheet.flat_rows(), start=2):
+                cells = "".join(
+                    _xlsx_cell(f"{letter}{number}", value, style)
+                    for letter, value, style in zip(letters, row, styles)
+                )
+                part.write(f'<row r="{number}">{cells}</row>'.encode("utf-8"))
+                if buffer.full():
+                    yield buffer.drain()
+            part.write(b"</sheetData></worksheet>")
+    yield buffer.drain()
+
+
+# A4 portrait, in points
+_PAGE_WIDTH = 595
+_PAGE_HEIGHT = 842
+_MARGIN = 50
+_LINE_HEIGHT = 15
+_FONT_SIZE = 9
+
+# Helvetica advance widths (1/1000 em) of the characters used in number columns
+_NUMBER_WIDTHS = {".": 278, ",": 278, "-": 333, "$": 556}
+_DIGIT_WIDTH = 556
+
+def _pdf_text(value: str) -> str:
+    """Escape text for a PDF string, keeping to the WinAnsi character set."""
+    try:
+        encoded = value.encode("cp1252")
+    except UnicodeEncodeError:
+        # Drop diacritics the standard fonts cannot show (e.g. macrons)
+        stripped = "".join(c for c in unicodedata.normalize("NFKD", value) if not unicodedata.combining(c))
+        encoded = stripped.encode("cp1252", errors="replace")
+    text = encoded.decode("latin-1")
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+def _number_width(text: str, size: float) -> float:
+    return sum(_NUMBER_WIDTHS.get(c, _DIGIT_WIDTH) for c in text) * size / 1000
+
+class _PdfPages:
+    """Lays out text lines and emits one compressed content stream per page."""
+
+    def __init__(self, columns: List[Tuple[float, bool]]):
+        # (x position, right aligned) per column
+        self.columns = columns
+        self.ops: List[str] = []
+        self.y = _PAGE_HEIGHT - _MARGIN
+        self.page_number = 1
+
+    def has_room(self, lines: int = 1) -> bool:
+        return self.y - lines * _LINE_HEIGHT >= _MARGIN + _LINE_HEIGHT
+
+    def text(self, x: float, value: str, bold: bool = False, size: float = _FONT_SIZE) -> None:
+        font = "F2" if bold else "F1"
+        self.ops.append(f"BT /{font} {size} Tf {x:.2f} {self.y:.2f} Td ({_pdf_text(value)}) Tj ET")
+
+    def row(self, values: Sequence[str], bold: bool = False) -> None:
+        for (x, right), value in zip(self.columns, values):
+            if not value:
+                continue
+            if right:
+                x -= _number_width(value, _FONT_SIZE)
+            self.text(x, value, bold)
+        self.y -= _LINE_HEIGHT
+
+    def rule(self) -> None:
+        y = self.y + _LINE_HEIGHT - 4
+        self.ops.append(f"0.6 G {_MARGIN} {y:.2f} m {_PAGE_WIDTH - _MARGIN} {y:.2f} l S 0 G")
+
+    def skip(self, lines: float = 1) -> None:
+        self.y -= lines * _LINE_HEIGHT
+
+    def finish_page(self) -> bytes:
+        footer = f"Page {self.page_number}"
+        self.ops.append(
+            f"BT /F1 8 Tf {_PAGE_WIDTH - _MARGIN - _number_width(footer, 8) - 20:.2f} {_MARGIN / 2:.2f} Td "
+            f"({footer}) Tj ET"
+        )
+        content = zlib.compress("\n".join(self.ops).encode("latin-1"))
+        self.ops = []
+        self.y = _PAGE_HEIGHT - _MARGIN
+        self.page_number += 1
+        return content
+
+def _format_cell(value: Any, money: bool) -> str:
+    if value is None:
+        return ""
+    if money and isinstance(value, (int, float)):
+        return f"{value:,.2f}"
+    return str(value)
+
+def iter_pdf(sheet: ExportSheet) -> Iterator[bytes]:
+    """Stream a sheet as a PDF print layout."""
+    # Object numbers: 1 catalog, 2 page tree, 3/4 fonts, then content + page per page
+    offsets: Dict[int, int] = {}
+    position = 0
+    page_ids: List[int] = []
+    next_id = 5
+
+    def emit(object_id: int, body: bytes) -> bytes:
+        nonlocal position
+        offsets[object_id] = position
+        data = f"{object_id} 0 obj\n".encode("latin-1") + body + b"\nendobj\n"
+        position += len(data)
+        return data
+
+    def emit_page(content: bytes) -> bytes:
+        nonlocal next_id
+        content_id, page_id = next_id, next_id + 1
+        next_id += 2
+        page_ids.append(page_id)
+        stream = emit(
+            content_id,
+            f"<< /Length {len(content)} /Filter /FlateDecode >>\nstream\n".encode("latin-1") + content + b"\nendstream"
+        )
+        page = emit(
+            page_id,
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {_PAGE_WIDTH} {_PAGE_HEIGHT}] "
+            f"/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> /Contents {content_id} 0 R >>".encode("latin-1")
+        )
+        return stream + page
+
+    header = b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n"
+    position = len(header)
+    yield header
+    yield emit(3, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+    yield emit(4, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>")
+
+    # First column is left aligned text, the rest share the remaining width right aligned
+    usable = _PAGE_WIDTH - 2 * _MARGIN
+    columns = [(_MARGIN, False)]
+    if len(sheet.columns) > 1:
+        first_width = usable * 0.4
+        step = (usable - first_width) / (len(sheet.columns) - 1)
+        numeric = sheet.group_column is not None
+        columns += [
+            (_MARGIN + first_width + step * (i + 1) if numeric else _MARGIN + first_width + step * i, numeric)
+            for i in range(len(sheet.columns) - 1)
+        ]
+    pages = _PdfPages(columns)
+    money = set(sheet.money_columns)
+    chunk: List[bytes] = []
+    chunk_size = 0
+
+    def new_page() -> None:
+        nonlocal chunk_size
+        data = emit_page(pages.finish_page())
+        chunk.append(data)
+        chunk_size += len(data)
+
+    def cells(row: Row) -> List[str]:
+        return [_format_cell(value, i in money) for i, value in enumerate(row)]
+
+    pages.text(_MARGIN, sheet.title, bold=True, size=16)
+    pages.skip(1.5)
+    if sheet.subtitle:
+        pages.text(_MARGIN, sheet.subtitle)
+        pages.skip(1.5)
+
+    for name, rows, total in sheet.groups():
+        if not pages.has_room(4):
+            new_page()
+        if name:
+            pages.text(_MARGIN, name, bold=True, size=11)
+            pages.skip(1.2)
+        pages.row(sheet.columns, bold=True)
+        pages.rule()
+        for row in rows:
+            if not pages.has_room():
+                new_page()
+                pages.row(sheet.columns, bold=True)
+                pages.rule()
+            pages.row(cells(row))
+        if total is not None:
+            pages.rule()
+            pages.row(cells(total), bold=True)
+        pages.skip(0.8)
+
+        if chunk_size >= EXPORT_CHUNK_SIZE:
+            yield b"".join(chunk)
+            chunk.clear()
+            chunk_size = 0
+
+    if sheet.grand_total is not None:
+        if not pages.has_room(2):
+            new_page()
+        pages.rule()
+        pages.row(cells(sheet.grand_total), bold=True)
+    new_page()
+    yield b"".join(chunk)
+
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
+    yield emit(2, f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>".encode("latin-1"))
+    yield emit(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+
+    xref = [f"xref\n0 {next_id}\n", "0000000000 65535 f \n"]
+    xref.extend(f"{offsets[object_id]:010d} 00000 n \n" for object_id in range(1, next_id))
+    xref.append(f"trailer\n<< /Size {next_id} /Root 1 0 R >>\nstartxref\n{position}\n%%EOF\n")
+    yield "".join(xref).encode("latin-1")
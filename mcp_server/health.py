@@ -0,0 +1,174 @@
+"""Lightweight background health probing of the indici API."""
+
+import asyncio
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import aiohttp
+
+from .config import config
+from .http_client import http_client
+
+logger = logging.getLogger(__name__)
+
+class UpstreamHealthProbe:
+    """
+    Periodically probe the indici API with a cheap HEAD request.
+
+    The latest result is kept in memory so health callers read it in O(1)
+    instead of pulling and decoding a full report. The probe targets a light
+    path (the API root by default), never a report endpoint. 2xx and 3xx
+    answers count as "up", as does 405 (the path exists but does not
+    support HEAD); 4xx and 5xx answers count as "down".
+    """
+
+    def __init__(self, url: str, interval: float = 30.0, timeout: float = 5.0, ewma_alpha: float = 0.3):
+        """Initialize the probe."""
+        self.url = url
+        self.interval = interval
+        self.timeout = timeout
+        self.ewma_alpha = ewma_alpha
+
+        self._lock = threading.Lock()
+        self._running = False
+        # Bumped by start() and stop(); a loop exits once its generation is stale
+        self._generation = 0
+        self._state = {
+            "healthy": None,
+            "last_checked": None,
+            "last_ok": None,
+            "last_status": None,
+            "last_error": None,
+            "latency_ms": None,
+            "latency_ewma_ms": None,
+            "consecutive_failures": 0,
+            "total_probes": 0
+        }
+        self._checked_at: Optional[float] = None
+
+    def start(self) -> None:
+        """Start the background prober (on the shared pool loop when it is running)."""
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+            self._generation += 1
+            generation = self._generation
+        http_client.spawn(self._run(generation))
+        logger.info(f"Upstream health probe started (url={self.url}, interval={self.interval}s)")
+
+    def stop(self) -> None:
+        """Stop the background prober after its current sleep."""
+        with self._lock:
+            self._running = False
+            self._generation += 1
+
+    def _is_current(self, generation: int) -> bool:
+        """Whether the loop of this generation should keep probing."""
+        with self._lock:
+            return self._running and self._generation == generation
+
+    async def _run(self, generation: int) -> None:
+        """Probe at a fixed interval until stopped or restarted."""
+        while self._is_current(generation):
+            try:
+                await self.probe_once()
+            except Exception as e:
+                logger.error(f"Health probe error: {str(e)}")
+            await asyncio.sleep(self.interval)
+
+    @staticmethod
+    def is_healthy_status(status: int) -> bool:
+        """Whether an HTTP status from the probed path means the API is serving."""
+        return 200 <= status < 400 or status == 405
+
+    async def probe_once(self) -> Dict[str, Any]:
+        """
+        Run a single probe and record the outcome.
+
+        Returns:
+            Snapshot of the updated health state
+        """
+        return await http_client.run(self._probe())
+
+    async def _probe(self) -> Dict[str, Any]:
+        """Send the HEAD request using the pooled session of the running loop."""
+        session = http_client.get_session()
+        started = time.perf_counter()
+        status = None
+        error = None
+
+        try:
+            async with session.head(
+                self.url,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                allow_redirects=False
+            ) as response:
+                status = response.status
+                if not self.is_healthy_status(status):
+                    error = f"HTTP {status}"
+        except asyncio.TimeoutError:
+            error = f"Probe timed out after {self.timeout}s"
+        except Exception as e:
+            error = str(e) or type(e).__name__
+
+        latency_ms = (time.perf_counter() - started) * 1000
+        self._record(error is None, latency_ms, status, error)
+        return self.get_state()
+
+    def _record(self, ok: bool, latency_ms: float, status: Optional[int], error: Optional[str]) -> None:
+        """Update the cached health state with a probe result."""
+        now = datetime.now().isoformat()
+        with self._lock:
+            state = self._state
+            state["healthy"] = ok
+            state["last_checked"] = now
+            state["last_status"] = status
+            state["total_probes"] += 1
+            self._checked_at = time.monotonic()
+
+            if ok:
+                state["last_ok"] = now
+                state["last_error"] = None
+                state["latency_ms"] = round(latency_ms, 1)
+                previous = state["latency_ewma_ms"]
+                ewma = latency_ms if previous is None else (self.ewma_alpha * latency_ms + (1 - self.ewma_alpha) * previous)
+                state["latency_ewma_ms"] = round(ewma, 1)
+                state["consecutive_failures"] = 0
+            else:
+                state["last_error"] = error
+                state["consecutive_failures"] += 1
+
+        if not ok:
+            logger.warning(f"Upstream health probe failed: {error}")
+
+    def get_state(self) -> Dict[str, Any]:
+        """
+        Get the cached health state.
+
+        Returns:
+            Dict with healthy flag, last-ok timestamp, latency EWMA and failure count
+        """
+        with self._lock:
+            return dict(self._state)
+
+    def is_healthy(self) -> bool:
+        """Whether the last probe succeeded (unknown counts as healthy)."""
+        with self._lock:
+            return self._state["healthy"] is not False
+
+    @property
+    def state_age(self) -> Optional[float]:
+        """Seconds since the last probe, or None if the API was never probed."""
+        with self._lock:
+            return None if self._checked_at is None else time.monotonic() - self._checked_at
+
+# Global instance
+health_probe = UpstreamHealthProbe(
+    url=f"{config.indici_api_base_url}{config.health_probe_path}",
+    interval=config.health_probe_interval,
+    timeout=config.health_probe_timeout
+)
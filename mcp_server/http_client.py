@@ -0,0 +1,221 @@
+"""Pooled, long-lived HTTP client for calls to the indici API."""
+
+import asyncio
+import logging
+import threading
+import weakref
+from typing import Any, Awaitable, Dict, Optional
+
+import aiohttp
+
+from .config import config
+
+logger = logging.getLogger(__name__)
+
+class PooledHTTPClient:
+    """
+    Shared aiohttp sessions for all upstream indici API calls.
+
+    One ClientSession (with its own TCP connection pool, keep-alive and DNS
+    cache) is kept per event loop. The web layer creates a throw-away event
+    loop for every request, so the client can also own a background loop:
+    once started, coroutines submitted through run() from any other loop are
+    executed there and share the same warm connections.
+    """
+
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 20,
+        keepalive_timeout: float = 30.0,
+        dns_cache_ttl: int = 300
+    ):
+        """Initialize the pooled client."""
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+
+        self._sessions = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._background_tasks = set()
+        self._counters = {
+            "sessions_created": 0,
+            "requests": 0
+        }
+
+    def start(self) -> None:
+        """Start the background event loop that owns the shared pool."""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(
+                target=self._run_loop,
+                name="indici-http-pool",
+                daemon=True
+            )
+            self._thread.start()
+
+        logger.info(
+            f"HTTP pool started (limit={self.limit}, limit_per_host={self.limit_per_host}, "
+            f"keepalive={self.keepalive_timeout}s, dns_ttl={self.dns_cache_ttl}s)"
+        )
+
+    def _run_loop(self) -> None:
+        """Run the background event loop until shutdown() stops it."""
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    def get_session(self) -> aiohttp.ClientSession:
+        """
+        Get the pooled session for the running event loop, creating it on first use.
+
+        Returns:
+            aiohttp.ClientSession bound to the current loop
+        """
+        loop = asyncio.get_running_loop()
+
+        with self._lock:
+            session = self._sessions.get(loop)
+            if session is None or session.closed:
+                self._prune_closed_loops()
+                connector = aiohttp.TCPConnector(
+                    limit=self.limit,
+                    limit_per_host=self.limit_per_host,
+                    keepalive_timeout=self.keepalive_timeout,
+                    use_dns_cache=True,
+                    ttl_dns_cache=self.dns_cache_ttl
+                )
+                session = aiohttp.ClientSession(
+                    connector=connector,
+                    headers={"Content-Type": "application/json"}
+                )
+                self._sessions[loop] = session
+                self._counters["sessions_created"] += 1
+                logger.debug(f"Created pooled HTTP session for loop {id(loop)}")
+
+            self._counters["requests"] += 1
+
+        return session
+
+    def _prune_closed_loops(self) -> None:
+        """Drop sessions whose event loop has already been closed."""
+        for loop in [loop for loop in self._sessions.keys() if loop.is_closed()]:
+            # The loop is gone, so its transports are already dead; just forget them
+            self._sessions.pop(loop, None)
+
+    async def run(self, coro: Awaitable[Any]) -> Any:
+        """
+        Await a coroutine on the shared pool loop.
+
+        Falls back to the current loop when the background loop is not running
+        (e.g. the stdio MCP server), which then gets its own pooled session.
+
+        Args:
+            coro: Coroutine that performs the upstream call
+
+        Returns:
+            The coroutine's result
+        """
+        pool_loop = self._loop
+        if pool_loop is None or not pool_loop.is_running() or pool_loop is asyncio.get_running_loop():
+            return await coro
+
+        future = asyncio.run_coroutine_threadsafe(coro, pool_loop)
+        # Cancelling the wrapper cancels the task on the pool loop as well
+        return await asyncio.wrap_future(future)
+
+    def spawn(self, coro: Awaitable[Any]) -> None:
+        """
+        Schedule a fire-and-forget coroutine for background work.
+
+        Runs on the shared pool loop when it is started so the work outlives
+        the caller's (possibly short-lived) event loop; otherwise it is
+        scheduled on the current loop.
+
+        Args:
+            coro: Coroutine to run in the background
+        """
+        pool_loop = self._loop
+        if pool_loop is not None and pool_loop.is_running():
+            asyncio.run_coroutine_threadsafe(coro, pool_loop)
+            return
+
+        task = asyncio.get_running_loop().create_task(coro)
+        # Keep a strong reference until the task finishes
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def close(self) -> None:
+        """Close the session that belongs to the running event loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            session = self._sessions.pop(loop, None)
+        if session and not session.closed:
+            await session.close()
+
+    def shutdown(self) -> None:
+        """Close every pooled session and stop the background loop."""
+        pool_loop = self._loop
+        if pool_loop is None or not pool_loop.is_running():
+            return
+
+        try:
+            asyncio.run_coroutine_threadsafe(self.close(), pool_loop).result(timeout=5)
+        except Exception as e:
+            logger.warning(f"Error closing pooled HTTP session: {str(e)}")
+
+        pool_loop.call_soon_threadsafe(pool_loop.stop)
+        if self._thread:
+            self._thread.join(timeout=5)
+
+        self._loop = None
+        self._thread = None
+        logger.info("HTTP pool stopped")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get connection pool statistics for monitoring.
+
+        Returns:
+            Dict with open, idle and in-use connection counts plus pool settings
+        """
+        idle = 0
+        in_use = 0
+
+        with self._lock:
+            sessions = list(self._sessions.values())
+            counters = dict(self._counters)
+
+        for session in sessions:
+            connector = session.connector
+            if session.closed or connector is None:
+                continue
+            # aiohttp keeps idle keep-alive connections per host key and tracks acquired ones
+            idle += sum(len(conns) for conns in list(getattr(connector, "_conns", {}).values()))
+            in_use += len(getattr(connector, "_acquired", ()))
+
+        return {
+            "open_connections": idle + in_use,
+            "idle_connections": idle,
+            "in_use_connections": in_use,
+            "active_sessions": len([s for s in sessions if not s.closed]),
+            "background_loop_running": bool(self._loop and self._loop.is_running()),
+            "limit": self.limit,
+            "limit_per_host": self.limit_per_host,
+            "keepalive_timeout": self.keepalive_timeout,
+            "dns_cache_ttl": self.dns_cache_ttl,
+            **counters
+        }
+
+# Global instance
+http_client = PooledHTTPClient(
+    limit=config.indici_api_pool_limit,
+    limit_per_host=config.indici_api_pool_limit_per_host,
+    keepalive_timeout=config.indici_api_keepalive_timeout,
+    dns_cache_ttl=config.indici_api_dns_cache_ttl
+)
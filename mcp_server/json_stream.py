@@ -0,0 +1,187 @@
+"""Fast and incremental JSON decoding of indici API responses."""
+
+import json
+import re
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    import msgspec
+    _decoder = msgspec.json.Decoder()
+    FAST_JSON_AVAILABLE = True
+except ImportError:
+    _decoder = None
+    FAST_JSON_AVAILABLE = False
+
+# Both msgspec.DecodeError and json.JSONDecodeError are ValueErrors
+JSONDecodeError = ValueError
+
+_WHITESPACE = b" \t\r\n"
+
+def decode_json(data: bytes) -> Any:
+    """
+    Decode a JSON document from raw bytes in a single pass.
+
+    Uses msgspec when it is installed and falls back to the standard library.
+
+    Args:
+        data: UTF-8 encoded JSON
+
+    Returns:
+        Decoded Python object
+
+    Raises:
+        ValueError: If the document is not valid JSON
+    """
+    if _decoder is not None:
+        return _decoder.decode(data)
+    return json.loads(data)
+
+class ResultsStreamParser:
+    """
+    Incremental parser for responses that carry a large "results" array.
+
+    Feed it body chunks as they arrive; each element of the results array is
+    decoded as soon as it is complete (and handed to on_row, if given) while
+    only the current partial element is buffered. Everything outside the array
+    (totalRecords, providerName, ...) is kept and decoded once at the end.
+
+    Array elements must be JSON objects, which is what the indici report
+    endpoints return.
+    """
+
+    def __init__(self, key: str = "results", on_row: Optional[Callable[[Dict[str, Any]], None]] = None):
+        """Initialize the parser."""
+        self.key = key
+        self.on_row = on_row
+        self.rows: List[Dict[str, Any]] = []
+
+        self._key_pattern = re.compile(rb'"' + re.escape(key.encode()) + rb'"\s*:\s*\[')
+        self._state = "prefix"
+        self._buffer = bytearray()
+        self._envelope = bytearray()
+        self._search_from = 0
+
+    def feed(self, chunk: bytes) -> None:
+        """
+        Feed the next chunk of the response body.
+
+        Args:
+            chunk: Raw body bytes
+        """
+        if self._state == "suffix":
+            self._envelope += chunk
+            return
+
+        self._buffer += chunk
+
+        if self._state == "prefix":
+            match = self._key_pattern.search(self._buffer)
+            if match is None:
+                return
+            # Keep the envelope up to the key; the array is re-inserted as [] placeholder
+            self._envelope += self._buffer[:match.end()] + b"]"
+            del self._buffer[:match.end()]
+            self._state = "array"
+
+        self._consume_array()
+
+    def _consume_array(self) -> None:
+        """Decode every complete element currently buffered."""
+        buffer = self._buffer
+        pos = 0
+        length = len(buffer)
+
+        while True:
+            # Skip separators between elements
+            while pos < length and (buffer[pos] in _WHITESPACE or buffer[pos] == 0x2C):
+                pos += 1
+            if pos >= length:
+                break
+
+            if buffer[pos] == 0x5D:  # ']' closes the array
+                self._envelope += buffer[pos + 1:]
+                self._state = "suffix"
+                pos = length
+                break
+
+            if buffer[pos] != 0x7B:  # '{'
+                raise ValueError(f"Unsupported element in '{self.key}' array")
+
+            # Fast path: decode every element up to the last '}' in one call. This
+            # only succeeds when that '}' closes an element, which is the norm
+            # for flat report rows
+            last = buffer.rfind(b"}", max(pos, self._search_from))
+            if last != -1:
+                try:
+                    batch = decode_json(b"[" + bytes(buffer[pos:last + 1]) + b"]")
+                except JSONDecodeError:
+                    batch = None
+                if batch is not None:
+                    self._add_rows(batch)
+                    self._search_from = 0
+                    pos = last + 1
+                    continue
+
+            # The first '}' whose prefix decodes is the end of the object; a '}'
+            # inside a string or nested object just fails to decode and we move on
+            end = buffer.find(b"}", max(pos, self._search_from))
+            row = None
+            while end != -1:
+                try:
+                    row = decode_json(bytes(buffer[pos:end + 1]))
+                    break
+                except JSONDecodeError:
+                    end = buffer.find(b"}", end + 1)
+
+            if row is None:
+                # Element not complete yet; resume the '}' search where we stopped
+                self._search_from = length
+                break
+
+            self._search_from = 0
+            pos = end + 1
+            self._add_rows([row])
+
+        if pos:
+            del buffer[:pos]
+            if self._search_from:
+                self._search_from -= pos
+
+    def _add_rows(self, rows: List[Dict[str, Any]]) -> None:
+        """Collect decoded rows and pass them to the row callback."""
+        self.rows.extend(rows)
+        if self.on_row is not None:
+            for row in rows:
+                self.on_row(row)
+
+    def close(self) -> Any:
+        """
+        Finish parsing and return the full decoded document.
+
+        Returns:
+            The decoded response with the streamed rows in place of the results array
+
+        Raises:
+            ValueError: If the body was truncated or is not valid JSON
+        """
+        if self._state == "prefix":
+            # No results array found, decode the document as-is
+            return decode_json(bytes(self._buffer))
+        if self._state == "array":
+            raise ValueError(f"Truncated JSON: '{self.key}' array was not closed")
+
+        document = decode_json(bytes(self._envelope))
+        if not self._insert_rows(document):
+            raise ValueError(f"Could not locate '{self.key}' array in decoded document")
+        return document
+
+    def _insert_rows(self, node: Any) -> bool:
+        """Put the streamed rows back in place of the first empty results placeholder."""
+        if isinstance(node, dict):
+            if node.get(self.key) == [] and self.key in node:
+                node[self.key] = self.rows
+                return True
+            return any(self._insert_rows(value) for value in node.values())
+        if isinstance(node, list):
+            return any(self._insert_rows(value) for value in node)
+        return False
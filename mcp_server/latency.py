@@ -0,0 +1,164 @@
+"""Observed upstream latency, adaptive timeouts and hedging thresholds."""
+
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, Hashable, Optional, Tuple
+
+# Upper bounds (in days) of the date-range buckets capitation report latencies are kept under
+RANGE_BUCKETS = ((31, "month"), (92, "quarter"), (366, "year"))
+
+def range_bucket(params: Optional[Dict[str, Any]]) -> str:
+    """
+    Classify a request by the size of its date range.
+
+    Args:
+        params: Query parameters (dateFrom/dateTo are used when present)
+
+    Returns:
+        "month", "quarter", "year", "multi_year", or "all" for requests without a range
+    """
+    if not params or not params.get("dateFrom") or not params.get("dateTo"):
+        return "all"
+    try:
+        date_from = datetime.fromisoformat(str(params["dateFrom"])[:10])
+        date_to = datetime.fromisoformat(str(params["dateTo"])[:10])
+    except ValueError:
+        return "all"
+
+    days = (date_to - date_from).days + 1
+    for limit, name in RANGE_BUCKETS:
+        if days <= limit:
+            return name
+    return "multi_year"
+
+def _percentile(ordered: list, pct: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[rank]
+
+class LatencyTracker:
+    """
+    Sliding windows of recent request latencies per (endpoint, range bucket).
+
+    Timeouts are recorded at the timeout value: the request took at least that
+    long, so a timeout that proves too tight pushes the percentiles (and the
+    next timeout) up instead of being forgotten.
+    """
+
+    def __init__(
+        self,
+        window: int = 200,
+        min_samples: int = 20,
+        min_timeout: float = 5.0,
+        max_timeout: float = 30.0,
+        timeout_multiplier: float = 3.0,
+        hedge_percentile: float = 95.0,
+        hedge_min_delay: float = 0.5
+    ):
+        """Initialize the tracker."""
+        self.window = window
+        self.min_samples = min_samples
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.timeout_multiplier = timeout_multiplier
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_delay = hedge_min_delay
+
+        self._lock = threading.Lock()
+        self._samples: Dict[Hashable, Deque[float]] = {}
+        self._timeouts: Dict[Hashable, int] = {}
+
+    def record(self, key: Hashable, seconds: float, timed_out: bool = False) -> None:
+        """
+        Record the latency of one request.
+
+        Args:
+            key: (endpoint, range bucket)
+            seconds: Observed latency, or the timeout that expired
+            timed_out: Whether the request timed out
+        """
+        with self._lock:
+            samples = self._samples.get(key)
+            if samples is None:
+                samples = self._samples[key] = deque(maxlen=self.window)
+            samples.append(seconds)
+            if timed_out:
+                self._timeouts[key] = self._timeouts.get(key, 0) + 1
+
+    def percentiles(self, key: Hashable, *pcts: float) -> Optional[Tuple[float, ...]]:
+        """
+        Get latency percentiles for a key.
+
+        Args:
+            key: (endpoint, range bucket)
+            pcts: Percentiles to compute (0-100)
+
+        Returns:
+            Tuple of latencies in seconds, or None until min_samples are recorded
+        """
+        with self._lock:
+            samples = self._samples.get(key)
+            if samples is None or len(samples) < self.min_samples:
+                return None
+            ordered = sorted(samples)
+        return tuple(_percentile(ordered, pct) for pct in pcts)
+
+    def timeout_for(self, key: Hashable) -> float:
+        """
+        Get the timeout for the next request.
+
+        Args:
+            key: (endpoint, range bucket)
+
+        Returns:
+            A multiple of the observed p99, clamped to [min_timeout, max_timeout];
+            max_timeout until enough samples are recorded
+        """
+        observed = self.percentiles(key, 99)
+        if observed is None:
+            return self.max_timeout
+        return max(self.min_timeout, min(self.max_timeout, observed[0] * self.timeout_multiplier))
+
+    def hedge_delay(self, key: Hashable) -> Optional[float]:
+        """
+        Get how long to wait before sending a hedged copy of a request.
+
+        Args:
+            key: (endpoint, range bucket)
+
+        Returns:
+            The observed hedge percentile (at least hedge_min_delay), or None until
+            enough samples are recorded
+        """
+        observed = self.percentiles(key, self.hedge_percentile)
+        if observed is None:
+            return None
+        return max(self.hedge_min_delay, observed[0])
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get latency percentiles and current timeouts for monitoring.
+
+        Returns:
+            Dict keyed by "endpoint [bucket]"
+        """
+        with self._lock:
+            keys = list(self._samples)
+        stats = {}
+        for key in keys:
+            endpoint, bucket = key
+            with self._lock:
+                ordered = sorted(self._samples[key])
+                timeouts = self._timeouts.get(key, 0)
+            hedge_delay = self.hedge_delay(key)
+            stats[f"{endpoint} [{bucket}]"] = {
+                "samples": len(ordered),
+                "timeouts": timeouts,
+                "p50_ms": round(_percentile(ordered, 50) * 1000, 1),
+                "p95_ms": round(_percentile(ordered, 95) * 1000, 1),
+                "p99_ms": round(_percentile(ordered, 99) * 1000, 1),
+                "timeout_s": round(self.timeout_for(key), 2),
+                "hedge_after_s": round(hedge_delay, 2) if hedge_delay is not None else None
+            }
+        return stats
@@ -0,0 +1,214 @@
+"""In-memory fuzzy name index over an income providers roster."""
+
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Set, Tuple
+
+# Titles people type in front of a name but that the roster may not carry
+HONORIFICS = frozenset({"dr", "doctor", "mr", "mrs", "ms", "miss", "prof", "professor", "nurse", "np", "rn"})
+
+_NON_WORD = re.compile(r"[^\w\s]+")
+
+class NameMatch(NamedTuple):
+    """A roster name with its similarity to the query (0-1)."""
+    name: str
+    score: float
+
+class NameResolution(NamedTuple):
+    """
+    Outcome of resolving one free-text provider name.
+
+    status is "exact" (same name up to case, spacing and titles), "resolved"
+    (one clear fuzzy match), "ambiguous" (several close matches), "suggest"
+    (only weak matches) or "unknown" (nothing similar in the roster).
+    """
+    query: str
+    status: str
+    name: str
+    candidates: List[NameMatch]
+
+def normalize_tokens(text: str) -> Tuple[str, ...]:
+    """
+    Split a name into comparable tokens.
+
+    Accents, punctuation, case and leading titles ("Dr", "Mrs") are dropped.
+
+    Args:
+        text: Free-text or roster name
+
+    Returns:
+        Tuple of lower-case tokens
+    """
+    folded = unicodedata.normalize("NFKD", text)
+    folded = "".join(char for char in folded if not unicodedata.combining(char)).casefold()
+    tokens = _NON_WORD.sub(" ", folded).split()
+    # Keep a lone title ("Dr") rather than ending up with nothing to match
+    stripped = [token for token in tokens if token not in HONORIFICS]
+    return tuple(stripped or tokens)
+
+def _trigrams(tokens: Tuple[str, ...]) -> Set[str]:
+    """Trigrams of each token, padded so word starts and ends count."""
+    grams = set()
+    for token in tokens:
+        padded = f"  {token} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+@lru_cache(maxsize=4096)
+def _token_similarity(query: str, token: str) -> float:
+    """
+    Similarity of two tokens from their optimal string alignment distance.
+
+    A query of three or more characters that starts a token ("Ahm" for
+    "Ahmad") counts as a near match, and a single initial matches any token
+    starting with it.
+    """
+    if query == token:
+        return 1.0
+    if token.startswith(query) and (len(query) >= 3 or len(query) == 1):
+        return 0.9 if len(query) >= 3 else 0.6
+
+    rows, cols = len(query) + 1, len(token) + 1
+    previous2: List[int] = []
+    previous = list(range(cols))
+    for i in range(1, rows):
+        current = [i] + [0] * (cols - 1)
+        for j in range(1, cols):
+            cost = 0 if query[i - 1] == token[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and query[i - 1] == token[j - 2] and query[i - 2] == token[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        previous2, previous = previous, current
+    return max(0.0, 1.0 - previous[-1] / max(len(query), len(token)))
+
+class ProviderNameIndex:
+    """
+    Trigram index over roster names with edit-distance re-ranking.
+
+    Each query token is compared only with the distinct roster tokens that
+    share a trigram with it, and a name scores the average of its best token
+    matches, so "Smtih" finds "Dr John Smith" and "Ahmad" finds "Ahmad Khan".
+    Built once per roster and read-only afterwards, so lookups need no locking.
+    """
+
+    def __init__(
+        self,
+        names: List[str],
+        min_score: float = 0.75,
+        ambiguity_margin: float = 0.08,
+        suggest_score: float = 0.5
+    ):
+        """
+        Build the index.
+
+        Args:
+            names: Roster names (duplicates are ignored)
+            min_score: Lowest score accepted as a match
+            ambiguity_margin: A runner-up this close to the best match makes the name ambiguous
+            suggest_score: Lowest score offered as a suggestion
+        """
+        self.names = list(dict.fromkeys(name for name in names if name and name.strip()))
+        self.min_score = min_score
+        self.ambiguity_margin = ambiguity_margin
+        self.suggest_score = suggest_score
+
+        self._tokens = [normalize_tokens(name) for name in self.names]
+        self._exact: Dict[Tuple[str, ...], List[int]] = {}
+        # Distinct name tokens, the names using each, and the tokens holding each trigram
+        self._token_names: Dict[str, List[int]] = {}
+        self._postings: Dict[str, List[str]] = {}
+        for position, tokens in enumerate(self._tokens):
+            self._exact.setdefault(tokens, []).append(position)
+            for token in set(tokens):
+                self._token_names.setdefault(token, []).append(position)
+        for token in self._token_names:
+            for gram in _trigrams((token,)):
+                self._postings.setdefault(gram, []).append(token)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _similar_tokens(self, part: str) -> Dict[str, float]:
+        """Roster tokens sharing a trigram with a query token, with their similarity."""
+        shared = set()
+        for gram in _trigrams((part,)):
+            shared.update(self._postings.get(gram, ()))
+        similar = {}
+        for token in shared:
+            # The length gap alone already rules out a close match
+            if abs(len(token) - len(part)) > max(len(token), len(part)) / 2 and not token.startswith(part):
+                continue
+            score = _token_similarity(part, token)
+            if score > 0:
+                similar[token] = score
+        return similar
+
+    def search(self, query: str, limit: int = 5) -> List[NameMatch]:
+        """
+        Rank roster names by similarity to a free-text name.
+
+        Args:
+            query: Free-text provider name
+            limit: Maximum number of matches
+
+        Returns:
+            Matches scoring at least suggest_score, best first
+        """
+        parts = normalize_tokens(query)
+        if not parts or not self.names:
+            return []
+
+        exact = self._exact.get(parts)
+        if exact:
+            return [NameMatch(self.names[position], 1.0) for position in exact][:limit]
+
+        similar = [self._similar_tokens(part) for part in parts]
+        # A name can only average suggest_score if one of its tokens reaches it
+        positions = set()
+        for scores in similar:
+            for token, score in scores.items():
+                if score >= self.suggest_score:
+                    positions.update(self._token_names[token])
+
+        matches = []
+        for position in positions:
+            tokens = self._tokens[position]
+            score = sum(max(scores.get(token, 0.0) for token in tokens) for scores in similar) / len(parts)
+            # "Smith" should prefer "Smith" over "John Smith" but still rank both highly
+            score *= 1.0 - 0.02 * max(0, len(tokens) - len(parts))
+            if score >= self.suggest_score:
+                matches.append(NameMatch(self.names[position], round(score, 3)))
+        matches.sort(key=lambda match: (-match.score, match.name))
+        return matches[:limit]
+
+    def resolve(self, query: str, limit: int = 5) -> NameResolution:
+        """
+        Resolve a free-text name to a roster name.
+
+        Args:
+            query: Free-text provider name
+            limit: Maximum number of candidates returned
+
+        Returns:
+            NameResolution; name is the roster name for "exact" and "resolved",
+            otherwise the query unchanged
+        """
+        matches = self.search(query, limit)
+        if not matches:
+            return NameResolution(query, "unknown", query, [])
+
+        best = matches[0]
+        if best.score == 1.0:
+            exact = [match for match in matches if match.score == 1.0]
+            if len(exact) == 1:
+                return NameResolution(query, "exact", best.name, exact)
+            return NameResolution(query, "ambiguous", query, exact)
+
+        if best.score < self.min_score:
+            return NameResolution(query, "suggest", query, matches)
+
+        close = [match for match in matches if best.score - match.score <= self.ambiguity_margin]
+        if len(close) > 1:
+            return NameResolution(query, "ambiguous", query, close)
+        return NameResolution(query, "resolved", best.name, [best])
@@ -0,0 +1,571 @@
+"""
+HTML rendering of capitation reports and provider lists for tool output.
+
+Templates are plain format strings parsed once at import; their bound
+format methods are applied per section and row, and the pieces are
+collected in a list and joined once, so rendering is linear in the number
+of rows.
+
+Each layout comes in a full variant with inline styles, for clients that
+don't load the app stylesheet, and a compact variant that relies on the
+.rpt-* / .ip-* classes in web/static/css/style.css and has the template
+whitespace stripped.
+"""
+
+import html
+import re
+from typing import Any, Dict, List
+
+from .report_table import CapitationTable
+
+_WHITESPACE_RUN = re.compile(r"\s+")
+_WHITESPACE_BETWEEN_TAGS = re.compile(r">\s+<")
+
+def minify_html(html: str) -> str:
+    """
+    Strip indentation and line breaks from HTML markup.
+
+    Whitespace runs become a single space and whitespace between tags is
+    removed. Only used on templates, never on inserted values.
+
+    Args:
+        html: HTML markup
+
+    Returns:
+        Minified markup
+    """
+    return _WHITESPACE_BETWEEN_TAGS.sub("><", _WHITESPACE_RUN.sub(" ", html)).strip()
+
+class TemplateSet:
+    """
+    Precompiled templates for one layout.
+
+    Each keyword becomes an attribute holding the bound format method of its
+    template string.
+    """
+
+    def __init__(self, minify: bool = False, **templates: str):
+        """Initialize from template strings, minifying them once if requested."""
+        for name, template in templates.items():
+            setattr(self, name, (minify_html(template) if minify else template).format)
+
+SUMMARY_TEMPLATES = TemplateSet(
+    header="""
+<div class="w-100" style="width: 100% !important; max-width: 100% !important;">
+    <div class="card border-0 w-100">
+        <div class="card-header bg-primary text-white">
+            <h4 class="mb-0">📊 Provider Capitation Report</h4>
+        </div>
+        <div class="card-body p-2 w-100">
+            <div class="mb-2">
+                <strong>Total Records:</strong> {total_records}
+            </div>
+""",
+    provider_open="""
+            <div class="mb-3 w-100 {margin_class}">
+                <h5 style="text-align: center; color: #0066cc; font-weight: bold; margin: 20px 0 10px 0; font-size: 16px;">{provider_name}</h5>
+                <table class="table table-bordered mb-1 w-100" style="width: 100% !important; table-layout: fixed; border-collapse: collapse;">
+                    <thead style="background-color: #e9ecef;">
+                        <tr>
+                            <th scope="col" style="width: 25%; background-color: #e9ecef; border: 1px solid #dee2e6; padding: 8px; font-weight: bold;">AgeRange</th>
+                            <th scope="col" class="text-end" style="width: 25%; background-color: #e9ecef; border: 1px solid #dee2e6; padding: 8px; font-weight: bold;">CapitationAmount</th>
+                            <th scope="col" class="text-end" style="width: 25%; background-color: #e9ecef; border: 1px solid #dee2e6; padding: 8px; font-weight: bold;">Quantity</th>
+                            <th scope="col" class="text-end" style="width: 25%; background-color: #e9ecef; border: 1px solid #dee2e6; padding: 8px; font-weight: bold;">TotalAmount</th>
+                        </tr>
+                    </thead>
+                    <tbody>
+""",
+    row="""
+                        <tr style="background-color: #ffffff;">
+                            <td style="border: 1px solid #dee2e6; padding: 8px; background-color: #f8f9fa;">{age_range}</td>
+                            <td class="text-end" style="border: 1px solid #dee2e6; padding: 8px;">{capitation_amount:.2f}</td>
+                            <td class="text-end" style="border: 1px solid #dee2e6; padding: 8px;">{quantity}</td>
+                            <td class="text-end" style="border: 1px solid #dee2e6; padding: 8px;">{total_amount:.2f}</td>
+                        </tr>
+""",
+    provider_close="""
+                        <tr style="background-color: #f8f9fa; font-weight: bold;">
+                            <td style="border: 1px solid #dee2e6; padding: 8px; background-color: #f8f9fa; font-weight: bold;">Total</td>
+                            <td class="text-end" style="border: 1px solid #dee2e6; padding: 8px;"></td>
+                            <td class="text-end" style="border: 1px solid #dee2e6; padding: 8px; font-weight: bold;">{total_quantity}</td>
+                            <td class="text-end" style="border: 1px solid #dee2e6; padding: 8px; font-weight: bold;">{total_amount:.2f}</td>
+                        </tr>
+                    </tbody>
+                </table>
+            </div>
+""",
+    footer="""
+        </div>
+    </div>
+</div>
+"""
+)
+
+PRINT_TEMPLATES = TemplateSet(
+    header="""
+<div class="print-container">
+    <div class="print-header">
+        <h2>Provider Capitation Report</h2>
+        {period_html}
+    </div>
+""",
+    provider_open="""
+    <div class="provider-section">
+        <div class="provider-header">
+            <h3>{provider_name}</h3>
+        </div>
+
+        <div class="provider-data">
+            <div class="data-row header-row">
+                <span class="age-range">Age Range</span>
+                <span class="capitation-amount">Capitation Amount</span>
+                <span class="quantity">Quantity</span>
+                <span class="total-amount">Total Amount</span>
+            </div>
+""",
+    row="""
+            <div class="data-row">
+                <span class="age-range">{age_range}</span>
+                <span class="capitation-amount">{capitation_amount:.2f}</span>
+                <span class="quantity">{quantity}</span>
+                <span class="total-amount">{total_amount:.2f}</span>
+            </div>
+""",
+    provider_close="""
+            <div class="data-row total-row">
+                <span class="age-range"><strong>Total</strong></span>
+                <span class="capitation-amount"></span>
+                <span class="quantity"><strong>{total_quantity}</strong></span>
+                <span class="total-amount"><strong>{total_amount:.2f}</strong></span>
+            </div>
+        </div>
+    </div>
+""",
+    footer="""
+</div>
+"""
+)
+
+COMPACT_SUMMARY_TEMPLATES = TemplateSet(
+    minify=True,
+    header="""
+<div class="w-100 rpt-wrap">
+    <div class="card border-0 w-100">
+        <div class="card-header bg-primary text-white">
+            <h4 class="mb-0">📊 Provider Capitation Report</h4>
+        </div>
+        <div class="card-body p-2 w-100">
+            <div class="mb-2"><strong>Total Records:</strong> {total_records}</div>
+""",
+    provider_open="""
+            <div class="mb-3 w-100 {margin_class}">
+                <h5 class="rpt-provider">{provider_name}</h5>
+                <table class="table table-bordered mb-1 w-100 rpt-table">
+                    <thead>
+                        <tr>
+                            <th scope="col">AgeRange</th>
+                            <th scope="col" class="text-end">CapitationAmount</th>
+                            <th scope="col" class="text-end">Quantity</th>
+                            <th scope="col" class="text-end">TotalAmount</th>
+                        </tr>
+                    </thead>
+                    <tbody>
+""",
+    row="""
+                        <tr>
+                            <td>{age_range}</td>
+                            <td class="text-end">{capitation_amount:.2f}</td>
+                            <td class="text-end">{quantity}</td>
+                            <td class="text-end">{total_amount:.2f}</td>
+                        </tr>
+""",
+    provider_close="""
+                        <tr class="rpt-total">
+                            <td>Total</td>
+                            <td></td>
+                            <td class="text-end">{total_quantity}</td>
+                            <td class="text-end">{total_amount:.2f}</td>
+                        </tr>
+                    </tbody>
+                </table>
+            </div>
+""",
+    footer="""
+        </div>
+    </div>
+</div>
+"""
+)
+
+BATCH_TEMPLATES = TemplateSet(
+    header="""
+<div class="w-100" style="width: 100% !important; max-width: 100% !important;">
+    <div class="card border-0 w-100">
+        <div class="card-header bg-primary text-white">
+            <h4 class="mb-0">📊 Provider Capitation Report - {section_count} Reports</h4>
+        </div>
+        <div class="card-body p-2 w-100">
+            <div class="mb-2">
+                <strong>Period:</strong> {period} &nbsp;&nbsp;&nbsp;
+                <strong>Reports:</strong> {succeeded} of {section_count} &nbsp;&nbsp;&nbsp;
+                <strong>Total Quantity:</strong> {total_quantity} &nbsp;&nbsp;&nbsp;
+                <strong>Total Amount:</strong> {total_amount:.2f}
+            </div>
+""",
+    section_open="""
+            <div class="w-100 mt-3 pt-2" style="border-top: 2px solid #0066cc;">
+                <h4 style="color: #0066cc; font-weight: bold; font-size: 18px; margin: 10px 0;">{label}</h4>
+                <div class="mb-2">
+                    <strong>Total Quantity:</strong> {total_quantity} &nbsp;&nbsp;&nbsp;
+                    <strong>Total Amount:</strong> {total_amount:.2f}
+                </div>
+""",
+    section_empty="""
+                <div class="alert alert-danger text-center" style="background-color: #f8d7da; border-color: #f5c6cb; color: #721c24; padding: 15px; border-radius: 8px; margin: 0;">
+                    <strong>No record found</strong>
+                </div>
+""",
+    section_failed="""
+            <div class="w-100 mt-3 pt-2" style="border-top: 2px solid #0066cc;">
+                <h4 style="color: #0066cc; font-weight: bold; font-size: 18px; margin: 10px 0;">{label}</h4>
+                <div class="alert alert-warning" style="margin: 0;">⚠️ Report could not be retrieved: {error}</div>
+""",
+    section_close="""
+            </div>
+""",
+    footer="""
+        </div>
+    </div>
+</div>
+"""
+)
+
+COMPACT_BATCH_TEMPLATES = TemplateSet(
+    minify=True,
+    header="""
+<div class="w-100 rpt-wrap">
+    <div class="card border-0 w-100">
+        <div class="card-header bg-primary text-white">
+            <h4 class="mb-0">📊 Provider Capitation Report - {section_count} Reports</h4>
+        </div>
+        <div class="card-body p-2 w-100">
+            <div class="mb-2"><strong>Period:</strong> {period} &nbsp;&nbsp;&nbsp; <strong>Reports:</strong> {succeeded} of {section_count} &nbsp;&nbsp;&nbsp; <strong>Total Quantity:</strong> {total_quantity} &nbsp;&nbsp;&nbsp; <strong>Total Amount:</strong> {total_amount:.2f}</div>
+""",
+    section_open="""
+            <div class="w-100 mt-3 pt-2 rpt-section">
+                <h4 class="rpt-section-title">{label}</h4>
+                <div class="mb-2"><strong>Total Quantity:</strong> {total_quantity} &nbsp;&nbsp;&nbsp; <strong>Total Amount:</strong> {total_amount:.2f}</div>
+""",
+    section_empty="""
+                <div class="alert alert-danger text-center mb-0"><strong>No record found</strong></div>
+""",
+    section_failed="""
+            <div class="w-100 mt-3 pt-2 rpt-section">
+                <h4 class="rpt-section-title">{label}</h4>
+                <div class="alert alert-warning mb-0">⚠️ Report could not be retrieved: {error}</div>
+""",
+    section_close="""
+            </div>
+""",
+    footer="""
+        </div>
+    </div>
+</div>
+"""
+)
+
+INCOME_PROVIDERS_TEMPLATES = TemplateSet(
+    header="""
+<div class="w-100" style="width: 100% !important; max-width: 100% !important;">
+    <div class="card border-0 shadow-sm">
+        <div class="card-header bg-success text-white">
+            <h4 class="mb-0">👥 Income Providers List</h4>
+        </div>
+        <div class="card-body p-2 w-100">
+            <div class="mb-2">
+                <strong>Practice ID:</strong> {practice_id} &nbsp;&nbsp;&nbsp;
+                <strong>Location ID:</strong> {practice_location_id} &nbsp;&nbsp;&nbsp;
+                <strong>Total Records:</strong> {total_records}
+            </div>
+
+            <div class="table-responsive">
+                <table class="table table-striped table-hover mb-0" style="font-size: 12px;">
+                    <thead class="table-dark">
+                        <tr>
+                            <th style="width: 15%; text-align: center;">Patient ID</th>
+                            <th style="width: 50%; text-align: left;">Provider Full Name</th>
+                            <th style="width: 35%; text-align: center;">Provider ID (UUID)</th>
+                        </tr>
+                    </thead>
+                    <tbody>
+""",
+    row="""
+                        <tr style="background-color: #ffffff;">
+                            <td style="border: 1px solid #dee2e6; padding: 8px; text-align: center; background-color: #f8f9fa;">{patient_id}</td>
+                            <td style="border: 1px solid #dee2e6; padding: 8px; text-align: left;">{full_name}</td>
+                            <td style="border: 1px solid #dee2e6; padding: 8px; text-align: center; font-family: monospace; font-size: 10px;">{provider_id}</td>
+                        </tr>
+""",
+    footer="""
+                    </tbody>
+                </table>
+            </div>
+
+            <div class="mt-2 text-muted" style="font-size: 11px;">
+                <i class="fas fa-clock"></i> Retrieved: {retrieved_at}
+            </div>
+        </div>
+    </div>
+</div>
+"""
+)
+
+COMPACT_INCOME_PROVIDERS_TEMPLATES = TemplateSet(
+    minify=True,
+    header="""
+<div class="w-100 rpt-wrap">
+    <div class="card border-0 shadow-sm">
+        <div class="card-header bg-success text-white">
+            <h4 class="mb-0">👥 Income Providers List</h4>
+        </div>
+        <div class="card-body p-2 w-100">
+            <div class="mb-2"><strong>Practice ID:</strong> {practice_id} &nbsp;&nbsp;&nbsp; <strong>Location ID:</strong> {practice_location_id} &nbsp;&nbsp;&nbsp; <strong>Total Records:</strong> {total_records}</div>
+            <div class="table-responsive">
+                <table class="table table-striped table-hover mb-0 ip-table">
+                    <thead class="table-dark">
+                        <tr>
+                            <th>Patient ID</th>
+                            <th>Provider Full Name</th>
+                            <th>Provider ID (UUID)</th>
+                        </tr>
+                    </thead>
+                    <tbody>
+""",
+    row="""
+                        <tr>
+                            <td>{patient_id}</td>
+                            <td>{full_name}</td>
+                            <td>{provider_id}</td>
+                        </tr>
+""",
+    footer="""
+                    </tbody>
+                </table>
+            </div>
+            <div class="mt-2 text-muted rpt-meta"><i class="fas fa-clock"></i> Retrieved: {retrieved_at}</div>
+        </div>
+    </div>
+</div>
+"""
+)
+
+INCOME_PROVIDERS_SIMPLE_TEMPLATES = TemplateSet(
+    header="""
+<div class="w-100" style="width: 100% !important; max-width: 100% !important;">
+    <div class="card border-0 shadow-sm">
+        <div class="card-header bg-info text-white">
+            <h4 class="mb-0">👥 Income Providers for Provider Capitation Report</h4>
+        </div>
+        <div class="card-body p-2 w-100">
+            <div class="mb-2">
+                <strong>Total Providers:</strong> {total_records}
+            </div>
+
+            <div class="table-responsive">
+                <table class="table table-striped table-hover mb-0" style="font-size: 14px;">
+                    <thead class="table-dark">
+                        <tr>
+                            <th style="width: 100%; text-align: left;">Provider Full Name</th>
+                        </tr>
+                    </thead>
+                    <tbody>
+""",
+    row="""
+                        <tr style="background-color: #ffffff;">
+                            <td style="border: 1px solid #dee2e6; padding: 12px; text-align: left; font-weight: 500;">{full_name}</td>
+                        </tr>
+""",
+    footer="""
+                    </tbody>
+                </table>
+            </div>
+        </div>
+    </div>
+</div>
+"""
+)
+
+COMPACT_INCOME_PROVIDERS_SIMPLE_TEMPLATES = TemplateSet(
+    minify=True,
+    header="""
+<div class="w-100 rpt-wrap">
+    <div class="card border-0 shadow-sm">
+        <div class="card-header bg-info text-white">
+            <h4 class="mb-0">👥 Income Providers for Provider Capitation Report</h4>
+        </div>
+        <div class="card-body p-2 w-100">
+            <div class="mb-2"><strong>Total Providers:</strong> {total_records}</div>
+            <div class="table-responsive">
+                <table class="table table-striped table-hover mb-0 ip-simple">
+                    <thead class="table-dark">
+                        <tr><th>Provider Full Name</th></tr>
+                    </thead>
+                    <tbody>
+""",
+    row="""
+                        <tr><td>{full_name}</td></tr>
+""",
+    footer="""
+                    </tbody>
+                </table>
+            </div>
+        </div>
+    </div>
+</div>
+"""
+)
+
+def _render_providers(parts: List[str], table: CapitationTable, templates: TemplateSet, first_margin: str, margin: str) -> None:
+    """Append every provider section of the table to parts."""
+    totals = table.aggregates
+    provider_open = templates.provider_open
+    row = templates.row
+    provider_close = templates.provider_close
+    append = parts.append
+
+    # Provider position comes from enumeration; only the first section has no top margin
+    for position, provider in enumerate(table.group_by_provider()):
+        append(provider_open(margin_class=margin if position else first_margin, provider_name=provider.name))
+        for age_range, capitation_amount, quantity, total_amount in provider.rows():
+            append(row(age_range=age_range, capitation_amount=capitation_amount, quantity=quantity, total_amount=total_amount))
+        append(provider_close(
+            total_quantity=totals.provider_quantity[provider.code],
+            total_amount=totals.provider_amount[provider.code]
+        ))
+
+def render_report_summary(table: CapitationTable, total_records: int, compact: bool = False) -> str:
+    """
+    Render the chat summary of a capitation report.
+
+    Args:
+        table: Report rows
+        total_records: Total record count reported by the API
+        compact: Use the class-based, minified layout
+
+    Returns:
+        HTML tables grouped by provider
+    """
+    templates = COMPACT_SUMMARY_TEMPLATES if compact else SUMMARY_TEMPLATES
+    parts = [templates.header(total_records=total_records)]
+    _render_providers(parts, table, templates, first_margin="", margin="mt-3")
+    parts.append(templates.footer())
+    return "".join(parts)
+
+def render_print_report(table: CapitationTable, period_text: str = "", templates: TemplateSet = PRINT_TEMPLATES) -> str:
+    """
+    Render the print layout of a capitation report.
+
+    Args:
+        table: Report rows
+        period_text: Period line shown under the title (omitted if empty)
+        templates: Layout to render with
+
+    Returns:
+        Print-ready HTML grouped by provider
+    """
+    parts = [templates.header(period_html=f"<p>{period_text}</p>" if period_text else "")]
+    _render_providers(parts, table, templates, first_margin="", margin="")
+    parts.append(templates.footer())
+    return "".join(parts)
+
+def render_batch_report(data: Dict[str, Any], compact: bool = False) -> str:
+    """
+    Render a batch of capitation reports as one report with a section per entity.
+
+    Args:
+        data: Batch data with dateFrom, dateTo, sections and grand totals
+        compact: Use the class-based, minified layout
+
+    Returns:
+        HTML with the grand totals followed by each entity's provider tables or error
+    """
+    templates = COMPACT_BATCH_TEMPLATES if compact else BATCH_TEMPLATES
+    providers = COMPACT_SUMMARY_TEMPLATES if compact else SUMMARY_TEMPLATES
+    sections = data.get("sections", [])
+    date_from, date_to = data.get("dateFrom"), data.get("dateTo")
+    period = f"{date_from} to {date_to}" if date_from and date_to else (f"from {date_from}" if date_from else "All dates")
+
+    parts = [templates.header(
+        section_count=len(sections),
+        period=period,
+        succeeded=data.get("succeeded", 0),
+        total_quantity=data.get("totalQuantity", 0),
+        total_amount=data.get("totalAmount", 0)
+    )]
+    for section in sections:
+        label = html.escape(section["label"])
+        if not section["success"]:
+            parts.append(templates.section_failed(label=label, error=html.escape(str(section.get("error", "Unknown error")))))
+            parts.append(templates.section_close())
+            continue
+
+        parts.append(templates.section_open(
+            label=label,
+            total_quantity=section["totalQuantity"],
+            total_amount=section["totalAmount"]
+        ))
+        table = CapitationTable.for_report(section["report"])
+        if table is None:
+            parts.append(templates.section_empty())
+        else:
+            _render_providers(parts, table, providers, first_margin="", margin="mt-3")
+        parts.append(templates.section_close())
+    parts.append(templates.footer())
+    return "".join(parts)
+
+def render_income_providers_table(data: Dict[str, Any], compact: bool = False) -> str:
+    """
+    Render the full income providers list.
+
+    Args:
+        data: Income providers response data with results
+        compact: Use the class-based, minified layout
+
+    Returns:
+        HTML table of patient ID, provider name and provider ID
+    """
+    templates = COMPACT_INCOME_PROVIDERS_TEMPLATES if compact else INCOME_PROVIDERS_TEMPLATES
+    row = templates.row
+    parts = [templates.header(
+        practice_id=data.get("practiceId", "N/A"),
+        practice_location_id=data.get("practiceLocationId", "N/A"),
+        total_records=data.get("totalRecords", 0)
+    )]
+    parts.extend(
+        row(
+            patient_id=result.get("patientID", "N/A"),
+            full_name=result.get("fullName", "N/A"),
+            provider_id=result.get("providerID", "N/A")
+        )
+        for result in data.get("results", [])
+    )
+    parts.append(templates.footer(retrieved_at=data.get("retrievedAt", "")))
+    return "".join(parts)
+
+def render_income_providers_simple_table(data: Dict[str, Any], compact: bool = False) -> str:
+    """
+    Render the provider-name-only income providers list.
+
+    Args:
+        data: Income providers response data with results
+        compact: Use the class-based, minified layout
+
+    Returns:
+        HTML table of provider names
+    """
+    templates = COMPACT_INCOME_PROVIDERS_SIMPLE_TEMPLATES if compact else INCOME_PROVIDERS_SIMPLE_TEMPLATES
+    row = templates.row
+    parts = [templates.header(total_records=data.get("totalRecords", 0))]
+    parts.extend(row(full_name=result.get("fullName", "N/A")) for result in data.get("results", []))
+    parts.append(templates.footer())
+    return "".join(parts)
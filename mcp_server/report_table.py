@@ -0,0 +1,249 @@
+"""Compact columnar representation of capitation report rows."""
+
+import sys
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Sequence, Tuple
+
+from .aggregation import ReportAggregates, aggregate
+
+# Tables built for recent reports, keyed by the identity of their results list
+_TABLE_CACHE_SIZE = 32
+_tables: "OrderedDict[int, Tuple[list, CapitationTable]]" = OrderedDict()
+_tables_lock = threading.Lock()
+
+class ProviderView:
+    """
+    Rows of a single provider within a CapitationTable.
+
+    A view only holds a slice of row indices; column data stays in the table.
+    """
+
+    __slots__ = ("table", "code", "name", "indices")
+
+    def __init__(self, table: "CapitationTable", code: int, name: str, indices: Sequence[int]):
+        """Initialize the view."""
+        self.table = table
+        self.code = code
+        self.name = name
+        self.indices = indices
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def rows(self) -> Iterator[Tuple[str, float, Any, float]]:
+        """
+        Iterate the provider's rows in upstream order.
+
+        Returns:
+            Iterator of (age_range, capitation_amount, quantity, total_amount)
+        """
+        table = self.table
+        age_ranges = table.age_ranges
+        age_index = table.age_index
+        capitation = table.capitation_amount
+        quantity = table.quantity
+        total = table.total_amount
+        for i in self.indices:
+            yield age_ranges[age_index[i]], capitation[i], quantity[i], total[i]
+
+    @property
+    def total_quantity(self) -> Any:
+        """Sum of quantity over the provider's rows."""
+        return self.table.aggregates.provider_quantity[self.code]
+
+    @property
+    def total_amount(self) -> float:
+        """Sum of totalAmount over the provider's rows."""
+        return self.table.aggregates.provider_amount[self.code]
+
+class CapitationTable:
+    """
+    Column-oriented ProviderCapitationReport rows.
+
+    Numeric fields live in typed arrays (8 bytes per value instead of a boxed
+    Python number per dict entry), and provider names and age ranges are
+    interned and stored once, with each row keeping only a small integer code.
+    Rows are grouped by provider once at build time; the grouping keeps the
+    first-seen provider order and the upstream row order within a provider.
+    """
+
+    def __init__(self, rows: List[Dict[str, Any]]):
+        """
+        Build the table from upstream result rows.
+
+        Args:
+            rows: Row dicts from the "results" array of a report response
+        """
+        self.providers: List[str] = []
+        self.age_ranges: List[str] = []
+        provider_codes: Dict[str, int] = {}
+        age_codes: Dict[str, int] = {}
+
+        provider_index = array("I")
+        age_index = array("I")
+        capitation_amount = array("d")
+        quantities = []
+        total_amount = array("d")
+
+        for row in rows:
+            provider = row.get("providerName", "Unknown")
+            code = provider_codes.get(provider)
+            if code is None:
+                code = provider_codes[provider] = len(self.providers)
+                self.providers.append(sys.intern(provider))
+            provider_index.append(code)
+
+            age_range = row.get("ageRange", "N/A")
+            code = age_codes.get(age_range)
+            if code is None:
+                code = age_codes[age_range] = len(self.age_ranges)
+                self.age_ranges.append(sys.intern(age_range))
+            age_index.append(code)
+
+            capitation_amount.append(row.get("capitationAmount", 0) or 0)
+            quantities.append(row.get("quantity", 0) or 0)
+            total_amount.append(row.get("totalAmount", 0) or 0)
+
+        try:
+            quantity = array("q", quantities)
+        except TypeError:
+            # Fractional quantities are rare; keep the values as sent rather than coercing
+            quantity = quantities
+
+        self.provider_index = provider_index
+        self.age_index = age_index
+        self.capitation_amount = capitation_amount
+        self.quantity = quantity
+        self.total_amount = total_amount
+
+        # Counting sort of row indices by provider code, stable within a provider
+        counts = array("I", bytes(4 * len(self.providers)))
+        for code in provider_index:
+            counts[code] += 1
+        offsets = array("I", [0]) * (len(self.providers) + 1)
+        for code, count in enumerate(counts):
+            offsets[code + 1] = offsets[code] + count
+        order = array("I", bytes(4 * len(provider_index)))
+        cursor = array("I", offsets[:-1])
+        for i, code in enumerate(provider_index):
+            order[cursor[code]] = i
+            cursor[code] += 1
+        self._order = order
+        self._offsets = offsets
+        self._aggregates = None
+        self._rendered: Dict[Hashable, Any] = {}
+
+    @classmethod
+    def for_report(cls, report_data: Dict[str, Any]) -> Optional["CapitationTable"]:
+        """
+        Get the table for a report response, building it only once.
+
+        Formatters called with the same response object share one table.
+
+        Args:
+            report_data: Report response with data.results
+
+        Returns:
+            CapitationTable, or None if the response has no results
+        """
+        results = (report_data.get("data") or {}).get("results")
+        if not results:
+            return None
+
+        key = id(results)
+        with _tables_lock:
+            entry = _tables.get(key)
+            # The entry keeps its results list alive, so a matching id is the same list
+            if entry is not None and entry[0] is results:
+                _tables.move_to_end(key)
+                return entry[1]
+
+        table = cls(results)
+        with _tables_lock:
+            _tables[key] = (results, table)
+            _tables.move_to_end(key)
+            while len(_tables) > _TABLE_CACHE_SIZE:
+                _tables.popitem(last=False)
+        return table
+
+    def memoize(self, key: Hashable, build: Callable[[], Any]) -> Any:
+        """
+        Get a view rendered from this table, building it on first use.
+
+        The table is shared by every formatter of the same response object
+        (see for_report), so an unchanged report is rendered only once.
+
+        Args:
+            key: Identifies the view and any parameters it depends on
+            build: Renders the view
+
+        Returns:
+            The rendered view
+        """
+        view = self._rendered.get(key)
+        if view is None:
+            view = self._rendered[key] = build()
+        return view
+
+    def __len__(self) -> int:
+        return len(self.provider_index)
+
+    @property
+    def aggregates(self) -> "ReportAggregates":
+        """Provider, age-range, pivot and grand totals, computed once on first use."""
+        if self._aggregates is None:
+            self._aggregates = aggregate(self)
+        return self._aggregates
+
+    def group_by_provider(self) -> Iterator[ProviderView]:
+        """
+        Iterate providers in first-seen order.
+
+        Returns:
+            Iterator of ProviderView, one per provider
+        """
+        order = memoryview(self._order)
+        offsets = self._offsets
+        for code, name in enumerate(self.providers):
+            yield ProviderView(self, code, name, order[offsets[code]:offsets[code + 1]])
+
+    def provider(self, name: str) -> Optional[ProviderView]:
+        """Get the view of one provider, or None if it has no rows."""
+        try:
+            code = self.providers.index(name)
+        except ValueError:
+            return None
+        return ProviderView(self, code, name, memoryview(self._order)[self._offsets[code]:self._offsets[code + 1]])
+
+    def to_rows(self) -> List[Dict[str, Any]]:
+        """Convert back to row dicts in upstream order."""
+        providers = self.providers
+        age_ranges = self.age_ranges
+        return [
+            {
+                "providerName": providers[p],
+                "ageRange": age_ranges[a],
+                "capitationAmount": c,
+                "quantity": q,
+                "totalAmount": t
+            }
+            for p, a, c, q, t in zip(
+                self.provider_index, self.age_index, self.capitation_amount, self.quantity, self.total_amount
+            )
+        ]
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the column arrays and interned strings."""
+        columns = (
+            self.provider_index, self.age_index, self.capitation_amount,
+            self.quantity, self.total_amount, self._order, self._offsets
+        )
+        size = sum(
+            column.itemsize * len(column) if isinstance(column, array) else sys.getsizeof(column)
+            for column in columns
+        )
+        size += sum(sys.getsizeof(name) for name in self.providers)
+        size += sum(sys.getsizeof(name) for name in self.age_ranges)
+        return size
@@ -0,0 +1,230 @@
+"""Retry and circuit breaker policies for indici API calls."""
+
+import random
+import threading
+import time
+from typing import Any, Dict, Optional
+
+# Upstream answers worth retrying (and counted against the circuit breaker)
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+class RetryPolicy:
+    """
+    Bounded retries with jittered exponential backoff.
+
+    Delays use "full jitter": a uniform draw between 0 and the exponential
+    cap, so clients that failed together do not retry in lockstep.
+    """
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 0.25, max_delay: float = 4.0, deadline: float = 30.0):
+        """Initialize the policy."""
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+
+    def backoff(self, retry: int) -> float:
+        """
+        Get the delay before a retry.
+
+        Args:
+            retry: Retry number, starting at 1
+
+        Returns:
+            Delay in seconds
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (retry - 1))))
+
+    def should_retry(self, attempt: int, started_at: float, delay: float) -> bool:
+        """
+        Check whether another attempt fits the policy.
+
+        Args:
+            attempt: Attempts made so far
+            started_at: time.monotonic() of the first attempt
+            delay: Backoff before the next attempt
+
+        Returns:
+            True if another attempt may be made
+        """
+        if attempt >= self.max_attempts:
+            return False
+        return time.monotonic() - started_at + delay < self.deadline
+
+class CircuitBreaker:
+    """
+    Circuit breaker for one upstream endpoint.
+
+    closed:    calls pass; consecutive failures are counted and the breaker
+               opens once they reach failure_threshold.
+    open:      calls fail fast until recovery_timeout has passed.
+    half_open: up to half_open_max_calls probe calls pass; a success closes
+               the breaker, a failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_timeout: float = 30.0, half_open_max_calls: int = 1):
+        """Initialize the breaker."""
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = max(1, half_open_max_calls)
+
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at: Optional[float] = None
+        self._half_open_calls = 0
+        self._counters = {
+            "successes": 0,
+            "failures": 0,
+            "rejected": 0,
+            "times_opened": 0
+        }
+        self._last_failure: Optional[str] = None
+        self._last_state_change = time.time()
+
+    @property
+    def state(self) -> str:
+        """Current state, moving open to half_open once the recovery timeout has passed."""
+        with self._lock:
+            self._refresh()
+            return self._state
+
+    def _refresh(self) -> None:
+        """Move open to half_open when due. Caller holds the lock."""
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+            self._set_state(self.HALF_OPEN)
+            self._half_open_calls = 0
+
+    def _set_state(self, state: str) -> None:
+        """Change state. Caller holds the lock."""
+        self._state = state
+        self._last_state_change = time.time()
+
+    def allow(self) -> bool:
+        """
+        Check whether a call may go upstream, reserving a probe slot when half-open.
+
+        Returns:
+            False when the call should fail fast
+        """
+        with self._lock:
+            self._refresh()
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.HALF_OPEN and self._half_open_calls < self.half_open_max_calls:
+                self._half_open_calls += 1
+                return True
+            self._counters["rejected"] += 1
+            return False
+
+    def release(self) -> None:
+        """Give back a probe slot reserved by allow() for a call that ended without an outcome, e.g. was cancelled."""
+        with self._lock:
+            if self._state == self.HALF_OPEN and self._half_open_calls > 0:
+                self._half_open_calls -= 1
+
+    def retry_after(self) -> float:
+        """Seconds until an open breaker lets a probe call through."""
+        with self._lock:
+            if self._state != self.OPEN:
+                return 0.0
+            return max(0.0, self.recovery_timeout - (time.monotonic() - self._opened_at))
+
+    def record_success(self) -> None:
+        """Record a successful call, closing a half-open breaker."""
+        with self._lock:
+            self._counters["successes"] += 1
+            self._consecutive_failures = 0
+            if self._state != self.CLOSED:
+                self._set_state(self.CLOSED)
+                self._half_open_calls = 0
+
+    def record_failure(self, error: Optional[str] = None) -> None:
+        """
+        Record a failed call, opening the breaker when the threshold is reached.
+
+        Args:
+            error: Failure description kept for monitoring (optional)
+        """
+        with self._lock:
+            self._counters["failures"] += 1
+            self._consecutive_failures += 1
+            self._last_failure = error
+            if self._state == self.HALF_OPEN or (
+                self._state == self.CLOSED and self._consecutive_failures >= self.failure_threshold
+            ):
+                self._set_state(self.OPEN)
+                self._opened_at = time.monotonic()
+                self._counters["times_opened"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get breaker state for monitoring.
+
+        Returns:
+            Dict containing state, counters and timings
+        """
+        with self._lock:
+            self._refresh()
+            retry_after = 0.0
+            if self._state == self.OPEN:
+                retry_after = max(0.0, self.recovery_timeout - (time.monotonic() - self._opened_at))
+            return {
+                "state": self._state,
+                "consecutive_failures": self._consecutive_failures,
+                "failure_threshold": self.failure_threshold,
+                "retry_after_seconds": round(retry_after, 1),
+                "last_failure": self._last_failure,
+                "last_state_change": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self._last_state_change)),
+                **self._counters
+            }
+
+class CircuitBreakerRegistry:
+    """One circuit breaker per upstream endpoint, created on first use."""
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0, half_open_max_calls: int = 1):
+        """Initialize the registry."""
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+
+        self._lock = threading.Lock()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, name: str) -> CircuitBreaker:
+        """
+        Get the breaker for an endpoint.
+
+        Args:
+            name: Endpoint path
+
+        Returns:
+            CircuitBreaker for the endpoint
+        """
+        with self._lock:
+            breaker = self._breakers.get(name)
+            if breaker is None:
+                breaker = CircuitBreaker(
+                    name,
+                    failure_threshold=self.failure_threshold,
+                    recovery_timeout=self.recovery_timeout,
+                    half_open_max_calls=self.half_open_max_calls
+                )
+                self._breakers[name] = breaker
+            return breaker
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get the state of every breaker.
+
+        Returns:
+            Dict mapping endpoint path to breaker statistics
+        """
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return {breaker.name: breaker.get_stats() for breaker in breakers}
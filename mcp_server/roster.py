@@ -0,0 +1,250 @@
+"""Stale-while-revalidate cache for the income providers roster."""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from .http_client import http_client
+from .provider_index import ProviderNameIndex
+from .scheduler import BACKGROUND, upstream_context
+from .singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+@dataclass(frozen=True)
+class IncomeProvider:
+    """A single income provider from the roster."""
+    patient_id: Any
+    full_name: str
+    provider_id: str
+
+@dataclass
+class ProviderRoster:
+    """Income providers roster for one practice location."""
+    practice_id: int
+    practice_location_id: int
+    providers: List[IncomeProvider]
+    response: Dict[str, Any]
+    fetched_at: float = field(default_factory=time.monotonic)
+    index_settings: Dict[str, float] = field(default_factory=dict)
+
+    @classmethod
+    def from_response(
+        cls,
+        practice_id: int,
+        practice_location_id: int,
+        response: Dict[str, Any],
+        index_settings: Optional[Dict[str, float]] = None
+    ) -> "ProviderRoster":
+        """
+        Build a roster from a GetAllIncomeProviders API response.
+
+        Args:
+            practice_id: Practice ID the roster was fetched for
+            practice_location_id: Practice Location ID the roster was fetched for
+            response: Raw API response
+            index_settings: Thresholds passed to the name index (optional)
+
+        Returns:
+            ProviderRoster holding typed providers and the raw response
+        """
+        results = (response.get("data") or {}).get("results") or []
+        providers = [
+            IncomeProvider(
+                patient_id=result.get("patientID"),
+                full_name=result.get("fullName", ""),
+                provider_id=result.get("providerID", "")
+            )
+            for result in results
+        ]
+        return cls(
+            practice_id=practice_id,
+            practice_location_id=practice_location_id,
+            providers=providers,
+            response=response,
+            index_settings=dict(index_settings or {})
+        )
+
+    @property
+    def names(self) -> List[str]:
+        """Provider full names in roster order."""
+        return [provider.full_name for provider in self.providers]
+
+    @cached_property
+    def name_index(self) -> ProviderNameIndex:
+        """Fuzzy index over the provider names, built on first use."""
+        return ProviderNameIndex(self.names, **self.index_settings)
+
+    @property
+    def age(self) -> float:
+        """Seconds since the roster was fetched."""
+        return time.monotonic() - self.fetched_at
+
+class ProviderRosterCache:
+    """
+    Roster cache keyed by (practice_id, practice_location_id).
+
+    Entries younger than fresh_ttl are served as-is. Older entries are still
+    served immediately while a background refresh runs, until they pass
+    max_age; after that callers wait for a fresh fetch.
+    """
+
+    def __init__(
+        self,
+        fresh_ttl: float = 300.0,
+        max_age: float = 3600.0,
+        index_settings: Optional[Dict[str, float]] = None
+    ):
+        """Initialize the roster cache."""
+        self.fresh_ttl = fresh_ttl
+        self.max_age = max_age
+        self.index_settings = dict(index_settings or {})
+
+        self._rosters: Dict[Tuple[int, int], ProviderRoster] = {}
+        self._generations: Dict[Tuple[int, int], int] = {}
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._flights = SingleFlight()
+        self._counters = {
+            "fresh_hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "background_refreshes": 0,
+            "refresh_failures": 0
+        }
+
+    async def get(
+        self,
+        practice_id: int,
+        practice_location_id: int,
+        loader: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """
+        Get the roster response, fetching or refreshing it as needed.
+
+        Args:
+            practice_id: Practice ID
+            practice_location_id: Practice Location ID
+            loader: Zero-argument coroutine function that calls the API
+
+        Returns:
+            Raw API response (cached or fresh)
+        """
+        key = (practice_id, practice_location_id)
+
+        with self._lock:
+            roster = self._rosters.get(key)
+            if roster is not None and roster.age < self.fresh_ttl:
+                self._counters["fresh_hits"] += 1
+                return roster.response
+
+            if roster is not None and roster.age < self.max_age:
+                self._counters["stale_hits"] += 1
+                start_refresh = key not in self._refreshing
+                if start_refresh:
+                    self._refreshing.add(key)
+            else:
+                roster = None
+                self._counters["misses"] += 1
+
+        if roster is not None:
+            if start_refresh:
+                http_client.spawn(self._refresh(key, loader))
+            return roster.response
+
+        return await self._flights.do(key, lambda: self._load(key, loader))
+
+    async def _load(self, key: Tuple[int, int], loader: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """Fetch the roster and store it if the fetch succeeded."""
+        with self._lock:
+            generation = self._generations.get(key, 0)
+
+        response = await loader()
+        if response.get("success", True):
+            roster = ProviderRoster.from_response(key[0], key[1], response, self.index_settings)
+            # Index the names now, while the caller is already paying for a fetch
+            roster.name_index
+            with self._lock:
+                # Don't resurrect a roster that was invalidated while we were fetching
+                if self._generations.get(key, 0) == generation:
+                    self._rosters[key] = roster
+        return response
+
+    async def _refresh(self, key: Tuple[int, int], loader: Callable[[], Awaitable[Dict[str, Any]]]) -> None:
+        """Refresh a stale roster in the background, keeping the old one on failure."""
+        try:
+            with self._lock:
+                self._counters["background_refreshes"] += 1
+            with upstream_context(priority=BACKGROUND):
+                response = await self._flights.do(key, lambda: self._load(key, loader))
+            if not response.get("success", True):
+                with self._lock:
+                    self._counters["refresh_failures"] += 1
+                logger.warning(f"Background roster refresh failed for {key}: {response.get('error', 'Unknown error')}")
+        except Exception as e:
+            with self._lock:
+                self._counters["refresh_failures"] += 1
+            logger.warning(f"Background roster refresh failed for {key}: {str(e)}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def peek(self, practice_id: int, practice_location_id: int) -> Optional[ProviderRoster]:
+        """
+        Get the cached roster without fetching.
+
+        Args:
+            practice_id: Practice ID
+            practice_location_id: Practice Location ID
+
+        Returns:
+            ProviderRoster if one younger than max_age is cached, otherwise None
+        """
+        with self._lock:
+            roster = self._rosters.get((practice_id, practice_location_id))
+        if roster is None or roster.age >= self.max_age:
+            return None
+        return roster
+
+    def invalidate(self, practice_id: Optional[int] = None, practice_location_id: Optional[int] = None) -> int:
+        """
+        Drop cached rosters.
+
+        Args:
+            practice_id: Only drop rosters for this practice (all practices if None)
+            practice_location_id: Only drop rosters for this location (all locations if None)
+
+        Returns:
+            Number of rosters removed
+        """
+        with self._lock:
+            keys = [
+                key for key in self._rosters
+                if (practice_id is None or key[0] == practice_id)
+                and (practice_location_id is None or key[1] == practice_location_id)
+            ]
+            for key in keys:
+                del self._rosters[key]
+                self._generations[key] = self._generations.get(key, 0) + 1
+        if keys:
+            logger.info(f"Invalidated {len(keys)} cached provider roster(s)")
+        return len(keys)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get roster cache statistics for monitoring.
+
+        Returns:
+            Dict with cached roster count, hit counters and TTL settings
+        """
+        with self._lock:
+            return {
+                "rosters": len(self._rosters),
+                "refreshing": len(self._refreshing),
+                "fresh_ttl": self.fresh_ttl,
+                "max_age": self.max_age,
+                **self._counters
+            }
@@ -0,0 +1,314 @@
+"""Concurrency limits and fair scheduling of upstream indici API requests."""
+
+import asyncio
+import contextvars
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from typing import Any, Awaitable, Deque, Dict, Hashable, Iterator, List, Optional
+
+from .config import config
+
+# Request priorities, most urgent first
+INTERACTIVE = 0
+BACKGROUND = 1
+PREFETCH = 2
+PRIORITY_NAMES = ("interactive", "background", "prefetch")
+
+_priority: contextvars.ContextVar = contextvars.ContextVar("upstream_priority", default=INTERACTIVE)
+_client: contextvars.ContextVar = contextvars.ContextVar("upstream_client", default=None)
+
+@contextmanager
+def upstream_context(priority: Optional[int] = None, client: Optional[Hashable] = None) -> Iterator[None]:
+    """
+    Tag the upstream requests made in this context.
+
+    Event loops and tasks started inside the block inherit the tags, so the
+    web layer can wrap a whole chat message and background jobs can mark
+    their work as lower priority.
+
+    Args:
+        priority: INTERACTIVE, BACKGROUND or PREFETCH (unchanged if None)
+        client: User or session the requests are made for (unchanged if None)
+    """
+    tokens = []
+    if priority is not None:
+        tokens.append((_priority, _priority.set(priority)))
+    if client is not None:
+        tokens.append((_client, _client.set(client)))
+    try:
+        yield
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
+
+def current_priority() -> int:
+    """Priority of upstream requests made in the current context."""
+    return _priority.get()
+
+def current_client() -> Optional[Hashable]:
+    """User or session upstream requests in the current context are made for."""
+    return _client.get()
+
+class SchedulerBusy(Exception):
+    """Raised when a request waited longer than the queue timeout for a slot."""
+
+class _Waiter:
+    """A request waiting for a slot."""
+
+    __slots__ = ("loop", "future", "practice", "client", "priority", "enqueued_at", "granted")
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, practice: Hashable, client: Hashable, priority: int):
+        self.loop = loop
+        self.future = loop.create_future()
+        self.practice = practice
+        self.client = client
+        self.priority = priority
+        self.enqueued_at = time.monotonic()
+        self.granted = False
+
+def _wake(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+class UpstreamScheduler:
+    """
+    Admission control for upstream requests.
+
+    At most max_concurrency requests run at once, and at most
+    per_practice_concurrency for any one practice. Requests over the limits
+    queue by priority: interactive requests are always admitted before
+    background and prefetch work, which is also capped at
+    background_concurrency so interactive requests find free slots. Within a
+    priority, clients (users or sessions) are served round-robin so one
+    user's large batch cannot starve everyone else.
+
+    Requests may come from any thread and event loop (the web layer creates
+    a loop per message), so the state is guarded by a thread lock and waiters
+    are woken on their own loop.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        per_practice_concurrency: int = 4,
+        background_concurrency: int = 2,
+        queue_timeout: float = 30.0
+    ):
+        """Initialize the scheduler."""
+        self.max_concurrency = max(1, max_concurrency)
+        self.per_practice_concurrency = max(1, per_practice_concurrency)
+        self.background_concurrency = max(1, background_concurrency)
+        self.queue_timeout = queue_timeout
+
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._background_in_flight = 0
+        self._practice_in_flight: Dict[Hashable, int] = {}
+        # Per priority: client -> FIFO of that client's waiters, rotated for round-robin
+        self._queues: List["OrderedDict[Hashable, Deque[_Waiter]]"] = [OrderedDict() for _ in PRIORITY_NAMES]
+        self._queued = [0] * len(PRIORITY_NAMES)
+        self._counters = {
+            "admitted": 0,
+            "queued": 0,
+            "queue_timeouts": 0,
+            "max_queue_depth": 0,
+            "max_in_flight": 0
+        }
+        self._wait_total = [0.0] * len(PRIORITY_NAMES)
+        self._wait_max = [0.0] * len(PRIORITY_NAMES)
+        self._admitted = [0] * len(PRIORITY_NAMES)
+
+    async def run(
+        self,
+        coro: Awaitable[Any],
+        practice: Hashable = None,
+        client: Hashable = None,
+        priority: int = INTERACTIVE
+    ) -> Any:
+        """
+        Run an upstream request once a slot is free.
+
+        Args:
+            coro: The request coroutine
+            practice: Practice the request is for
+            client: User or session the request is made for
+            priority: INTERACTIVE, BACKGROUND or PREFETCH
+
+        Returns:
+            The coroutine's result
+
+        Raises:
+            SchedulerBusy: If no slot became free within queue_timeout
+        """
+        try:
+            await self.acquire(practice, client, priority)
+        except BaseException:
+            coro.close()
+            raise
+        try:
+            return await coro
+        finally:
+            self.release(practice, priority)
+
+    async def acquire(self, practice: Hashable = None, client: Hashable = None, priority: int = INTERACTIVE) -> None:
+        """
+        Wait for a slot. Every successful acquire must be paired with release().
+
+        Args:
+            practice: Practice the request is for
+            client: User or session the request is made for
+            priority: INTERACTIVE, BACKGROUND or PREFETCH
+
+        Raises:
+            SchedulerBusy: If no slot became free within queue_timeout
+        """
+        priority = min(max(priority, INTERACTIVE), PREFETCH)
+        waiter = _Waiter(asyncio.get_running_loop(), practice, client, priority)
+        with self._lock:
+            self._queues[priority].setdefault(client, deque()).append(waiter)
+            self._queued[priority] += 1
+            self._dispatch()
+            if waiter.granted:
+                return
+            self._counters["queued"] += 1
+            self._counters["max_queue_depth"] = max(self._counters["max_queue_depth"], sum(self._queued))
+
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), self.queue_timeout)
+        except BaseException as e:
+            with self._lock:
+                if waiter.granted:
+                    # Granted while timing out or being cancelled: hand the slot back
+                    self._finish(practice, priority)
+                    self._dispatch()
+                else:
+                    self._remove(waiter)
+                if isinstance(e, asyncio.TimeoutError):
+                    self._counters["queue_timeouts"] += 1
+            if isinstance(e, asyncio.TimeoutError):
+                raise SchedulerBusy(f"No upstream slot free within {self.queue_timeout:.0f}s") from None
+            raise
+
+    def release(self, practice: Hashable = None, priority: int = INTERACTIVE) -> None:
+        """
+        Free a slot taken by acquire().
+
+        Args:
+            practice: Practice passed to acquire()
+            priority: Priority passed to acquire()
+        """
+        with self._lock:
+            self._finish(practice, min(max(priority, INTERACTIVE), PREFETCH))
+            self._dispatch()
+
+    def _finish(self, practice: Hashable, priority: int) -> None:
+        """Account for a finished request. Caller holds the lock."""
+        self._in_flight -= 1
+        if priority != INTERACTIVE:
+            self._background_in_flight -= 1
+        remaining = self._practice_in_flight.get(practice, 1) - 1
+        if remaining:
+            self._practice_in_flight[practice] = remaining
+        else:
+            self._practice_in_flight.pop(practice, None)
+
+    def _remove(self, waiter: _Waiter) -> None:
+        """Drop a waiter that gave up. Caller holds the lock."""
+        queue = self._queues[waiter.priority]
+        waiters = queue.get(waiter.client)
+        if waiters is None:
+            return
+        try:
+            waiters.remove(waiter)
+        except ValueError:
+            return
+        self._queued[waiter.priority] -= 1
+        if not waiters:
+            del queue[waiter.client]
+
+    def _dispatch(self) -> None:
+        """Admit queued requests while slots are free. Caller holds the lock."""
+        while self._in_flight < self.max_concurrency:
+            waiter = self._next_waiter()
+            if waiter is None:
+                return
+
+            self._in_flight += 1
+            if waiter.priority != INTERACTIVE:
+                self._background_in_flight += 1
+            self._practice_in_flight[waiter.practice] = self._practice_in_flight.get(waiter.practice, 0) + 1
+            self._counters["admitted"] += 1
+            self._counters["max_in_flight"] = max(self._counters["max_in_flight"], self._in_flight)
+
+            waited = time.monotonic() - waiter.enqueued_at
+            self._admitted[waiter.priority] += 1
+            self._wait_total[waiter.priority] += waited
+            self._wait_max[waiter.priority] = max(self._wait_max[waiter.priority], waited)
+
+            waiter.granted = True
+            try:
+                waiter.loop.call_soon_threadsafe(_wake, waiter.future)
+            except RuntimeError:
+                # The waiter's loop is gone; nobody will use the slot
+                self._finish(waiter.practice, waiter.priority)
+
+    def _next_waiter(self) -> Optional[_Waiter]:
+        """Pop the next admissible waiter: by priority, then round-robin over clients. Caller holds the lock."""
+        for priority, queue in enumerate(self._queues):
+            if not queue:
+                continue
+            if priority != INTERACTIVE and self._background_in_flight >= self.background_concurrency:
+                return None
+
+            for client, waiters in queue.items():
+                waiter = waiters[0]
+                if self._practice_in_flight.get(waiter.practice, 0) >= self.per_practice_concurrency:
+                    continue
+
+                waiters.popleft()
+                self._queued[priority] -= 1
+                if waiters:
+                    queue.move_to_end(client)
+                else:
+                    del queue[client]
+                return waiter
+        return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get scheduler statistics for monitoring.
+
+        Returns:
+            Dict containing limits, in-flight and queued counts, and wait times per priority
+        """
+        with self._lock:
+            return {
+                "max_concurrency": self.max_concurrency,
+                "per_practice_concurrency": self.per_practice_concurrency,
+                "background_concurrency": self.background_concurrency,
+                "in_flight": self._in_flight,
+                "background_in_flight": self._background_in_flight,
+                "in_flight_by_practice": {str(practice): count for practice, count in self._practice_in_flight.items()},
+                "queue_depth": sum(self._queued),
+                "queue_depth_by_priority": dict(zip(PRIORITY_NAMES, self._queued)),
+                "queued_clients": sum(len(queue) for queue in self._queues),
+                "wait_ms_by_priority": {
+                    name: {
+                        "admitted": self._admitted[i],
+                        "avg": round(self._wait_total[i] / self._admitted[i] * 1000, 1) if self._admitted[i] else 0.0,
+                        "max": round(self._wait_max[i] * 1000, 1)
+                    }
+                    for i, name in enumerate(PRIORITY_NAMES)
+                },
+                **self._counters
+            }
+
+# Global instance
+upstream_scheduler = UpstreamScheduler(
+    max_concurrency=config.upstream_max_concurrency,
+    per_practice_concurrency=config.upstream_per_practice_concurrency,
+    background_concurrency=config.upstream_background_concurrency,
+    queue_timeout=config.upstream_queue_timeout
+)
@@ -20,6 +20,9 @@ from mcp.types import (
 
 from .config import config
 from .tools import indici_tools
+from .structured import to_json
+from .http_client import http_client
+from .health import health_probe
 
 # Configure logging
 logging.basicConfig(
@@ -55,7 +58,7 @@ class IndiciMCPServer:
                             },
                             "date_from": {
                                 "type": "string",
-                                "description": "Start date (optional, will be null if not provided). Supports formats: YYYY-MM-DD, DD/MM/YYYY, MM/DD/YYYY. Must be <= current date."
+                                "description": "Start date (optional, will be null if not provided). Supports formats: YYYY-MM-DD, DD/MM/YYYY, MM/DD/YYYY. Must be <= current date. Without date_to, relative expressions such as \"last quarter\", \"last financial year\", \"last 3 months\" or \"since March\" are also accepted."
                             },
                             "date_to": {
                                 "type": "string",
@@ -63,7 +66,7 @@ class IndiciMCPServer:
                             },
                             "provider_name": {
                                 "type": "string",
-                                "description": "Provider Name(s) - comma separated (optional)"
+                                "description": "Provider Name(s) - comma separated; close misspellings are matched against the roster of practice_location_id when it is given (optional)"
                             },
                             "location_id": {
                                 "type": "string",
@@ -76,6 +79,58 @@ class IndiciMCPServer:
                             "sort_by": {
                                 "type": "string",
                                 "description": "Sort by field (optional)"
+                            },
+                            "response_format": {
+                                "type": "string",
+                                "enum": ["html", "json"],
+                                "description": "Output format: rendered HTML (default) or structured JSON data for client-side rendering"
+                            }
+                        },
+                        "required": []
+                    }
+                ),
+
+                Tool(
+                    name="get_batch_capitation_report",
+                    description="Get the same Provider Capitation Report for several practices, providers or locations at once. One report is fetched per combination, concurrently, and combined into a single report with a section and totals per practice/provider/location plus grand totals. Reports that fail are listed per section without failing the rest.",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "practice_ids": {
+                                "type": "array",
+                                "items": {"type": "integer"},
+                                "description": "Practice IDs (defaults to [1])"
+                            },
+                            "provider_names": {
+                                "type": "array",
+                                "items": {"type": "string"},
+                                "description": "Provider names, one section each (optional)"
+                            },
+                            "location_ids": {
+                                "type": "array",
+                                "items": {"type": "string"},
+                                "description": "Location IDs, one section each (optional)"
+                            },
+                            "date_from": {
+                                "type": "string",
+                                "description": "Start date (optional). Same formats and relative expressions as get_provider_capitation_report."
+                            },
+                            "date_to": {
+                                "type": "string",
+                                "description": "End date (optional). Must be > date_from if both provided."
+                            },
+                            "practice_location_id": {
+                                "type": "integer",
+                                "description": "Practice Location ID (optional)"
+                            },
+                            "sort_by": {
+                                "type": "string",
+                                "description": "Sort by field (optional)"
+                            },
+                            "response_format": {
+                                "type": "string",
+                                "enum": ["html", "json"],
+                                "description": "Output format: rendered HTML (default) or structured JSON data for client-side rendering"
                             }
                         },
                         "required": []
@@ -104,6 +159,11 @@ class IndiciMCPServer:
                             "practice_location_id": {
                                 "type": "integer",
                                 "description": "Practice Location ID (defaults to 0 if not provided)"
+                            },
+                            "response_format": {
+                                "type": "string",
+                                "enum": ["html", "json"],
+                                "description": "Output format: rendered HTML (default) or structured JSON data for client-side rendering"
                             }
                         },
                         "required": []
@@ -127,8 +187,29 @@ class IndiciMCPServer:
                 logger.info(f"Tool called: {name} with arguments: {arguments}")
                 
                 if name == "get_provider_capitation_report":
+                    response_format = arguments.pop("response_format", "html")
                     result = await indici_tools.get_provider_capitation_report(**arguments)
-                    formatted_result = indici_tools.format_report_summary(result)
+                    if response_format == "json":
+                        formatted_result = to_json(indici_tools.format_report_data(result))
+                    else:
+                        formatted_result = indici_tools.format_report_summary(result)
+
+                    return CallToolResult(
+                        content=[
+                            TextContent(
+                                type="text",
+                                text=formatted_result
+                            )
+                        ]
+                    )
+
+                elif name == "get_batch_capitation_report":
+                    response_format = arguments.pop("response_format", "html")
+                    result = await indici_tools.get_batch_capitation_report(**arguments)
+                    if response_format == "json":
+                        formatted_result = to_json(indici_tools.format_batch_report_data(result))
+                    else:
+                        formatted_result = indici_tools.format_batch_report(result)
 
                     return CallToolResult(
                         content=[
@@ -140,8 +221,12 @@ class IndiciMCPServer:
                     )
 
                 elif name == "get_all_income_providers":
+                    response_format = arguments.pop("response_format", "html")
                     result = await indici_tools.get_all_income_providers(**arguments)
-                    formatted_result = indici_tools.format_income_providers_simple_table(result.get("data", {}))
+                    if response_format == "json":
+                        formatted_result = to_json(indici_tools.format_income_providers_data(result.get("data", {})))
+                    else:
+                        formatted_result = indici_tools.format_income_providers_simple_table(result.get("data", {}))
 
                     return CallToolResult(
                         content=[
@@ -215,16 +300,24 @@ class IndiciMCPServer:
         logger.info(f"Starting Indici MCP Server v{config.mcp_server_version}")
         logger.info(f"Connecting to IndiciAPI at: {config.indici_api_base_url}")
         
+        # Probe upstream health in the background so health_check stays cheap
+        health_probe.start()
+
         # Run the server
-        async with stdio_server() as (read_stream, write_stream):
-            await self.server.run(
-                read_stream,
-                write_stream,
-                InitializationOptions(
-                    server_name=config.mcp_server_name,
-                    server_version=config.mcp_server_version
+        try:
+            async with stdio_server() as (read_stream, write_stream):
+                await self.server.run(
+                    read_stream,
+                    write_stream,
+                    InitializationOptions(
+                        server_name=config.mcp_server_name,
+                        server_version=config.mcp_server_version
+                    )
                 )
-            )
+        finally:
+            health_probe.stop()
+            # Release pooled upstream connections owned by this loop
+            await http_client.close()
 
 def main():
     """Main entry point."""
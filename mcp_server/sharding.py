@@ -0,0 +1,152 @@
+"""Date-range sharding helpers for capitation reports."""
+
+import re
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+# sortBy values (lower case) mapped to row fields
+SORT_FIELDS = {
+    "providername": "providerName",
+    "provider": "providerName",
+    "name": "providerName",
+    "agerange": "ageRange",
+    "age": "ageRange",
+    "capitationamount": "capitationAmount",
+    "rate": "capitationAmount",
+    "quantity": "quantity",
+    "qty": "quantity",
+    "totalamount": "totalAmount",
+    "amount": "totalAmount",
+    "total": "totalAmount"
+}
+
+_SORT_SPEC = re.compile(r"^\s*(?P<minus>-)?\s*(?P<field>[\w ]+?)(?:[\s_:]+(?P<direction>asc|ascending|desc|descending))?\s*$", re.IGNORECASE)
+
+def month_shards(start: date, end: date) -> List[Tuple[date, date]]:
+    """
+    Split an inclusive date range into calendar-month pieces.
+
+    Args:
+        start: First day of the range
+        end: Last day of the range (inclusive)
+
+    Returns:
+        List of (shard_start, shard_end) tuples, both inclusive, in date order
+    """
+    shards = []
+    current = start
+    while current <= end:
+        if current.month == 12:
+            next_month = date(current.year + 1, 1, 1)
+        else:
+            next_month = date(current.year, current.month + 1, 1)
+        shard_end = min(end, next_month - timedelta(days=1))
+        shards.append((current, shard_end))
+        current = next_month
+    return shards
+
+def parse_sort(sort_by: Optional[str]) -> Tuple[str, bool]:
+    """
+    Parse a sortBy value such as "totalAmount desc", "-quantity" or "name".
+
+    Args:
+        sort_by: sortBy as sent to the API (optional)
+
+    Returns:
+        Tuple of (row field, descending); providerName ascending when the
+        value is missing or not recognised, which is the API's default order
+    """
+    match = _SORT_SPEC.match(sort_by or "")
+    field = SORT_FIELDS.get(match.group("field").replace(" ", "").lower()) if match else None
+    if field is None:
+        return "providerName", False
+    direction = (match.group("direction") or "").lower()
+    return field, bool(match.group("minus")) or direction.startswith("desc")
+
+def _age_start(age_range: Any) -> float:
+    """Lower bound of an age range like "05-14" or "75+", for ordering."""
+    found = re.match(r"\s*(\d+)", str(age_range))
+    return int(found.group(1)) if found else float("inf")
+
+def sort_capitation_rows(rows: List[Dict[str, Any]], field: str = "providerName", descending: bool = False) -> None:
+    """
+    Sort report rows in place the way the API orders a single report.
+
+    Rows are ordered by the sort field, then provider name (case-insensitive)
+    and age range, so ties come out the same however the rows were gathered.
+
+    Args:
+        rows: Report rows
+        field: Row field to sort by
+        descending: Sort the field in descending order
+    """
+    rows.sort(key=lambda row: (row.get("providerName", "").casefold(), _age_start(row.get("ageRange")), str(row.get("ageRange"))))
+    if field == "ageRange":
+        rows.sort(key=lambda row: (_age_start(row.get("ageRange")), str(row.get("ageRange"))), reverse=descending)
+    elif field == "providerName":
+        rows.sort(key=lambda row: row.get("providerName", "").casefold(), reverse=descending)
+    else:
+        rows.sort(key=lambda row: row.get(field) or 0, reverse=descending)
+
+def _register_size(row: Dict[str, Any]) -> Any:
+    """Patients on a row's register; null counts are treated as 0."""
+    return row.get("quantity", 0) or 0
+
+def merge_capitation_reports(
+    shard_results: List[Dict[str, Any]],
+    sort_field: str = "providerName",
+    descending: bool = False
+) -> Dict[str, Any]:
+    """
+    Merge per-month capitation report responses into one report.
+
+    A capitation row counts the patients on a provider's register for an age
+    range, not patient-months, so quantities are not summed across months: a
+    patient enrolled for the whole range appears in every shard but once in
+    the unsharded report. Each (providerName, ageRange) row is taken from the
+    month with the largest register (the latest such month on ties), which
+    carries that month's rate and totalAmount. This matches the unsharded
+    report whenever no patient leaves mid-range; otherwise the merged count is
+    the peak monthly register, a lower bound on distinct patients. Null
+    quantity, capitationAmount and totalAmount values are read as 0.
+
+    Shards are inclusive calendar months (see month_shards), which assumes the
+    API treats dateTo as inclusive, so adjacent shards neither overlap nor
+    leave a gap at month boundaries. The merged rows are sorted like an
+    unsharded report with the same sortBy (see parse_sort).
+
+    Args:
+        shard_results: Successful shard responses in date order
+        sort_field: Row field the report is sorted by
+        descending: Sort the field in descending order
+
+    Returns:
+        Merged response with the first shard's envelope and the full date range
+    """
+    merged_rows: Dict[Tuple[str, str], Dict[str, Any]] = {}
+
+    for result in shard_results:
+        for row in (result.get("data") or {}).get("results") or []:
+            key = (row.get("providerName", "Unknown"), row.get("ageRange", "N/A"))
+            merged = merged_rows.get(key)
+            if merged is None or _register_size(row) >= _register_size(merged):
+                merged_rows[key] = dict(row)
+
+    for row in merged_rows.values():
+        for field in ("capitationAmount", "quantity", "totalAmount"):
+            if row.get(field) is None:
+                row[field] = 0
+
+    first = shard_results[0]
+    first_data = first.get("data") or {}
+    last_data = shard_results[-1].get("data") or {}
+    results = list(merged_rows.values())
+    sort_capitation_rows(results, sort_field, descending)
+
+    data = dict(first_data)
+    if "dateTo" in last_data:
+        data["dateTo"] = last_data["dateTo"]
+    data["totalRecords"] = len(results)
+    data["results"] = results
+
+    return {**first, "data": data}
@@ -0,0 +1,101 @@
+"""Single-flight coalescing of identical concurrent upstream calls."""
+
+import asyncio
+import concurrent.futures
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+logger = logging.getLogger(__name__)
+
+class _LeaderCancelled(Exception):
+    """Raised to waiters when the caller doing the work was cancelled."""
+
+class SingleFlight:
+    """
+    Collapse identical in-flight calls into one.
+
+    The first caller for a key (the leader) runs the work; every caller that
+    arrives while it is in flight waits for and shares the leader's result or
+    exception. Waiters may live on other event loops or threads, which is the
+    normal case for the web layer. Cancelling a waiter never affects the
+    others; if the leader is cancelled, one of the waiters takes over.
+    """
+
+    def __init__(self):
+        """Initialize the coalescer."""
+        self._inflight: Dict[Hashable, concurrent.futures.Future] = {}
+        self._lock = threading.Lock()
+        self._executed = 0
+        self._coalesced = 0
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run func once per key among concurrent callers.
+
+        Args:
+            key: Identity of the call (e.g. the normalized request parameters)
+            func: Zero-argument coroutine function that performs the call
+
+        Returns:
+            The shared result of func
+        """
+        while True:
+            with self._lock:
+                future = self._inflight.get(key)
+                leader = future is None
+                if leader:
+                    future = concurrent.futures.Future()
+                    self._inflight[key] = future
+                    self._executed += 1
+                else:
+                    self._coalesced += 1
+
+            if leader:
+                return await self._lead(key, future, func)
+
+            try:
+                # shield() keeps a cancelled waiter from cancelling the shared future
+                return await asyncio.shield(asyncio.wrap_future(future))
+            except _LeaderCancelled:
+                logger.debug(f"Single-flight leader cancelled, retrying call for key: {key}")
+                continue
+
+    async def _lead(self, key: Hashable, future: concurrent.futures.Future, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Run the work as leader and publish the outcome to waiters."""
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            self._finish(key, future, exception=_LeaderCancelled())
+            raise
+        except BaseException as e:
+            self._finish(key, future, exception=e)
+            raise
+
+        self._finish(key, future, result=result)
+        return result
+
+    def _finish(self, key: Hashable, future: concurrent.futures.Future, result: Any = None, exception: BaseException = None) -> None:
+        """Remove the in-flight entry and resolve its future."""
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+        if exception is not None:
+            future.set_exception(exception)
+        else:
+            future.set_result(result)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get coalescing statistics for monitoring.
+
+        Returns:
+            Dict with in-flight, executed and coalesced call counts
+        """
+        with self._lock:
+            return {
+                "in_flight": len(self._inflight),
+                "executed": self._executed,
+                "coalesced": self._coalesced
+            }
@@ -0,0 +1,186 @@
+"""
+Structured (JSON) tool output for client-side rendering.
+
+Instead of rendered HTML, tools can return the normalized report: metadata,
+interned age ranges, provider groups with compact positional rows and the
+precomputed totals. The browser renders the tables itself and can re-sort or
+filter without another round trip.
+"""
+
+import json
+from typing import Any, Callable, Dict, List
+
+from .report_table import CapitationTable
+
+# Row layout inside each provider group: [ageRangeIndex, capitationAmount, quantity, totalAmount]
+ROW_FIELDS = ["ageRange", "capitationAmount", "quantity", "totalAmount"]
+
+def provider_suggestions(report_data: Dict[str, Any]) -> List[str]:
+    """
+    Get the roster names suggested for provider names that had no clear match.
+
+    Args:
+        report_data: The report response data
+
+    Returns:
+        Distinct candidate names, best match first
+    """
+    candidates = report_data.get("providerCandidates") or {}
+    names = [match["name"] for matches in candidates.values() for match in matches]
+    return list(dict.fromkeys(names))
+
+def capitation_report_payload(report_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build the structured form of a capitation report response.
+
+    Args:
+        report_data: The report response data
+
+    Returns:
+        Dict with kind, success, meta, ageRanges, rowFields, providers and totals
+        (or error on failure)
+    """
+    if not report_data.get("success", True):
+        return {
+            "kind": "capitation_report",
+            "success": False,
+            "error": report_data.get("error", "Unknown error")
+        }
+
+    data = report_data.get("data") or {}
+    payload = {
+        "kind": "capitation_report",
+        "success": True,
+        "meta": {
+            "totalRecords": data.get("totalRecords", 0),
+            "providerName": data.get("providerName", ""),
+            "dateFrom": data.get("dateFrom", ""),
+            "dateTo": data.get("dateTo", ""),
+            "providerSuggestions": provider_suggestions(report_data)
+        },
+        "ageRanges": [],
+        "rowFields": ROW_FIELDS,
+        "providers": [],
+        "totals": {"quantity": 0, "amount": 0, "ageRanges": []}
+    }
+
+    table = CapitationTable.for_report(report_data) if data.get("totalRecords", 0) else None
+    if table is None:
+        return payload
+
+    totals = table.aggregates
+    shares = totals.provider_share
+    payload["ageRanges"] = table.age_ranges
+    payload["providers"] = [
+        {
+            "name": provider.name,
+            "rows": [
+                [table.age_index[i], table.capitation_amount[i], table.quantity[i], table.total_amount[i]]
+                for i in provider.indices
+            ],
+            "totalQuantity": totals.provider_quantity[provider.code],
+            "totalAmount": round(totals.provider_amount[provider.code], 2),
+            "share": round(shares[provider.code], 4)
+        }
+        for provider in table.group_by_provider()
+    ]
+    payload["totals"] = {
+        "quantity": totals.grand_quantity,
+        "amount": round(totals.grand_amount, 2),
+        "ageRanges": [
+            {"quantity": quantity, "amount": round(amount, 2)}
+            for quantity, amount in zip(totals.age_quantity, totals.age_amount)
+        ]
+    }
+    return payload
+
+def batch_report_payload(
+    batch: Dict[str, Any],
+    report_payload: Callable[[Dict[str, Any]], Dict[str, Any]] = capitation_report_payload
+) -> Dict[str, Any]:
+    """
+    Build the structured form of a batch of capitation reports.
+
+    Args:
+        batch: Result of indiciAPITools.get_batch_capitation_report
+        report_payload: Builds each section's report payload
+
+    Returns:
+        Dict with kind, success, partial, meta, sections and totals (or error on failure)
+    """
+    data = batch.get("data")
+    if not data:
+        return {
+            "kind": "batch_capitation_report",
+            "success": False,
+            "error": batch.get("error", "Unknown error")
+        }
+
+    sections = []
+    for section in data["sections"]:
+        item = {
+            "label": section["label"],
+            "practiceId": section["practiceId"],
+            "providerName": section["providerName"],
+            "locationId": section["locationId"],
+            "success": section["success"]
+        }
+        if section["success"]:
+            item["totals"] = {"quantity": section["totalQuantity"], "amount": section["totalAmount"]}
+            item["report"] = report_payload(section["report"])
+        else:
+            item["error"] = section.get("error", "Unknown error")
+        sections.append(item)
+
+    return {
+        "kind": "batch_capitation_report",
+        "success": batch.get("success", False),
+        "partial": batch.get("partial", False),
+        "meta": {
+            "dateFrom": data.get("dateFrom") or "",
+            "dateTo": data.get("dateTo") or "",
+            "succeeded": data.get("succeeded", 0),
+            "failed": data.get("failed", 0)
+        },
+        "sections": sections,
+        "totals": {"quantity": data.get("totalQuantity", 0), "amount": data.get("totalAmount", 0)}
+    }
+
+def income_providers_payload(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build the structured form of an income providers response.
+
+    Args:
+        data: API response data containing income providers list
+
+    Returns:
+        Dict with kind, success, totalRecords and provider names
+    """
+    results = (data or {}).get("results") or []
+    return {
+        "kind": "income_providers",
+        "success": bool(data),
+        "totalRecords": (data or {}).get("totalRecords", 0),
+        "providers": [result.get("fullName", "N/A") for result in results]
+    }
+
+def to_json(payload: Dict[str, Any]) -> str:
+    """Serialize a payload as compact JSON."""
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
+
+def embed_payload(payload: Dict[str, Any]) -> str:
+    """
+    Wrap a payload for delivery inside a chat message.
+
+    The chat pipeline carries message text, so the JSON travels in an inert
+    script element that web/static/js/app.js picks up and renders.
+
+    Args:
+        payload: Structured tool output
+
+    Returns:
+        HTML snippet holding the JSON
+    """
+    # "</" must not appear inside a script element
+    body = to_json(payload).replace("</", "<\\/")
+    return f'<div class="structured-report" data-kind="{payload["kind"]}"><script type="application/json">{body}</script></div>'
@@ -2,11 +2,37 @@
 
 import aiohttp
 import asyncio
+import hashlib
+import html
+import itertools
 import json
 import logging
+import secrets
+import time
 from typing import Dict, Any, Optional, List, Tuple
-from datetime import datetime, date
+from datetime import date
 from .config import config
+from .http_client import http_client
+from .cache import TTLCache
+from .dates import parse_date, resolve_relative
+from .singleflight import SingleFlight
+from .roster import ProviderRoster, ProviderRosterCache
+from .health import health_probe
+from .latency import LatencyTracker, range_bucket
+from .scheduler import BACKGROUND, INTERACTIVE, SchedulerBusy, current_client, current_priority, upstream_context, upstream_scheduler
+from .resilience import RETRYABLE_STATUS_CODES, CircuitBreakerRegistry, RetryPolicy
+from .json_stream import JSONDecodeError, ResultsStreamParser, decode_json
+from .sharding import merge_capitation_reports, month_shards, parse_sort
+from .aggregate_store import aggregate_store, is_full_closed_month, month_key
+from .report_table import CapitationTable
+from .structured import batch_report_payload, capitation_report_payload, income_providers_payload, provider_suggestions
+from .rendering import (
+    render_batch_report,
+    render_income_providers_simple_table,
+    render_income_providers_table,
+    render_print_report,
+    render_report_summary
+)
 
 logger = logging.getLogger(__name__)
 
@@ -14,8 +40,12 @@ def validate_dates(date_from: Optional[str], date_to: Optional[str]) -> Tuple[bo
     """
     Validate date parameters according to business rules.
 
+    Each date is parsed once and normalized to YYYY-MM-DD. A date_from that
+    is a relative expression such as "last quarter" or "since March" (with
+    no date_to) is resolved to its range.
+
     Args:
-        date_from: Start date string (optional)
+        date_from: Start date string or relative date expression (optional)
         date_to: End date string (optional)
 
     Returns:
@@ -29,67 +59,36 @@ def validate_dates(date_from: Optional[str], date_to: Optional[str]) -> Tuple[bo
     if date_to and not date_from:
         return False, "Date from is empty, please add date from", None, None
 
-    # Parse and validate date_from if provided
-    validated_date_from = None
-    if date_from:
-        try:
-            # Try to parse the date (assuming ISO format or common formats)
-            if 'T' in date_from:
-                datetime.fromisoformat(date_from.replace('Z', '+00:00')).date()
-            else:
-                # Try common date formats
-                for fmt in ['%Y-%m-%d', '%d/%m/%Y', '%m/%d/%Y', '%Y/%m/%d']:
-                    try:
-                        datetime.strptime(date_from, fmt).date()
-                        break
-                    except ValueError:
-                        continue
-                else:
-                    return False, f"Invalid date format for date from: {date_from}", None, None
-
-            # Allow future dates - business requirement: Allow querying future dates for planning purposes
-            validated_date_from = date_from
-        except Exception as e:
-            return False, f"Invalid date from: {str(e)}", None, None
-
-    # Parse and validate date_to if provided
-    validated_date_to = None
-    if date_to:
-        try:
-            # Try to parse the date
-            if 'T' in date_to:
-                parsed_date_to = datetime.fromisoformat(date_to.replace('Z', '+00:00')).date()
-            else:
-                # Try common date formats
-                for fmt in ['%Y-%m-%d', '%d/%m/%Y', '%m/%d/%Y', '%Y/%m/%d']:
-                    try:
-                        parsed_date_to = datetime.strptime(date_to, fmt).date()
-                        break
-                    except ValueError:
-                        continue
-                else:
-                    return False, f"Invalid date format for date to: {date_to}", None, None
-
-            # If both dates provided, check that date_to > date_from
-            if validated_date_from:
-                if 'T' in validated_date_from:
-                    parsed_validated_from = datetime.fromisoformat(validated_date_from.replace('Z', '+00:00')).date()
-                else:
-                    for fmt in ['%Y-%m-%d', '%d/%m/%Y', '%m/%d/%Y', '%Y/%m/%d']:
-                        try:
-                            parsed_validated_from = datetime.strptime(validated_date_from, fmt).date()
-                            break
-                        except ValueError:
-                            continue
-
-                if parsed_date_to <= parsed_validated_from:
-                    return False, f"Date to ({date_to}) should be greater than date from ({validated_date_from})", None, None
-
-            validated_date_to = date_to
-        except Exception as e:
-            return False, f"Invalid date to: {str(e)}", None, None
-
-    return True, "", validated_date_from, validated_date_to
+    # Allow future dates - business requirement: Allow querying future dates for planning purposes
+    parsed_date_from = parse_date(date_from)
+    if parsed_date_from is None:
+        relative = resolve_relative(date_from) if not date_to else None
+        if relative is None:
+            return False, f"Invalid date format for date from: {date_from}", None, None
+        relative_from, relative_to = relative.iso()
+        return True, "", relative_from, relative_to
+
+    if not date_to:
+        return True, "", parsed_date_from.isoformat(), None
+
+    parsed_date_to = parse_date(date_to)
+    if parsed_date_to is None:
+        return False, f"Invalid date format for date to: {date_to}", None, None
+
+    if parsed_date_to <= parsed_date_from:
+        return False, f"Date to ({date_to}) should be greater than date from ({date_from})", None, None
+
+    return True, "", parsed_date_from.isoformat(), parsed_date_to.isoformat()
+
+def _as_list(value: Any) -> List[Any]:
+    """Accept a list, a comma separated string or a single value as a list of non-empty items."""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [item.strip() for item in value.split(",") if item.strip()]
+    if isinstance(value, (list, tuple, set)):
+        return [item.strip() if isinstance(item, str) else item for item in value if item not in (None, "")]
+    return [value]
 
 class indiciAPITools:
     """Tools for interacting with the indici Reports API."""
@@ -99,49 +98,435 @@ class indiciAPITools:
         self.base_url = config.indici_api_base_url
         self.endpoints = config.indici_api_endpoints
         self.timeout = config.indici_api_timeout
+        self.report_cache = TTLCache(
+            max_entries=config.report_cache_max_entries,
+            default_ttl=config.report_cache_ttl
+        )
+        # Reports awaiting an on-demand print view, keyed by an opaque handle
+        self.print_handles = TTLCache(
+            max_entries=config.report_cache_max_entries,
+            default_ttl=config.print_handle_ttl
+        )
+        self.report_flights = SingleFlight()
+        # AD login results (user profile and practices) keyed by normalized username
+        self.ad_logins = TTLCache(
+            max_entries=config.ad_login_cache_max_entries,
+            default_ttl=config.ad_login_cache_ttl
+        )
+        self.ad_login_flights = SingleFlight()
+        self.retry_policy = RetryPolicy(
+            max_attempts=config.retry_max_attempts,
+            base_delay=config.retry_base_delay,
+            max_delay=config.retry_max_delay,
+            deadline=config.retry_deadline
+        )
+        self.circuit_breakers = CircuitBreakerRegistry(
+            failure_threshold=config.circuit_failure_threshold,
+            recovery_timeout=config.circuit_recovery_timeout,
+            half_open_max_calls=config.circuit_half_open_max_calls
+        )
+        self.retry_stats = {"retries": 0, "retried_successes": 0, "fast_failures": 0}
+        self.latency = LatencyTracker(
+            window=config.adaptive_timeouts_window,
+            min_samples=config.adaptive_timeouts_min_samples,
+            min_timeout=config.adaptive_timeouts_min_timeout,
+            max_timeout=self.timeout,
+            timeout_multiplier=config.adaptive_timeouts_multiplier,
+            hedge_percentile=config.hedging_percentile,
+            hedge_min_delay=config.hedging_min_delay
+        )
+        self.hedge_stats = {"requests": 0, "hedged": 0, "hedge_wins": 0}
+        # Validators and last decoded result per GET (endpoint, params), for conditional requests
+        self.validators = TTLCache(
+            max_entries=config.conditional_requests_max_entries,
+            default_ttl=config.conditional_requests_ttl
+        )
+        # Content digest of a decoded upstream result -> upstream ETag
+        self.result_etags = TTLCache(
+            max_entries=config.conditional_requests_max_entries,
+            default_ttl=config.conditional_requests_ttl
+        )
+        self.conditional_stats = {"stored": 0, "revalidated": 0, "not_modified": 0, "unchanged": 0}
+        # (practice_id, practice_location_id) -> time.time() of the last interactive request
+        self.recent_practices: Dict[Tuple[int, int], float] = {}
+        self.roster_cache = ProviderRosterCache(
+            fresh_ttl=config.roster_cache_fresh_ttl,
+            max_age=config.roster_cache_max_age,
+            index_settings=config.provider_name_resolution_settings
+        )
+        self.name_resolution_stats = {"exact": 0, "resolved": 0, "ambiguous": 0, "suggest": 0, "unknown": 0, "skipped": 0}
         
     async def _make_request(
         self, 
         method: str, 
         endpoint: str, 
         params: Optional[Dict[str, Any]] = None,
-        json_data: Optional[Dict[str, Any]] = None
+        json_data: Optional[Dict[str, Any]] = None,
+        stream_results: bool = False
     ) -> Dict[str, Any]:
-        """Make an HTTP request to the indici API."""
+        """
+        Make an HTTP request to the indici API over the shared connection pool.
+
+        Each endpoint has a circuit breaker: while it is open the call fails
+        fast instead of waiting out the timeout. Idempotent GETs that fail with
+        a timeout, connection error or retryable status are retried with
+        jittered exponential backoff.
+
+        Attempts are admitted by the upstream scheduler, which caps concurrent
+        requests globally and per practice and queues the rest fairly.
+
+        Latencies are tracked per endpoint and date-range size. Timeouts adapt
+        to the observed p99, and with hedging enabled a GET still running past
+        the observed p95 gets a second identical request; the first answer wins.
+
+        Args:
+            method: HTTP method
+            endpoint: API endpoint path
+            params: Query parameters (optional)
+            json_data: JSON request body (optional)
+            stream_results: Decode the "results" array incrementally as the body arrives
+
+        Returns:
+            Dict containing the decoded API response or an error
+        """
         url = f"{self.base_url}{endpoint}"
-        
-        try:
-            timeout = aiohttp.ClientTimeout(total=self.timeout)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.request(
-                    method=method,
-                    url=url,
-                    params=params,
-                    json=json_data,
-                    headers={"Content-Type": "application/json"}
-                ) as response:
-                    response_text = await response.text()
-                    
-                    if response.status == 200:
-                        try:
-                            return await response.json()
-                        except json.JSONDecodeError:
-                            return {"success": True, "data": response_text}
+        breaker = self.circuit_breakers.get(endpoint)
+        max_attempts = self.retry_policy.max_attempts if method.upper() == "GET" else 1
+        started_at = time.monotonic()
+        attempt = 0
+        latency_key = (endpoint, range_bucket(params))
+        conditional_key = None
+        if method.upper() == "GET" and config.conditional_requests_enabled:
+            conditional_key = (endpoint, tuple(sorted((params or {}).items())))
+        practice = (params or {}).get("practiceId")
+        client = current_client()
+        priority = current_priority()
+
+        while True:
+            # Hold a scheduler slot for the attempt only, not across the backoff
+            try:
+                await upstream_scheduler.acquire(practice, client, priority)
+            except SchedulerBusy as e:
+                logger.warning(f"Upstream queue timeout for {endpoint}: {str(e)}")
+                return {
+                    "success": False,
+                    "error": "The indici API is busy right now. Please try again shortly.",
+                    "busy": True
+                }
+
+            try:
+                if not breaker.allow():
+                    self.retry_stats["fast_failures"] += 1
+                    retry_after = breaker.retry_after()
+                    logger.warning(f"Circuit open for {endpoint}, failing fast")
+                    return {
+                        "success": False,
+                        "error": f"The indici API is temporarily unavailable. Please try again in {max(1, round(retry_after))} seconds.",
+                        "circuit_open": True,
+                        "retry_after": retry_after
+                    }
+
+                attempt += 1
+                timeout = self.latency.timeout_for(latency_key) if config.adaptive_timeouts_enabled else self.timeout
+                hedge_after = self._hedge_delay(method, latency_key)
+                sent_at = time.monotonic()
+                try:
+                    if hedge_after is None:
+                        send = self._send_request(method, url, params, json_data, stream_results, timeout, conditional_key)
                     else:
-                        logger.error(f"API request failed: {response.status} - {response_text}")
-                        return {
-                            "success": False,
-                            "error": f"HTTP {response.status}: {response_text}",
-                            "status_code": response.status
-                        }
-                        
-        except asyncio.TimeoutError:
-            logger.error(f"Request timeout for {url}")
-            return {"success": False, "error": "Request timeout"}
-        except Exception as e:
-            logger.error(f"Request failed for {url}: {str(e)}")
-            return {"success": False, "error": str(e)}
+                        send = self._send_hedged(
+                            method, url, params, json_data, stream_results, timeout, hedge_after, conditional_key,
+                            practice, client, priority
+                        )
+                    result = await http_client.run(send)
+                    failure = f"HTTP {result['status_code']}" if result.get("status_code") in RETRYABLE_STATUS_CODES else None
+                    if failure is None:
+                        self.latency.record(latency_key, time.monotonic() - sent_at)
+                except asyncio.CancelledError:
+                    # A cancelled probe (hedge loser, client gone) must not keep its half-open slot
+                    breaker.release()
+                    raise
+                except asyncio.TimeoutError:
+                    logger.error(f"Request timeout for {url} after {timeout:.1f}s")
+                    self.latency.record(latency_key, timeout, timed_out=True)
+                    result = {"success": False, "error": "Request timeout"}
+                    failure = "timeout"
+                except aiohttp.ClientError as e:
+                    logger.error(f"Request failed for {url}: {str(e)}")
+                    result = {"success": False, "error": str(e)}
+                    failure = type(e).__name__
+                except Exception as e:
+                    logger.error(f"Request failed for {url}: {str(e)}")
+                    breaker.record_failure(str(e))
+                    return {"success": False, "error": str(e)}
+            finally:
+                upstream_scheduler.release(practice, priority)
+
+            if failure is None:
+                # Any answer other than a retryable status shows the endpoint is serving
+                breaker.record_success()
+                if attempt > 1:
+                    self.retry_stats["retried_successes"] += 1
+                return result
+
+            breaker.record_failure(failure)
+            if attempt >= max_attempts or breaker.state != breaker.CLOSED:
+                return result
+
+            delay = self.retry_policy.backoff(attempt)
+            if not self.retry_policy.should_retry(attempt, started_at, delay):
+                return result
+
+            self.retry_stats["retries"] += 1
+            logger.info(f"Retrying {endpoint} in {delay:.2f}s after {failure} (attempt {attempt + 1}/{max_attempts})")
+            await asyncio.sleep(delay)
+
+    async def _send_request(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        json_data: Optional[Dict[str, Any]] = None,
+        stream_results: bool = False,
+        timeout: Optional[float] = None,
+        conditional_key: Optional[Tuple] = None
+    ) -> Dict[str, Any]:
+        """
+        Send a request using the pooled session of the running event loop.
+
+        With a conditional_key, validators from the previous answer are sent
+        (If-None-Match / If-Modified-Since). A 304, or a 200 whose body hashes
+        to the previous one, returns a copy of the previously decoded result
+        without decoding again (see _reuse_result).
+        """
+        session = http_client.get_session()
+        previous = self.validators.get(conditional_key) if conditional_key else None
+        headers = {}
+        if previous is not None:
+            if previous["etag"]:
+                headers["If-None-Match"] = previous["etag"]
+            if previous["last_modified"]:
+                headers["If-Modified-Since"] = previous["last_modified"]
+            self.conditional_stats["revalidated"] += 1
+
+        async with session.request(
+            method=method,
+            url=url,
+            params=params,
+            json=json_data,
+            headers=headers or None,
+            timeout=aiohttp.ClientTimeout(total=timeout or self.timeout)
+        ) as response:
+            if response.status == 304 and previous is not None:
+                self.conditional_stats["not_modified"] += 1
+                return self._reuse_result(previous)
+
+            digest = hashlib.blake2b(digest_size=16)
+            if response.status == 200 and stream_results:
+                # Rows are decoded as they arrive; the body is never buffered whole
+                parser = ResultsStreamParser()
+                async for chunk in response.content.iter_chunked(64 * 1024):
+                    digest.update(chunk)
+                    parser.feed(chunk)
+                try:
+                    result = parser.close()
+                except JSONDecodeError as e:
+                    logger.error(f"Invalid JSON in streamed response from {url}: {str(e)}")
+                    return {"success": False, "error": f"Invalid JSON response: {str(e)}"}
+                return self._remember_response(conditional_key, previous, response, digest.hexdigest(), result)
+
+            # Read the body once and decode it once
+            body = await response.read()
+            
+            if response.status == 200:
+                digest.update(body)
+                if previous is not None and previous["digest"] == digest.hexdigest():
+                    # Unchanged content from an upstream without validators: skip decoding too
+                    self.conditional_stats["unchanged"] += 1
+                    return self._reuse_result(previous)
+                try:
+                    result = decode_json(body)
+                except JSONDecodeError:
+                    return {"success": True, "data": body.decode(response.get_encoding(), errors="replace")}
+                return self._remember_response(conditional_key, previous, response, digest.hexdigest(), result)
+            else:
+                response_text = body.decode(response.get_encoding(), errors="replace")
+                logger.error(f"API request failed: {response.status} - {response_text}")
+                return {
+                    "success": False,
+                    "error": f"HTTP {response.status}: {response_text}",
+                    "status_code": response.status
+                }
     
+    @staticmethod
+    def _reuse_result(previous: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Copy a stored result for another caller.
+
+        The envelope and data dicts are copied so callers can annotate their
+        result without touching the stored one; the rows are shared read-only,
+        so tables already built for them (CapitationTable.for_report) are reused.
+
+        Args:
+            previous: Stored validators entry
+
+        Returns:
+            Copy of the stored result
+        """
+        result = dict(previous["result"])
+        if isinstance(result.get("data"), dict):
+            result["data"] = dict(result["data"])
+        return result
+
+    @staticmethod
+    def _content_digest(result: Dict[str, Any]) -> str:
+        """Hash a result's content; equal results hash the same whatever their key order."""
+        encoded = json.dumps(result, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+        return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+    def _remember_response(
+        self,
+        conditional_key: Optional[Tuple],
+        previous: Optional[Dict[str, Any]],
+        response: aiohttp.ClientResponse,
+        digest: str,
+        result: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Store validators for a decoded 200 answer.
+
+        Returns:
+            A copy of the previous result if the content hash is unchanged, else result
+        """
+        if previous is not None and previous["digest"] == digest:
+            self.conditional_stats["unchanged"] += 1
+            return self._reuse_result(previous)
+
+        etag = response.headers.get("ETag")
+        if etag:
+            # Same content, same upstream tag; weak tags keep their W/ prefix
+            self.result_etags.set(self._content_digest(result), etag)
+        if conditional_key and result.get("success", True):
+            self.validators.set(conditional_key, {
+                "etag": etag,
+                "last_modified": response.headers.get("Last-Modified"),
+                "digest": digest,
+                "result": result
+            })
+            self.conditional_stats["stored"] += 1
+        return result
+
+    def result_etag(self, result: Dict[str, Any]) -> Tuple[str, bool]:
+        """
+        Get the validator of a tool result, for HTTP ETags in the web layer.
+
+        Results are identified by a hash of their content. Content that came
+        unchanged from upstream reuses the upstream ETag, weak if upstream
+        marked it weak; other results (e.g. merged month shards) use the hash
+        itself as a strong validator.
+
+        Args:
+            result: Result dict returned by a tool
+
+        Returns:
+            Tuple of (opaque validator without quotes, whether it is weak)
+        """
+        content_digest = self._content_digest(result)
+        etag = self.result_etags.get(content_digest)
+        if not etag:
+            return content_digest, False
+
+        weak = etag.startswith("W/")
+        return (etag[2:] if weak else etag).strip('"'), weak
+
+    def _note_practice(self, practice_id: int, practice_location_id: Optional[int]) -> None:
+        """Remember a practice used interactively, for the cache warmer."""
+        if current_priority() == INTERACTIVE:
+            self.recent_practices[(practice_id, practice_location_id or 1)] = time.time()
+
+    def get_recent_practices(self, max_age: float) -> List[Tuple[int, int]]:
+        """
+        Get practices used interactively within max_age seconds, most recent first.
+
+        Args:
+            max_age: Window in seconds
+
+        Returns:
+            List of (practice_id, practice_location_id)
+        """
+        cutoff = time.time() - max_age
+        recent = sorted(self.recent_practices.items(), key=lambda item: item[1], reverse=True)
+        return [key for key, seen_at in recent if seen_at >= cutoff]
+
+    def _hedge_delay(self, method: str, latency_key: Tuple[str, str]) -> Optional[float]:
+        """
+        Decide whether a request may be hedged.
+
+        Args:
+            method: HTTP method
+            latency_key: (endpoint, range bucket)
+
+        Returns:
+            Seconds to wait before the hedged request, or None to send a single request
+        """
+        if not config.hedging_enabled or method.upper() != "GET":
+            return None
+
+        self.hedge_stats["requests"] += 1
+        # Cap the extra load: only a bounded share of requests may be hedged
+        if self.hedge_stats["hedged"] >= self.hedge_stats["requests"] * config.hedging_max_ratio:
+            return None
+        return self.latency.hedge_delay(latency_key)
+
+    async def _send_hedged(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        json_data: Optional[Dict[str, Any]],
+        stream_results: bool,
+        timeout: float,
+        hedge_after: float,
+        conditional_key: Optional[Tuple] = None,
+        practice: Any = None,
+        client: Any = None,
+        priority: int = INTERACTIVE
+    ) -> Dict[str, Any]:
+        """
+        Send a request and, if it is still running after hedge_after seconds, an identical second one.
+
+        The caller holds a scheduler slot for the first request; the second
+        takes its own slot for the same practice, client and priority, so
+        hedging never pushes concurrency past the scheduler's limits.
+        """
+        first = asyncio.ensure_future(
+            self._send_request(method, url, params, json_data, stream_results, timeout, conditional_key)
+        )
+        done, _ = await asyncio.wait({first}, timeout=hedge_after)
+        if done:
+            return first.result()
+
+        self.hedge_stats["hedged"] += 1
+        second = asyncio.ensure_future(upstream_scheduler.run(
+            self._send_request(method, url, params, json_data, stream_results, timeout, conditional_key),
+            practice, client, priority
+        ))
+        pending = {first, second}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                winner = next((task for task in done if task.exception() is None), None)
+                if winner is not None:
+                    if winner is second:
+                        self.hedge_stats["hedge_wins"] += 1
+                    return winner.result()
+                # A failed copy only decides the outcome when the other one failed too
+                if not pending:
+                    return done.pop().result()
+        finally:
+            for task in pending:
+                task.cancel()
+
     async def get_provider_capitation_report(
         self,
         practice_id: int = 1,
@@ -150,7 +535,9 @@ class indiciAPITools:
         provider_name: Optional[str] = None,
         location_id: Optional[str] = None,
         practice_location_id: Optional[int] = None,
-        sort_by: Optional[str] = None
+        sort_by: Optional[str] = None,
+        shard_by_month: Optional[bool] = None,
+        cache_live_ttl: Optional[float] = None
     ) -> Dict[str, Any]:
         """
         Get Provider Capitation Report using query parameters.
@@ -163,6 +550,10 @@ class indiciAPITools:
             location_id: Location ID(s) - comma separated (optional)
             practice_location_id: Practice Location ID (optional)
             sort_by: Sort by field (optional)
+            shard_by_month: Fetch long ranges as concurrent month shards
+                (optional, defaults to the report_sharding.enabled setting)
+            cache_live_ttl: Cache TTL for a range that includes today, instead of
+                report_cache.live_ttl (optional, used by the cache warmer)
 
         Returns:
             Dict containing the API response
@@ -177,7 +568,20 @@ class indiciAPITools:
                 "data": None
             }
 
+        # Misspelled names would only come back as "No record found"; close
+        # roster names are kept as a hint for the user when there is no clear match.
+        # The report never waits for a roster fetch: a missing roster is loaded in
+        # the background and used from the next request on.
+        name_candidates = {}
+        if provider_name and config.provider_name_resolution_enabled:
+            resolution = await self.resolve_provider_name(
+                provider_name, practice_id, practice_location_id, wait_for_roster=False
+            )
+            provider_name = resolution["providerName"]
+            name_candidates = resolution["candidates"]
+
         params = {"practiceId": practice_id}
+        self._note_practice(practice_id, practice_location_id)
 
         # Only add dates to params if they are provided and valid
         if validated_date_from:
@@ -192,15 +596,356 @@ class indiciAPITools:
             params["practiceLocationId"] = practice_location_id
         if sort_by:
             params["sortBy"] = sort_by
+
+        if shard_by_month is None:
+            shard_by_month = config.report_sharding_enabled
+
+        # The aggregate store is read per month shard, so it only applies when sharding is on
+        shards = self._report_shards(validated_date_from, validated_date_to) if shard_by_month else []
+        if len(shards) >= config.report_sharding_min_months:
+            result = await self._get_sharded_report(params, shards, validated_date_to, cache_live_ttl)
+        else:
+            result = await self._get_report(params, validated_date_to, cache_live_ttl)
+
+        if name_candidates:
+            # Cached responses are shared, so the hint goes on a copy
+            result = {**result, "providerCandidates": name_candidates}
+        return result
+
+    async def _get_report(
+        self,
+        params: Dict[str, Any],
+        date_to: Optional[str],
+        live_ttl: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Fetch one report through the response cache and single-flight coalescing.
+
+        Args:
+            params: Query parameters as sent to the API
+            date_to: Validated end date, used to pick the cache TTL
+            live_ttl: Cache TTL if the range includes today (optional)
+
+        Returns:
+            Dict containing the API response
+        """
+        cache_key = self._report_cache_key(params)
+        cached = self.report_cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"Provider Capitation Report served from cache for params: {params}")
+            return cached
             
-        logger.info(f"Getting Provider Capitation Report with params: {params}")
-        
-        return await self._make_request(
-            method="GET",
-            endpoint=self.endpoints["provider_capitation_report"],
-            params=params
+        async def fetch() -> Dict[str, Any]:
+            logger.info(f"Getting Provider Capitation Report with params: {params}")
+            
+            result = await self._make_request(
+                method="GET",
+                endpoint=self.endpoints["provider_capitation_report"],
+                params=params,
+                stream_results=config.indici_api_stream_results
+            )
+
+            # Only successful responses are cached; errors are retried on the next call
+            if result.get("success", True):
+                self.report_cache.set(cache_key, result, ttl=self._report_cache_ttl(date_to, live_ttl))
+
+            return result
+
+        # Identical concurrent requests share a single upstream call
+        return await self.report_flights.do(cache_key, fetch)
+
+    def _report_shards(self, date_from: Optional[str], date_to: Optional[str]) -> List[Tuple[date, date]]:
+        """Split a closed report range into month shards (empty if the range is open-ended)."""
+        start = parse_date(date_from)
+        end = parse_date(date_to)
+        if start is None or end is None or end < start:
+            return []
+        return month_shards(start, end)
+
+    async def _get_sharded_report(
+        self,
+        params: Dict[str, Any],
+        shards: List[Tuple[date, date]],
+        date_to: Optional[str],
+        live_ttl: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Fetch a long report as concurrent month shards and merge them.
+
+        Each shard goes through the regular cache, so closed months are reused
+        across requests and a yearly report mostly costs the current month.
+        Full closed months are read from (and saved to) the monthly aggregate
+        store when it is enabled. Report ranges are treated as inclusive of date_to.
+
+        Args:
+            params: Query parameters for the full range
+            shards: Inclusive (start, end) month ranges
+            date_to: Validated end date of the full range
+            live_ttl: Cache TTL for ranges that include today (optional)
+
+        Returns:
+            Merged API response, or the first shard error
+        """
+        cache_key = self._report_cache_key(params)
+        cached = self.report_cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"Sharded Provider Capitation Report served from cache for params: {params}")
+            return cached
+
+        logger.info(f"Fetching Provider Capitation Report as {len(shards)} month shards")
+        semaphore = asyncio.Semaphore(config.report_sharding_max_concurrency)
+
+        async def fetch_shard(shard_from: date, shard_to: date) -> Dict[str, Any]:
+            if aggregate_store.enabled and is_full_closed_month(shard_from, shard_to):
+                try:
+                    stored = aggregate_store.get_month(params, month_key(shard_from))
+                except Exception as e:
+                    logger.error(f"Error reading monthly aggregates: {str(e)}")
+                    stored = None
+                if stored is not None:
+                    return stored
+            async with semaphore:
+                return await self.fetch_month_aggregates(params, shard_from, shard_to, live_ttl=live_ttl)
+
+        results = await asyncio.gather(*(fetch_shard(start, end) for start, end in shards))
+
+        # A partial report would be silently wrong, so any failed shard fails the request
+        for result in results:
+            if not result.get("success", True):
+                return result
+
+        merged = merge_capitation_reports(results, *parse_sort(params.get("sortBy")))
+        self.report_cache.set(cache_key, merged, ttl=self._report_cache_ttl(date_to, live_ttl))
+        return merged
+
+    async def fetch_month_aggregates(
+        self,
+        params: Dict[str, Any],
+        month_from: date,
+        month_to: date,
+        refresh: bool = False,
+        live_ttl: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Fetch one month shard and save it to the aggregate store if the month is closed.
+
+        Args:
+            params: Query parameters without dates
+            month_from: First day of the shard
+            month_to: Last day of the shard (inclusive)
+            refresh: Bypass the response cache, e.g. when rebuilding a month
+            live_ttl: Cache TTL if the month includes today (optional)
+
+        Returns:
+            Dict containing the API response for the shard
+        """
+        shard_params = {
+            **params,
+            "dateFrom": month_from.strftime("%Y-%m-%d"),
+            "dateTo": month_to.strftime("%Y-%m-%d")
+        }
+        if refresh:
+            self.report_cache.invalidate(self._report_cache_key(shard_params))
+
+        result = await self._get_report(shard_params, shard_params["dateTo"], live_ttl)
+        if result.get("success", True) and aggregate_store.enabled and is_full_closed_month(month_from, month_to):
+            try:
+                aggregate_store.put_month(params, month_key(month_from), result)
+            except Exception as e:
+                # The store is an optimization; a write failure must not fail the report
+                logger.error(f"Error storing monthly aggregates: {str(e)}")
+        return result
+
+    def invalidate_aggregate_month(self, practice_id: int, month: str) -> Dict[str, Any]:
+        """
+        Drop a stored month after upstream corrections.
+
+        Cached reports may include the old totals, so the report cache is
+        cleared as well.
+
+        Args:
+            practice_id: Practice ID
+            month: Month key (YYYY-MM)
+
+        Returns:
+            Dict with the number of stored months removed
+        """
+        removed = aggregate_store.invalidate_month(practice_id, month)
+        self.report_cache.clear()
+        return {"success": True, "removed": removed}
+
+    def _report_cache_key(self, params: Dict[str, Any]) -> Tuple:
+        """
+        Build a cache key from the normalized report query parameters.
+
+        Args:
+            params: Query parameters as sent to the API
+
+        Returns:
+            Hashable tuple identifying the report
+        """
+        def normalize(value: Any) -> Any:
+            if isinstance(value, str):
+                # Collapse whitespace around comma separated lists ("a, b" == "a,b")
+                return ",".join(part.strip() for part in value.split(","))
+            return value
+
+        return (
+            "provider_capitation_report",
+            normalize(params.get("practiceId")),
+            params.get("dateFrom"),
+            params.get("dateTo"),
+            normalize(params.get("providerName")),
+            normalize(params.get("locationId")),
+            params.get("practiceLocationId"),
+            normalize(params.get("sortBy"))
         )
 
+    def _report_cache_ttl(self, date_to: Optional[str], live_ttl: Optional[float] = None) -> float:
+        """
+        Choose the cache TTL for a report.
+
+        Ranges that are open-ended or include today can still change, so they
+        get the shorter live TTL (or live_ttl when given); closed historical
+        ranges get the full TTL.
+        """
+        parsed_date_to = parse_date(date_to)
+        if parsed_date_to is None or parsed_date_to >= date.today():
+            return config.report_cache_live_ttl if live_ttl is None else live_ttl
+        return config.report_cache_ttl
+
+    async def get_batch_capitation_report(
+        self,
+        practice_ids: Optional[Any] = None,
+        provider_names: Optional[Any] = None,
+        location_ids: Optional[Any] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        practice_location_id: Optional[int] = None,
+        sort_by: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Get the same capitation report for several practices, providers or locations.
+
+        One report is fetched per combination of practice, provider and
+        location, concurrently up to batch_reports.max_concurrency. Each goes
+        through get_provider_capitation_report, so caching, coalescing,
+        sharding and the upstream scheduler's per-practice limits all apply.
+        A failed report is recorded on its section and does not fail the batch.
+
+        Args:
+            practice_ids: Practice IDs, as a list or comma separated (defaults to [1])
+            provider_names: Provider names, one section each (optional)
+            location_ids: Location IDs, one section each (optional)
+            date_from: Start date or relative date expression (optional)
+            date_to: End date (optional)
+            practice_location_id: Practice Location ID (optional)
+            sort_by: Sort by field (optional)
+
+        Returns:
+            Dict with success, partial and data holding the date range, per-entity
+            sections (each with its report or error) and grand totals
+        """
+        is_valid, error_message, validated_date_from, validated_date_to = validate_dates(date_from, date_to)
+        if not is_valid:
+            return {"success": False, "error": error_message, "data": None}
+
+        practices = []
+        invalid = []
+        for practice_id in _as_list(practice_ids):
+            try:
+                practices.append(int(str(practice_id).strip()))
+            except ValueError:
+                invalid.append(str(practice_id))
+        if invalid:
+            return {
+                "success": False,
+                "error": f"Invalid practice ID(s): {', '.join(invalid)}. Practice IDs must be numbers.",
+                "data": None
+            }
+        practices = practices or [1]
+        entities = list(itertools.product(practices, _as_list(provider_names) or [None], _as_list(location_ids) or [None]))
+        if len(entities) > config.batch_reports_max_entities:
+            return {
+                "success": False,
+                "error": (
+                    f"The batch covers {len(entities)} reports; the limit is {config.batch_reports_max_entities}. "
+                    "Please narrow the practices, providers or locations."
+                ),
+                "data": None
+            }
+
+        logger.info(f"Fetching batch of {len(entities)} Provider Capitation Reports")
+        semaphore = asyncio.Semaphore(config.batch_reports_max_concurrency)
+
+        async def fetch(practice_id: int, provider_name: Optional[str], location_id: Optional[str]) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    return await self.get_provider_capitation_report(
+                        practice_id=practice_id,
+                        date_from=validated_date_from,
+                        date_to=validated_date_to,
+                        provider_name=provider_name,
+                        location_id=location_id,
+                        practice_location_id=practice_location_id,
+                        sort_by=sort_by
+                    )
+                except Exception as e:
+                    logger.error(f"Batch report failed for practice {practice_id}: {str(e)}")
+                    return {"success": False, "error": str(e), "data": None}
+
+        results = await asyncio.gather(*(fetch(*entity) for entity in entities))
+
+        sections = []
+        total_quantity = 0
+        total_amount = 0.0
+        for (practice_id, provider_name, location_id), result in zip(entities, results):
+            label = " · ".join(
+                part for part in (
+                    f"Practice {practice_id}",
+                    provider_name,
+                    f"Location {location_id}" if location_id else None
+                ) if part
+            )
+            section = {
+                "label": label,
+                "practiceId": practice_id,
+                "providerName": provider_name,
+                "locationId": location_id,
+                "success": result.get("success", True),
+                "report": result,
+                "totalQuantity": 0,
+                "totalAmount": 0.0
+            }
+            if not section["success"]:
+                section["error"] = result.get("error", "Unknown error")
+            else:
+                table = CapitationTable.for_report(result)
+                if table is not None:
+                    section["totalQuantity"] = table.aggregates.grand_quantity
+                    section["totalAmount"] = round(table.aggregates.grand_amount, 2)
+                    total_quantity += section["totalQuantity"]
+                    total_amount += table.aggregates.grand_amount
+            sections.append(section)
+
+        succeeded = sum(1 for section in sections if section["success"])
+        batch = {
+            "success": succeeded > 0,
+            "partial": 0 < succeeded < len(sections),
+            "data": {
+                "dateFrom": validated_date_from,
+                "dateTo": validated_date_to,
+                "sections": sections,
+                "succeeded": succeeded,
+                "failed": len(sections) - succeeded,
+                "totalQuantity": total_quantity,
+                "totalAmount": round(total_amount, 2)
+            }
+        }
+        if not succeeded:
+            batch["error"] = "Every report in the batch failed"
+        return batch
+
     async def get_all_income_providers(
         self,
         practice_id: int = 1,
@@ -220,38 +965,172 @@ class indiciAPITools:
             "practiceId": practice_id,
             "practiceLocationId": practice_location_id
         }
+        self._note_practice(practice_id, practice_location_id)
 
-        logger.info(f"Getting Income Providers with params: {params}")
+        async def fetch() -> Dict[str, Any]:
+            logger.info(f"Getting Income Providers with params: {params}")
 
-        return await self._make_request(
-            method="GET",
-            endpoint=self.endpoints["income_providers_report"],
-            params=params
-        )
+            return await self._make_request(
+                method="GET",
+                endpoint=self.endpoints["income_providers_report"],
+                params=params
+            )
+
+        # Served from the roster cache; stale rosters are refreshed in the background
+        return await self.roster_cache.get(practice_id, practice_location_id, fetch)
+
+    async def get_provider_roster(
+        self,
+        practice_id: int = 1,
+        practice_location_id: int = 1
+    ) -> Optional[ProviderRoster]:
+        """
+        Get the typed income providers roster for reuse by other components.
+
+        Args:
+            practice_id: Practice ID (defaults to 1)
+            practice_location_id: Practice Location ID (defaults to 1)
+
+        Returns:
+            ProviderRoster, or None if the roster could not be fetched
+        """
+        roster = self.roster_cache.peek(practice_id, practice_location_id)
+        if roster is not None:
+            return roster
+
+        await self.get_all_income_providers(practice_id, practice_location_id)
+        return self.roster_cache.peek(practice_id, practice_location_id)
+
+    def _load_roster_in_background(self, practice_id: int, practice_location_id: int) -> None:
+        """
+        Start loading a roster without waiting for it.
+
+        Args:
+            practice_id: Practice ID
+            practice_location_id: Practice Location ID
+        """
+        async def load() -> None:
+            try:
+                with upstream_context(priority=BACKGROUND):
+                    await self.get_all_income_providers(practice_id, practice_location_id)
+            except Exception as e:
+                logger.warning(f"Background roster load failed for ({practice_id}, {practice_location_id}): {str(e)}")
+
+        http_client.spawn(load())
+
+    async def resolve_provider_name(
+        self,
+        provider_name: str,
+        practice_id: int = 1,
+        practice_location_id: Optional[int] = None,
+        wait_for_roster: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Match free-text provider name(s) against the roster of the requested location.
+
+        Each comma separated name is resolved on its own. Only an exact match
+        or a single high-confidence fuzzy match replaces a name (with the
+        roster spelling); ambiguous and weak matches keep the name as given and
+        return the ranked candidates as a hint. Without a practice location
+        the report covers every location, so no single roster applies and the
+        names are passed through unchanged, as they are when the roster cannot
+        be loaded or is not cached and wait_for_roster is False.
+
+        Args:
+            provider_name: Provider Name(s) - comma separated
+            practice_id: Practice ID (defaults to 1)
+            practice_location_id: Practice Location ID of the report (optional)
+            wait_for_roster: Fetch a roster that is not cached before resolving;
+                if False, only a cached roster is used and a missing one is
+                loaded in the background (defaults to True)
+
+        Returns:
+            Dict with providerName (comma separated), matches, and candidates
+            (query -> ranked matches) for names that were not replaced
+        """
+        queries = [name.strip() for name in provider_name.split(",") if name.strip()]
+        roster = None
+        if queries and practice_location_id is not None:
+            if wait_for_roster:
+                roster = await self.get_provider_roster(practice_id, practice_location_id)
+            else:
+                roster = self.roster_cache.peek(practice_id, practice_location_id)
+                if roster is None:
+                    self._load_roster_in_background(practice_id, practice_location_id)
+        if roster is None:
+            self.name_resolution_stats["skipped"] += 1
+            return {"providerName": provider_name, "matches": [], "candidates": {}}
+
+        resolutions = [roster.name_index.resolve(query) for query in queries]
+        for resolution in resolutions:
+            self.name_resolution_stats[resolution.status] += 1
+
+        matches = [
+            {"query": resolution.query, "name": resolution.name, "status": resolution.status}
+            for resolution in resolutions
+        ]
+        candidates = {
+            resolution.query: [match._asdict() for match in resolution.candidates]
+            for resolution in resolutions
+            if resolution.status in ("ambiguous", "suggest")
+        }
+        if any(resolution.status == "resolved" for resolution in resolutions):
+            logger.info(f"Resolved provider names: {matches}")
+        return {
+            "providerName": ",".join(resolution.name for resolution in resolutions),
+            "matches": matches,
+            "candidates": candidates
+        }
+
+    def invalidate_provider_roster(
+        self,
+        practice_id: Optional[int] = None,
+        practice_location_id: Optional[int] = None
+    ) -> int:
+        """
+        Drop cached income provider rosters so the next request re-fetches them.
+
+        Args:
+            practice_id: Practice ID to invalidate (all practices if None)
+            practice_location_id: Practice Location ID to invalidate (all locations if None)
+
+        Returns:
+            Number of rosters removed
+        """
+        return self.roster_cache.invalidate(practice_id, practice_location_id)
 
     async def health_check(self) -> Dict[str, Any]:
         """
-        Check the health of the Provider Capitation Report service by calling the main endpoint.
+        Check the health of the Provider Capitation Report service.
+
+        Reads the state kept by the background health probe; the API is only
+        probed inline (with a cheap HEAD request) when that state is missing
+        or older than two probe intervals.
 
         Returns:
             Dict containing the health check response
         """
-        logger.info("Performing health check by testing main endpoint")
-
-        # Test the main endpoint with minimal parameters to check if service is running
         try:
-            result = await self.get_provider_capitation_report()
-            if result.get("success", True):
+            state_age = health_probe.state_age
+            if state_age is None or state_age > 2 * health_probe.interval:
+                logger.info("Performing inline health probe")
+                state = await health_probe.probe_once()
+            else:
+                state = health_probe.get_state()
+
+            if state["healthy"]:
                 return {
                     "success": True,
                     "message": "Provider Capitation Report service is healthy",
-                    "data": "Service responded successfully"
+                    "data": f"Service responded in {state['latency_ms']} ms (avg {state['latency_ewma_ms']} ms), last checked {state['last_checked']}",
+                    "details": state
                 }
             else:
                 return {
                     "success": False,
                     "message": "Provider Capitation Report service health check failed",
-                    "error": result.get("error", "Unknown error")
+                    "error": state.get("last_error") or "Unknown error",
+                    "details": state
                 }
         except Exception as e:
             return {
@@ -260,12 +1139,13 @@ class indiciAPITools:
                 "error": str(e)
             }
     
-    def format_report_summary(self, report_data: Dict[str, Any]) -> str:
+    def format_report_summary(self, report_data: Dict[str, Any], compact: bool = False) -> str:
         """
         Format report data into responsive HTML tables with Bootstrap styling.
 
         Args:
             report_data: The report response data
+            compact: Use shared CSS classes and minified markup instead of inline styles
 
         Returns:
             HTML formatted table string grouped by provider
@@ -289,109 +1169,56 @@ class indiciAPITools:
 
         # Handle zero records case - show simple "No record found" message
         if not results or total_records == 0:
-            return self._format_no_records_table(provider_name_filter)
-
-        # Group results by provider
-        providers = {}
-        for result in results:
-            provider_name = result.get("providerName", "Unknown")
-            if provider_name not in providers:
-                providers[provider_name] = []
-            providers[provider_name].append(result)
+            return self._format_no_records_table(provider_name_filter, provider_suggestions(report_data))
 
+        # Columnar rows grouped by provider, shared with the print view
+        table = CapitationTable.for_report(report_data)
+        return table.memoize(
+            ("summary", total_records, compact),
+            lambda: render_report_summary(table, total_records, compact=compact)
+        )
 
+    def format_report_data(self, report_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Format report data as structured JSON-ready data for client-side rendering.
 
-        # Build the HTML output with full-width styling
-        html_output = f"""
-<div class="w-100" style="width: 100% !important; max-width: 100% !important;">
-    <div class="card border-0 w-100">
-        <div class="card-header bg-primary text-white">
-            <h4 class="mb-0">📊 Provider Capitation Report</h4>
-        </div>
-        <div class="card-body p-2 w-100">
-            <div class="mb-2">
-                <strong>Total Records:</strong> {total_records}
-            </div>
-"""
-
-        # Format each provider section
-        for provider_name, provider_results in providers.items():
-            # Provider total calculations
-            provider_total_quantity = sum(result.get("quantity", 0) for result in provider_results)
-            provider_total_amount = sum(result.get("totalAmount", 0) for result in provider_results)
-
-            # Add margin before provider name (except for first provider)
-            margin_class = "mt-3" if list(providers.keys()).index(provider_name) > 0 else ""
-
-            html_output += f"""
-            <div class="mb-3 w-100 {margin_class}">
-                <h5 style="text-align: center; color: #0066cc; font-weight: bold; margin: 20px 0 10px 0; font-size: 16px;">{provider_name}</h5>
-                <table class="table table-bordered mb-1 w-100" style="width: 100% !important; table-layout: fixed; border-collapse: collapse;">
-                    <thead style="background-color: #e9ecef;">
-                        <tr>
-                            <th scope="col" style="width: 25%; background-color: #e9ecef; border: 1px solid #dee2e6; padding: 8px; font-weight: bold;">AgeRange</th>
-                            <th scope="col" class="text-end" style="width: 25%; background-color: #e9ecef; border: 1px solid #dee2e6; padding: 8px; font-weight: bold;">CapitationAmount</th>
-                            <th scope="col" class="text-end" style="width: 25%; background-color: #e9ecef; border: 1px solid #dee2e6; padding: 8px; font-weight: bold;">Quantity</th>
-                            <th scope="col" class="text-end" style="width: 25%; background-color: #e9ecef; border: 1px solid #dee2e6; padding: 8px; font-weight: bold;">TotalAmount</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-"""
-
-            # Add rows for this provider
-            for result in provider_results:
-                age_range = result.get("ageRange", "N/A")
-                capitation_amount = result.get("capitationAmount", 0)
-                quantity = result.get("quantity", 0)
-                total_amount = result.get("totalAmount", 0)
-
-                html_output += f"""
-                        <tr style="background-color: #ffffff;">
-                            <td style="border: 1px solid #dee2e6; padding: 8px; background-color: #f8f9fa;">{age_range}</td>
-                            <td class="text-end" style="border: 1px solid #dee2e6; padding: 8px;">{capitation_amount:.2f}</td>
-                            <td class="text-end" style="border: 1px solid #dee2e6; padding: 8px;">{quantity}</td>
-                            <td class="text-end" style="border: 1px solid #dee2e6; padding: 8px;">{total_amount:.2f}</td>
-                        </tr>
-"""
-
-            # Add total row for this provider
-            html_output += f"""
-                        <tr style="background-color: #f8f9fa; font-weight: bold;">
-                            <td style="border: 1px solid #dee2e6; padding: 8px; background-color: #f8f9fa; font-weight: bold;">Total</td>
-                            <td class="text-end" style="border: 1px solid #dee2e6; padding: 8px;"></td>
-                            <td class="text-end" style="border: 1px solid #dee2e6; padding: 8px; font-weight: bold;">{provider_total_quantity}</td>
-                            <td class="text-end" style="border: 1px solid #dee2e6; padding: 8px; font-weight: bold;">{provider_total_amount:.2f}</td>
-                        </tr>
-                    </tbody>
-                </table>
-            </div>
-"""
-
-        # Close the HTML structure
-        html_output += f"""
-        </div>
-    </div>
-</div>
-"""
-
-        return html_output
+        Args:
+            report_data: The report response data
 
-    def _format_no_records_table(self, provider_name_filter: str = "") -> str:
+        Returns:
+            Dict with report metadata, age ranges, provider groups and totals
+        """
+        table = CapitationTable.for_report(report_data) if report_data.get("success", True) else None
+        if table is None:
+            return capitation_report_payload(report_data)
+        data = report_data.get("data") or {}
+        key = ("payload", data.get("totalRecords"), data.get("providerName"), data.get("dateFrom"), data.get("dateTo"))
+        payload = table.memoize(key, lambda: capitation_report_payload(report_data))
+        # Name suggestions belong to the request, not the cached rows, so they
+        # are applied to a copy after the lookup
+        meta = {**payload["meta"], "providerSuggestions": provider_suggestions(report_data)}
+        return {**payload, "meta": meta}
+
+    def _format_no_records_table(self, provider_name_filter: str = "", suggestions: Optional[List[str]] = None) -> str:
         """
         Format a simple "No record found" message when no records are found.
 
         Args:
             provider_name_filter: Provider name that was searched for
+            suggestions: Roster names close to the provider name (optional)
 
         Returns:
             HTML formatted simple "No record found" message
         """
-        provider_info = f" for this provider ({provider_name_filter})" if provider_name_filter else ""
+        provider_info = f" for this provider ({html.escape(provider_name_filter)})" if provider_name_filter else ""
+        suggestion_info = (
+            f"<br><small>Did you mean: {html.escape(', '.join(suggestions))}?</small>" if suggestions else ""
+        )
 
         html_output = f"""
 <div class="w-100" style="width: 100% !important; max-width: 100% !important;">
     <div class="alert alert-danger text-center" style="background-color: #f8d7da; border-color: #f5c6cb; color: #721c24; padding: 15px; border-radius: 8px; margin: 0;">
-        <strong>No record found{provider_info}</strong>
+        <strong>No record found{provider_info}</strong>{suggestion_info}
     </div>
 </div>
 """
@@ -432,14 +1259,6 @@ class indiciAPITools:
 </div>
 """
 
-        # Group results by provider
-        providers = {}
-        for result in results:
-            provider_name = result.get("providerName", "Unknown")
-            if provider_name not in providers:
-                providers[provider_name] = []
-            providers[provider_name].append(result)
-
         # Format period dates
         period_text = ""
         if date_from and date_to:
@@ -450,113 +1269,85 @@ class indiciAPITools:
             except:
                 period_text = f"Period Date: {date_from} to {date_to}"
 
-        # Build print-ready HTML (clean grouped format like your desired layout)
-        print_html = f"""
-<div class="print-container">
-    <div class="print-header">
-        <h2>Provider Capitation Report</h2>
-        {f'<p>{period_text}</p>' if period_text else ''}
-    </div>
-"""
+        # Columnar rows grouped by provider, shared with the summary view
+        table = CapitationTable.for_report(report_data)
+        return table.memoize(("print", period_text), lambda: render_print_report(table, period_text))
 
-        # Add each provider section in the grouped format you want
-        for provider_name, provider_results in providers.items():
-            provider_total_quantity = sum(result.get("quantity", 0) for result in provider_results)
-            provider_total_amount = sum(result.get("totalAmount", 0) for result in provider_results)
-
-            # Extract provider type from name (e.g., "Doctor FINANCE - CN")
-            provider_display = provider_name
-            if " - " in provider_name:
-                provider_display = f"{provider_name}"
-
-            print_html += f"""
-    <div class="provider-section">
-        <div class="provider-header">
-            <h3>{provider_display}</h3>
-        </div>
-
-        <div class="provider-data">
-            <div class="data-row header-row">
-                <span class="age-range">Age Range</span>
-                <span class="capitation-amount">Capitation Amount</span>
-                <span class="quantity">Quantity</span>
-                <span class="total-amount">Total Amount</span>
-            </div>
-"""
+    def register_print_report(self, report_data: Dict[str, Any]) -> str:
+        """
+        Keep report data for rendering its print layout on demand.
 
-            # Add provider results in clean row format
-            for result in provider_results:
-                age_range = result.get("ageRange", "N/A")
-                capitation_amount = result.get("capitationAmount", 0)
-                quantity = result.get("quantity", 0)
-                total_amount = result.get("totalAmount", 0)
-
-                print_html += f"""
-            <div class="data-row">
-                <span class="age-range">{age_range}</span>
-                <span class="capitation-amount">{capitation_amount:.2f}</span>
-                <span class="quantity">{quantity}</span>
-                <span class="total-amount">{total_amount:.2f}</span>
-            </div>
-"""
+        Args:
+            report_data: The report response data
 
-            # Add provider total row
-            print_html += f"""
-            <div class="data-row total-row">
-                <span class="age-range"><strong>Total</strong></span>
-                <span class="capitation-amount"></span>
-                <span class="quantity"><strong>{provider_total_quantity}</strong></span>
-                <span class="total-amount"><strong>{provider_total_amount:.2f}</strong></span>
-            </div>
-        </div>
-    </div>
-"""
+        Returns:
+            Opaque handle for render_print_view
+        """
+        handle = secrets.token_urlsafe(16)
+        self.print_handles.set(handle, report_data)
+        return handle
 
-        print_html += """
-</div>
-"""
+    def get_print_report(self, handle: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the report data registered under a print handle.
 
-        return print_html
+        Args:
+            handle: Handle returned by register_print_report
 
-    def add_auto_print_popup(self, display_result: str, print_content: str) -> str:
+        Returns:
+            The report response data, or None if the handle expired
+        """
+        return self.print_handles.get(handle)
+
+    def render_print_view(self, handle: str) -> Optional[str]:
         """
-        Add a print popup trigger to the display result.
+        Render the print layout of a registered report.
+
+        Args:
+            handle: Handle returned by register_print_report
+
+        Returns:
+            HTML formatted print-ready report, or None if the handle expired
+        """
+        report_data = self.get_print_report(handle)
+        if report_data is None:
+            return None
+        return self.format_print_report(report_data)
+
+    def add_print_trigger(self, display_result: str, handle: str) -> str:
+        """
+        Add a print popup trigger that loads the print view on demand.
 
         Args:
             display_result: The formatted result to show in chat
-            print_content: The print-ready content for popup
+            handle: Handle returned by register_print_report
 
         Returns:
             Combined result with popup trigger
         """
-        # Create a simple popup window approach that works reliably
         popup_trigger = f"""
-<div class="print-popup-container" style="margin: 20px 0;">
+<div class="print-popup-container" data-print-handle="{handle}" style="margin: 20px 0;">
     <div class="alert alert-success text-center">
         <i class="fas fa-print"></i> <strong>Print window will open automatically...</strong>
         <br><small>Click the button below if it doesn't open</small>
     </div>
     <div class="text-center mt-2">
-        <button onclick="window.openPrintWindow()" class="btn btn-primary btn-lg">
+        <button onclick="window.openPrintWindow(null, '{handle}')" class="btn btn-primary btn-lg">
             🖨️ Open Print Window
         </button>
     </div>
 </div>
-
-<!-- Hidden print content for extraction -->
-<div id="printContent" style="display: none;">
-{print_content}
-</div>
 """
 
         return f"{display_result}\n\n{popup_trigger}"
 
-    def format_income_providers_table(self, data: Dict[str, Any]) -> str:
+    def format_income_providers_table(self, data: Dict[str, Any], compact: bool = False) -> str:
         """
         Format income providers response as an HTML table.
 
         Args:
             data: API response data containing income providers list
+            compact: Use shared CSS classes and minified markup instead of inline styles
 
         Returns:
             HTML formatted table of income providers
@@ -569,7 +1360,6 @@ class indiciAPITools:
         practice_id = data.get("practiceId", "N/A")
         practice_location_id = data.get("practiceLocationId", "N/A")
         results = data.get("results", [])
-        retrieved_at = data.get("retrievedAt", "")
 
         # Handle zero records case
         if not results or total_records == 0:
@@ -581,68 +1371,16 @@ class indiciAPITools:
 </div>
 """
 
-        # Build HTML table output
-        html_output = f"""
-<div class="w-100" style="width: 100% !important; max-width: 100% !important;">
-    <div class="card border-0 shadow-sm">
-        <div class="card-header bg-success text-white">
-            <h4 class="mb-0">👥 Income Providers List</h4>
-        </div>
-        <div class="card-body p-2 w-100">
-            <div class="mb-2">
-                <strong>Practice ID:</strong> {practice_id} &nbsp;&nbsp;&nbsp;
-                <strong>Location ID:</strong> {practice_location_id} &nbsp;&nbsp;&nbsp;
-                <strong>Total Records:</strong> {total_records}
-            </div>
-
-            <div class="table-responsive">
-                <table class="table table-striped table-hover mb-0" style="font-size: 12px;">
-                    <thead class="table-dark">
-                        <tr>
-                            <th style="width: 15%; text-align: center;">Patient ID</th>
-                            <th style="width: 50%; text-align: left;">Provider Full Name</th>
-                            <th style="width: 35%; text-align: center;">Provider ID (UUID)</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-"""
-
-        # Add table rows
-        for result in results:
-            patient_id = result.get("patientID", "N/A")
-            full_name = result.get("fullName", "N/A")
-            provider_id = result.get("providerID", "N/A")
-
-            html_output += f"""
-                        <tr style="background-color: #ffffff;">
-                            <td style="border: 1px solid #dee2e6; padding: 8px; text-align: center; background-color: #f8f9fa;">{patient_id}</td>
-                            <td style="border: 1px solid #dee2e6; padding: 8px; text-align: left;">{full_name}</td>
-                            <td style="border: 1px solid #dee2e6; padding: 8px; text-align: center; font-family: monospace; font-size: 10px;">{provider_id}</td>
-                        </tr>
-"""
-
-        html_output += f"""
-                    </tbody>
-                </table>
-            </div>
-
-            <div class="mt-2 text-muted" style="font-size: 11px;">
-                <i class="fas fa-clock"></i> Retrieved: {retrieved_at}
-            </div>
-        </div>
-    </div>
-</div>
-"""
-
-        return html_output
+        return render_income_providers_table(data, compact=compact)
 
-    def format_income_providers_simple_table(self, data: Dict[str, Any]) -> str:
+    def format_income_providers_simple_table(self, data: Dict[str, Any], compact: bool = False) -> str:
         """
         Format income providers response as a simple HTML table with only Provider Full Name.
         Used for Provider Capitation Report income providers list.
 
         Args:
             data: API response data containing income providers list
+            compact: Use shared CSS classes and minified markup instead of inline styles
 
         Returns:
             HTML formatted simple table of provider names only
@@ -664,52 +1402,53 @@ class indiciAPITools:
 </div>
 """
 
-        # Build simple HTML table output (only Provider Full Name)
-        html_output = f"""
-<div class="w-100" style="width: 100% !important; max-width: 100% !important;">
-    <div class="card border-0 shadow-sm">
-        <div class="card-header bg-info text-white">
-            <h4 class="mb-0">👥 Income Providers for Provider Capitation Report</h4>
-        </div>
-        <div class="card-body p-2 w-100">
-            <div class="mb-2">
-                <strong>Total Providers:</strong> {total_records}
-            </div>
-
-            <div class="table-responsive">
-                <table class="table table-striped table-hover mb-0" style="font-size: 14px;">
-                    <thead class="table-dark">
-                        <tr>
-                            <th style="width: 100%; text-align: left;">Provider Full Name</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-"""
+        return render_income_providers_simple_table(data, compact=compact)
 
-        # Add table rows (only provider names)
-        for result in results:
-            full_name = result.get("fullName", "N/A")
+    def format_income_providers_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Format income providers response as structured JSON-ready data.
 
-            html_output += f"""
-                        <tr style="background-color: #ffffff;">
-                            <td style="border: 1px solid #dee2e6; padding: 12px; text-align: left; font-weight: 500;">{full_name}</td>
-                        </tr>
-"""
+        Args:
+            data: API response data containing income providers list
 
-        html_output += f"""
-                    </tbody>
-                </table>
-            </div>
-        </div>
-    </div>
-</div>
-"""
+        Returns:
+            Dict with the total record count and provider names
+        """
+        return income_providers_payload(data)
 
-        return html_output
+    def format_batch_report(self, batch: Dict[str, Any], compact: bool = False) -> str:
+        """
+        Format a batch report as one HTML report with a section per practice, provider or location.
+
+        Args:
+            batch: Result of get_batch_capitation_report
+            compact: Use shared CSS classes and minified markup instead of inline styles
+
+        Returns:
+            HTML with grand totals, per-entity sections and any per-entity failures
+        """
+        if not batch.get("data"):
+            return f'<div class="alert alert-danger">❌ Report generation failed: {batch.get("error", "Unknown error")}</div>'
+        return render_batch_report(batch["data"], compact=compact)
+
+    def format_batch_report_data(self, batch: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Format a batch report as structured JSON-ready data for client-side rendering.
+
+        Args:
+            batch: Result of get_batch_capitation_report
+
+        Returns:
+            Dict with the date range, per-entity sections and grand totals
+        """
+        return batch_report_payload(batch, self.format_report_data)
 
     async def ad_login(self, username: str, machine_ip: str = None) -> Dict[str, Any]:
         """
         Authenticate user via AD login endpoint.
+
+        Successful logins are cached per user for ad_login_cache.ttl seconds,
+        so Teams re-verifying a session does not call the endpoint again.
         
         Args:
             username: User's email/username for AD authentication
@@ -718,6 +1457,12 @@ class indiciAPITools:
         Returns:
             Dictionary containing user info, practices, and other AD login data
         """
+        cache_key = self._ad_login_key(username)
+        cached = self.ad_logins.get(cache_key)
+        if cached is not None:
+            logger.info(f"AD login served from cache for user: {username}")
+            return cached
+
         try:
             logger.info(f"Attempting AD login for user: {username}")
             
@@ -728,30 +1473,15 @@ class indiciAPITools:
                 "machineIP": machine_ip or "127.0.0.1"
             }
             
-            # Make request to AD login endpoint
-            async with aiohttp.ClientSession() as session:
-                url = f"{self.base_url}/api/Login/AdLogin"
-                logger.info(f"Calling AD login endpoint: {url}")
-                
-                async with session.post(
-                    url,
-                    json=payload,
-                    headers={"Content-Type": "application/json"},
-                    timeout=aiohttp.ClientTimeout(total=30)
-                ) as response:
-                    
-                    if response.status == 200:
-                        data = await response.json()
-                        logger.info(f"AD login successful for user: {username}")
-                        return data
-                    else:
-                        error_text = await response.text()
-                        logger.error(f"AD login failed for user {username}: {response.status} - {error_text}")
-                        return {
-                            "success": False,
-                            "error": f"AD login failed: {response.status}",
-                            "details": error_text
-                        }
+            # Make request to AD login endpoint over the shared connection pool;
+            # concurrent logins for the same user share one call
+            result = await self.ad_login_flights.do(
+                cache_key,
+                lambda: http_client.run(self._send_ad_login(username, payload))
+            )
+            if result.get("success", False) and result.get("data"):
+                self.ad_logins.set(cache_key, result)
+            return result
                         
         except Exception as e:
             logger.error(f"Exception during AD login for user {username}: {str(e)}")
@@ -760,6 +1490,77 @@ class indiciAPITools:
                 "error": f"AD login exception: {str(e)}"
             }
 
+    @staticmethod
+    def _ad_login_key(username: str) -> str:
+        """Normalize a username so differently cased sign-ins share one cache entry."""
+        return username.strip().casefold()
+
+    def invalidate_ad_login(self, username: str) -> bool:
+        """
+        Drop a user's cached AD login so the next sign-in calls the endpoint.
+
+        Args:
+            username: User's email/username
+
+        Returns:
+            True if a cached login was removed
+        """
+        removed = self.ad_logins.invalidate(self._ad_login_key(username))
+        if removed:
+            logger.info(f"Cached AD login removed for user: {username}")
+        return removed
+
+    async def _send_ad_login(self, username: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Post the AD login payload using the pooled session of the running event loop."""
+        session = http_client.get_session()
+        url = f"{self.base_url}/api/Login/AdLogin"
+        logger.info(f"Calling AD login endpoint: {url}")
+        
+        async with session.post(
+            url,
+            json=payload,
+            timeout=aiohttp.ClientTimeout(total=30)
+        ) as response:
+            
+            if response.status == 200:
+                data = await response.json()
+                logger.info(f"AD login successful for user: {username}")
+                return data
+            else:
+                error_text = await response.text()
+                logger.error(f"AD login failed for user {username}: {response.status} - {error_text}")
+                return {
+                    "success": False,
+                    "error": f"AD login failed: {response.status}",
+                    "details": error_text
+                }
+
+    def get_upstream_stats(self) -> Dict[str, Any]:
+        """
+        Get monitoring statistics for upstream indici API access.
+
+        Returns:
+            Dict containing connection pool, cache, coalescing, retry, circuit breaker,
+            scheduler, latency, hedging and health statistics
+        """
+        return {
+            "http_pool": http_client.get_stats(),
+            "report_cache": self.report_cache.get_stats(),
+            "print_handles": self.print_handles.get_stats(),
+            "ad_login_cache": self.ad_logins.get_stats(),
+            "retries": dict(self.retry_stats),
+            "circuit_breakers": self.circuit_breakers.get_stats(),
+            "scheduler": upstream_scheduler.get_stats(),
+            "conditional_requests": dict(self.conditional_stats, validators=len(self.validators)),
+            "latency": self.latency.get_stats(),
+            "hedging": dict(self.hedge_stats, enabled=config.hedging_enabled),
+            "report_single_flight": self.report_flights.get_stats(),
+            "roster_cache": self.roster_cache.get_stats(),
+            "provider_name_resolution": dict(self.name_resolution_stats, enabled=config.provider_name_resolution_enabled),
+            "aggregate_store": aggregate_store.get_stats(),
+            "health": health_probe.get_state()
+        }
+
     def get_sample_queries(self) -> List[Dict[str, str]]:
         """Get sample queries for the chatbot interface."""
         return [
@@ -779,6 +1580,11 @@ class indiciAPITools:
                 "query": "Show me the provider capitation report in print",
                 "description": "Display and print provider capitation report"
             },
+            {
+                "title": "Multi-Practice Report",
+                "query": "Show the provider capitation report for practices 1 and 2 for last quarter",
+                "description": "One combined report with a section and totals per practice"
+            },
             {
                 "title": "Provider List For Capitation",
                 "query": "Show me the income provider list for provider capitation report",
@@ -0,0 +1,292 @@
+"""Scheduled background warming of commonly opened reports."""
+
+import asyncio
+import logging
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .config import config
+from .dates import month_end, month_to_date, year_to_date
+from .health import health_probe
+from .http_client import http_client
+from .scheduler import PREFETCH, upstream_context
+from .tools import indici_tools
+
+logger = logging.getLogger(__name__)
+
+class CronSchedule:
+    """
+    Five-field cron expression: minute hour day-of-month month day-of-week.
+
+    Fields accept "*", numbers, ranges ("1-5"), lists ("1,15") and steps
+    ("*/15", "0-30/10"). Day-of-week runs 0-6 from Sunday (7 is also Sunday).
+    As in cron, when both day fields are restricted a day matching either runs.
+    """
+
+    BOUNDS = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+    def __init__(self, expression: str):
+        """
+        Parse a cron expression.
+
+        Raises:
+            ValueError: If the expression is malformed
+        """
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs 5 fields, got {len(fields)}: {expression!r}")
+
+        self.expression = expression
+        parsed = [self._parse(field, low, high) for field, (low, high) in zip(fields, self.BOUNDS)]
+        self.minutes, self.hours, self.days, self.months, weekdays = parsed
+        self.weekdays = {day % 7 for day in weekdays}
+        self._any_day = fields[2] == "*"
+        self._any_weekday = fields[4] == "*"
+
+    @staticmethod
+    def _parse(field: str, low: int, high: int) -> Set[int]:
+        values = set()
+        for part in field.split(","):
+            spec, _, step = part.partition("/")
+            if spec == "*":
+                start, end = low, high
+            elif "-" in spec:
+                start, end = (int(value) for value in spec.split("-", 1))
+            else:
+                start = end = int(spec)
+            if not (low <= start <= end <= high):
+                raise ValueError(f"Cron field {field!r} is outside {low}-{high}")
+            values.update(range(start, end + 1, int(step) if step else 1))
+        return values
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day_ok = moment.day in self.days
+        weekday_ok = (moment.weekday() + 1) % 7 in self.weekdays
+        if self._any_day:
+            return weekday_ok
+        if self._any_weekday:
+            return day_ok
+        return day_ok or weekday_ok
+
+    def next_after(self, moment: datetime) -> datetime:
+        """
+        Get the first matching minute after a moment.
+
+        Args:
+            moment: Reference time (naive, server local time)
+
+        Returns:
+            Next run time
+        """
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        # Four years covers every day-of-month/month combination, including 29 February
+        limit = candidate + timedelta(days=4 * 366)
+        while candidate < limit:
+            if candidate.month not in self.months:
+                candidate = (candidate.replace(day=1) + timedelta(days=32)).replace(day=1, hour=0, minute=0)
+            elif not self._day_matches(candidate):
+                candidate = candidate.replace(hour=0, minute=0) + timedelta(days=1)
+            elif candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+        raise ValueError(f"Cron expression never matches: {self.expression!r}")
+
+def warm_ranges(today: date) -> List[Tuple[date, date]]:
+    """
+    Get the "this month" and "this year" ranges the chat requests.
+
+    Local date resolution, the intent classifier and the Groq prompt ask for
+    the month and year to date; the OpenRouter prompt asks for the whole
+    calendar month and year. The warmer follows the chat, never the other
+    way round, so both forms are warmed (once each when they coincide).
+
+    Args:
+        today: Reference date
+
+    Returns:
+        Distinct (date_from, date_to) ranges
+    """
+    ranges = [
+        month_to_date(today),
+        year_to_date(today),
+        (today.replace(day=1), month_end(today.year, today.month)),
+        (date(today.year, 1, 1), date(today.year, 12, 31))
+    ]
+    return list(dict.fromkeys(ranges))
+
+class CacheWarmer:
+    """
+    Precompute the reports people open first thing each day.
+
+    On every scheduled run, for the configured practices plus those used in
+    chat within the recent window, the warmer loads the provider list and
+    the current month and year reports for every range the chat asks for
+    (see warm_ranges), so the first requests of the day are cache hits. Reports that include today are cached for the warmer's live TTL
+    instead of the short live TTL.
+
+    Requests run at prefetch priority through the upstream scheduler, so they
+    stay within its background concurrency cap, and a run stops as soon as
+    the health probe reports the upstream as unhealthy.
+    """
+
+    def __init__(
+        self,
+        schedule: str = "0 6 * * 1-5",
+        practices: Optional[List[Dict[str, int]]] = None,
+        recent_window: float = 259200,
+        live_ttl: float = 14400,
+        enabled: bool = False
+    ):
+        """Initialize the warmer."""
+        self.schedule = CronSchedule(schedule)
+        self.practices = practices or []
+        self.recent_window = recent_window
+        self.live_ttl = live_ttl
+        self.enabled = enabled
+
+        self._lock = threading.Lock()
+        self._running = False
+        # Bumped by start() and stop(); a loop exits once its generation is stale
+        self._generation = 0
+        self._warming = False
+        self._next_run: Optional[datetime] = None
+        self._last_run: Dict[str, Any] = {}
+        self._counters = {
+            "runs": 0,
+            "paused_runs": 0,
+            "reports_warmed": 0,
+            "failures": 0
+        }
+
+    def start(self) -> None:
+        """Start the schedule loop (on the shared pool loop when it is running) if warming is enabled."""
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+            self._generation += 1
+            generation = self._generation
+        http_client.spawn(self._run(generation))
+        logger.info(f"Cache warmer started (schedule={self.schedule.expression!r})")
+
+    def stop(self) -> None:
+        """Stop the schedule loop."""
+        with self._lock:
+            self._running = False
+            self._generation += 1
+
+    def _is_current(self, generation: int) -> bool:
+        """Whether the loop of this generation should keep running."""
+        with self._lock:
+            return self._running and self._generation == generation
+
+    async def _run(self, generation: int) -> None:
+        """Sleep until each scheduled time and warm the caches."""
+        while self._is_current(generation):
+            next_run = self.schedule.next_after(datetime.now())
+            self._next_run = next_run
+            # Sleep in short steps so stop(), restarts and clock changes are noticed
+            while self._is_current(generation) and datetime.now() < next_run:
+                await asyncio.sleep(min(60.0, max(0.0, (next_run - datetime.now()).total_seconds())))
+            if not self._is_current(generation):
+                return
+            try:
+                await self.warm()
+            except Exception as e:
+                logger.error(f"Cache warming run failed: {str(e)}")
+
+    def targets(self) -> List[Tuple[int, int]]:
+        """
+        Get the practices to warm: configured ones first, then recently used ones.
+
+        Returns:
+            List of (practice_id, practice_location_id)
+        """
+        targets = [(item["practice_id"], item.get("practice_location_id", 1)) for item in self.practices]
+        for target in indici_tools.get_recent_practices(self.recent_window):
+            if target not in targets:
+                targets.append(target)
+        return targets
+
+    async def warm(self) -> Dict[str, Any]:
+        """
+        Run one warming pass now.
+
+        Returns:
+            Summary of the run
+        """
+        with self._lock:
+            if self._warming:
+                return {"success": False, "error": "A warming run is already in progress"}
+            self._warming = True
+
+        started = time.monotonic()
+        summary = {"started_at": datetime.now().isoformat(), "practices": 0, "warmed": 0, "failed": 0, "paused": False}
+        try:
+            today = date.today()
+            ranges = warm_ranges(today)
+            with upstream_context(priority=PREFETCH, client="cache-warmer"):
+                for practice_id, practice_location_id in self.targets():
+                    if not health_probe.is_healthy():
+                        summary["paused"] = True
+                        logger.warning("Cache warming paused: indici API is unhealthy")
+                        break
+
+                    summary["practices"] += 1
+                    results = [await indici_tools.get_all_income_providers(practice_id, practice_location_id)]
+                    for date_from, date_to in ranges:
+                        results.append(await indici_tools.get_provider_capitation_report(
+                            practice_id=practice_id,
+                            date_from=date_from.strftime("%Y-%m-%d"),
+                            date_to=date_to.strftime("%Y-%m-%d"),
+                            cache_live_ttl=self.live_ttl
+                        ))
+
+                    failed = sum(1 for result in results if not result.get("success", True))
+                    summary["warmed"] += len(results) - failed
+                    summary["failed"] += failed
+        finally:
+            summary["duration_seconds"] = round(time.monotonic() - started, 2)
+            with self._lock:
+                self._warming = False
+                self._last_run = summary
+                self._counters["runs"] += 1
+                self._counters["paused_runs"] += int(summary["paused"])
+                self._counters["reports_warmed"] += summary["warmed"]
+                self._counters["failures"] += summary["failed"]
+
+        logger.info(f"Cache warming run finished: {summary}")
+        return summary
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get warmer statistics for monitoring.
+
+        Returns:
+            Dict containing schedule, next and last run, and counters
+        """
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "schedule": self.schedule.expression,
+                "next_run": self._next_run.isoformat() if self._next_run else None,
+                "warming": self._warming,
+                "last_run": dict(self._last_run),
+                **self._counters
+            }
+
+# Global instance
+cache_warmer = CacheWarmer(
+    schedule=config.cache_warmer_schedule,
+    practices=config.cache_warmer_practices,
+    recent_window=config.cache_warmer_recent_window,
+    live_ttl=config.cache_warmer_live_ttl,
+    enabled=config.cache_warmer_enabled
+)
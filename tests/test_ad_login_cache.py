@@ -0,0 +1,52 @@
+"""Per-user AD login cache and its logout invalidation."""
+
+import asyncio
+
+import pytest
+
+from mcp_server.tools import indici_tools
+
+@pytest.fixture
+def upstream(monkeypatch):
+    calls = []
+
+    async def send_ad_login(username, payload):
+        calls.append(username)
+        await asyncio.sleep(0.01)
+        if username.startswith("locked"):
+            return {"success": False, "error": "Account locked"}
+        return {"success": True, "data": {"user": {"email": username}, "practices": [{"practiceID": 1}]}}
+
+    indici_tools.ad_logins.clear()
+    monkeypatch.setattr(indici_tools, "_send_ad_login", send_ad_login)
+    yield calls
+    indici_tools.ad_logins.clear()
+
+def login(username):
+    return asyncio.run(indici_tools.ad_login(username))
+
+def test_repeated_logins_are_served_from_cache(upstream):
+    first = login("Jane.Smith@example.org")
+    second = login(" jane.smith@EXAMPLE.org ")
+    assert second == first
+    assert len(upstream) == 1
+
+def test_concurrent_logins_share_one_call(upstream):
+    async def main():
+        return await asyncio.gather(*(indici_tools.ad_login("sam@example.org") for _ in range(5)))
+
+    results = asyncio.run(main())
+    assert all(result["success"] for result in results)
+    assert len(upstream) == 1
+
+def test_failed_logins_are_not_cached(upstream):
+    assert not login("locked@example.org")["success"]
+    login("locked@example.org")
+    assert len(upstream) == 2
+
+def test_logout_drops_the_cached_login(upstream):
+    login("jane.smith@example.org")
+    assert indici_tools.invalidate_ad_login("JANE.SMITH@example.org")
+    assert not indici_tools.invalidate_ad_login("jane.smith@example.org")
+    login("jane.smith@example.org")
+    assert len(upstream) == 2
@@ -0,0 +1,48 @@
+"""Vectorized report aggregation against the pure-Python fallback."""
+
+import pytest
+
+from benchmarks.synthetic_data import make_capitation_rows
+from mcp_server import aggregation
+from mcp_server.report_table import CapitationTable
+
+pytest.importorskip("numpy")
+
+def both(rows):
+    table = CapitationTable(rows)
+    return aggregation._aggregate_numpy(table), aggregation._aggregate_python(table)
+
+def assert_same(vectorized, python):
+    for field in ("provider_quantity", "age_quantity", "pivot_quantity", "grand_quantity"):
+        assert getattr(vectorized, field) == getattr(python, field), field
+    for field in ("provider_amount", "age_amount"):
+        assert getattr(vectorized, field) == pytest.approx(getattr(python, field)), field
+    assert vectorized.pivot_amount == [pytest.approx(row) for row in python.pivot_amount]
+    assert vectorized.grand_amount == pytest.approx(python.grand_amount)
+
+def test_integer_quantities_match_the_python_loop():
+    vectorized, python = both(make_capitation_rows(25, 6, seed=7))
+    assert_same(vectorized, python)
+    assert all(isinstance(q, int) for q in vectorized.provider_quantity)
+    assert isinstance(vectorized.grand_quantity, int)
+
+def test_fractional_quantities_only_affect_their_groups():
+    rows = [
+        {"providerName": "A", "ageRange": "0-4", "quantity": 2, "totalAmount": 10.0},
+        {"providerName": "A", "ageRange": "5-14", "quantity": 0.5, "totalAmount": 2.5},
+        {"providerName": "B", "ageRange": "0-4", "quantity": 3, "totalAmount": 15.0},
+    ]
+    vectorized, python = both(rows)
+    assert_same(vectorized, python)
+    assert vectorized.provider_quantity == [2.5, 3]
+    assert isinstance(vectorized.provider_quantity[1], int)
+    assert isinstance(vectorized.pivot_quantity[0][0], int)
+
+def test_shares_of_an_empty_total_are_zero():
+    vectorized, python = both([{"providerName": "A", "ageRange": "0-4", "quantity": 0, "totalAmount": 0}])
+    assert vectorized.provider_share == python.provider_share == [0.0]
+
+def test_aggregate_falls_back_without_numpy(monkeypatch):
+    table = CapitationTable(make_capitation_rows(5, 3, seed=1))
+    monkeypatch.setattr(aggregation, "NUMPY_AVAILABLE", False)
+    assert aggregation.aggregate(table) == aggregation._aggregate_python(table)
@@ -0,0 +1,14 @@
+"""Input validation of the batch capitation report tool."""
+
+import asyncio
+
+import pytest
+
+from mcp_server.tools import indici_tools
+
+@pytest.mark.parametrize("practice_ids", [["one"], "1,two", [1, "2x"], [1.5]])
+def test_invalid_practice_ids_fail_the_call_cleanly(practice_ids):
+    result = asyncio.run(indici_tools.get_batch_capitation_report(practice_ids=practice_ids))
+    assert result["success"] is False
+    assert result["data"] is None
+    assert "Invalid practice ID" in result["error"]
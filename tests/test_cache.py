@@ -0,0 +1,101 @@
+"""TTL + LRU report cache."""
+
+import asyncio
+
+import pytest
+
+from mcp_server import cache as cache_module
+from mcp_server.cache import TTLCache
+from mcp_server.tools import indici_tools
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(cache_module, "time", fake)
+    return fake
+
+def test_entries_expire_after_their_ttl(clock):
+    cache = TTLCache(max_entries=4, default_ttl=10)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=60)
+    clock.now += 11
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    stats = cache.get_stats()
+    assert stats["expirations"] == 1
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = TTLCache(max_entries=2, default_ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.get_stats()["evictions"] == 1
+
+def test_invalidate_and_clear():
+    cache = TTLCache()
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.invalidate("a")
+    assert not cache.invalidate("a")
+    cache.clear()
+    assert len(cache) == 0
+
+@pytest.fixture
+def upstream(monkeypatch):
+    calls = []
+
+    async def make_request(method, endpoint, params=None, **kwargs):
+        if endpoint != indici_tools.endpoints["provider_capitation_report"]:
+            # Roster loads started by provider name resolution
+            return {"success": True, "data": {"totalRecords": 0, "results": []}}
+        calls.append(dict(params or {}))
+        if params.get("practiceId") == 99:
+            return {"success": False, "error": "HTTP 503"}
+        return {"success": True, "data": {"results": [], "totalRecords": 0}}
+
+    indici_tools.report_cache.clear()
+    monkeypatch.setattr(indici_tools, "_make_request", make_request)
+    yield calls
+    indici_tools.report_cache.clear()
+
+def report(**kwargs):
+    return asyncio.run(indici_tools.get_provider_capitation_report(
+        date_from="2024-01-01", date_to="2024-03-31", **kwargs
+    ))
+
+def test_repeated_report_is_served_from_cache(upstream):
+    first = report(practice_id=1, provider_name="Ann Lee, Bob Ray")
+    second = report(practice_id=1, provider_name="Ann Lee,Bob Ray")
+    assert second == first
+    assert len(upstream) == 1
+
+    report(practice_id=2, provider_name="Ann Lee,Bob Ray")
+    assert len(upstream) == 2
+
+def test_failed_reports_are_not_cached(upstream):
+    report(practice_id=99)
+    report(practice_id=99)
+    assert len(upstream) == 2
+
+def test_live_ranges_get_the_short_ttl():
+    from mcp_server.config import config
+    assert indici_tools._report_cache_ttl("2020-01-31") == config.report_cache_ttl
+    assert indici_tools._report_cache_ttl(None) == config.report_cache_live_ttl
+
+def test_aggregate_store_does_not_shard_when_sharding_is_off(upstream, monkeypatch):
+    from mcp_server.aggregate_store import aggregate_store
+    monkeypatch.setattr(aggregate_store, "enabled", True)
+    report(practice_id=3, shard_by_month=False)
+    assert [(call["dateFrom"], call["dateTo"]) for call in upstream] == [("2024-01-01", "2024-03-31")]
@@ -0,0 +1,91 @@
+"""Conditional upstream requests and result ETags."""
+
+import asyncio
+import json
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from mcp_server.http_client import http_client
+from mcp_server.tools import indici_tools
+
+BODY = {"success": True, "data": {"totalRecords": 1, "results": [{"providerName": "Ann Lee", "quantity": 1}]}}
+
+class Upstream:
+    """Test server answering one report, with or without validators."""
+
+    def __init__(self, etag=None):
+        self.etag = etag
+        self.seen = []
+
+    async def handle(self, request):
+        self.seen.append(request.headers.get("If-None-Match"))
+        if self.etag and request.headers.get("If-None-Match") == self.etag:
+            return web.Response(status=304, headers={"ETag": self.etag})
+        headers = {"ETag": self.etag} if self.etag else {}
+        return web.Response(body=json.dumps(BODY).encode(), content_type="application/json", headers=headers)
+
+def fetch_twice(upstream, params):
+    async def main():
+        app = web.Application()
+        app.router.add_get("/report", upstream.handle)
+        async with TestServer(app) as server:
+            url = str(server.make_url("/report"))
+            key = ("/report", tuple(sorted(params.items())))
+            try:
+                first = await indici_tools._send_request("GET", url, params, None, False, 5, key)
+                second = await indici_tools._send_request("GET", url, params, None, False, 5, key)
+            finally:
+                await http_client.close()
+        return first, second
+
+    return asyncio.run(main())
+
+@pytest.fixture(autouse=True)
+def fresh_validators():
+    indici_tools.validators.clear()
+    indici_tools.result_etags.clear()
+    yield
+    indici_tools.validators.clear()
+    indici_tools.result_etags.clear()
+
+def test_etag_is_revalidated_and_304_reuses_the_decoded_result():
+    upstream = Upstream(etag='"v1"')
+    before = dict(indici_tools.conditional_stats)
+    first, second = fetch_twice(upstream, {"practiceId": 1})
+    assert upstream.seen == [None, '"v1"']
+    assert first == second == BODY
+    assert indici_tools.conditional_stats["not_modified"] == before["not_modified"] + 1
+    assert indici_tools.result_etag(first) == indici_tools.result_etag(second) == ("v1", False)
+
+def test_reused_results_are_copies():
+    first, second = fetch_twice(Upstream(etag='"v1"'), {"practiceId": 3})
+    assert second is not first and second["data"] is not first["data"]
+    # Rows are shared, so tables built for them are reused
+    assert second["data"]["results"] is first["data"]["results"]
+    second["providerCandidates"] = {"Ann": []}
+    second["data"]["totalRecords"] = 99
+    _, third = fetch_twice(Upstream(etag='"v1"'), {"practiceId": 3})
+    assert third == BODY
+
+def test_weak_upstream_etags_stay_weak():
+    first, _ = fetch_twice(Upstream(etag='W/"v2"'), {"practiceId": 4})
+    assert indici_tools.result_etag(first) == ("v2", True)
+
+def test_unchanged_body_without_validators_is_not_decoded_again():
+    upstream = Upstream()
+    before = dict(indici_tools.conditional_stats)
+    first, second = fetch_twice(upstream, {"practiceId": 2})
+    assert upstream.seen == [None, None]
+    assert first == second == BODY
+    assert indici_tools.conditional_stats["unchanged"] == before["unchanged"] + 1
+
+def test_local_results_get_a_content_hash_etag():
+    merged = {"success": True, "data": {"results": [{"providerName": "Ann Lee"}]}}
+    same = json.loads(json.dumps(merged))
+    assert indici_tools.result_etag(merged) == indici_tools.result_etag(same)
+    assert indici_tools.result_etag(merged)[1] is False
+    assert indici_tools.result_etag(merged) != indici_tools.result_etag({"success": True, "data": {"results": []}})
+    # A result annotated by a tool is different content, so it gets its own tag
+    assert indici_tools.result_etag({**merged, "providerCandidates": {"Ann": []}}) != indici_tools.result_etag(merged)
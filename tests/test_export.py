@@ -0,0 +1,77 @@
+"""Streaming CSV/XLSX/PDF exports."""
+
+import csv
+import io
+import re
+import zlib
+
+import pytest
+
+from mcp_server import export
+from mcp_server.export import capitation_report_sheet, income_providers_sheet, iter_export
+
+ROWS = [
+    {"providerName": "Bob Ray", "ageRange": "0-4", "capitationAmount": 10.5, "quantity": 2, "totalAmount": 21.0},
+    {"providerName": "Ann <Lee> & Co", "ageRange": "0-4", "capitationAmount": 10.5, "quantity": 1, "totalAmount": 10.5},
+    {"providerName": "Bob Ray", "ageRange": "65+", "capitationAmount": 30.0, "quantity": 3, "totalAmount": 90.0}
+]
+
+def report(rows=ROWS):
+    return {"success": True, "data": {"totalRecords": len(rows), "dateFrom": "2024-01-01T00:00:00", "dateTo": "2024-03-31T00:00:00", "results": list(rows)}}
+
+def collect(sheet, export_format):
+    return b"".join(iter_export(sheet, export_format))
+
+def test_csv_has_one_row_per_result_grouped_by_provider():
+    text = collect(capitation_report_sheet(report()), "csv").decode("utf-8")
+    assert text.startswith("﻿")
+    rows = list(csv.reader(io.StringIO(text[1:])))
+    assert rows[0] == ["Provider", "Age Range", "Capitation Amount", "Quantity", "Total Amount"]
+    assert rows[1:] == [
+        ["Bob Ray", "0-4", "10.5", "2", "21.0"],
+        ["Bob Ray", "65+", "30.0", "3", "90.0"],
+        ["Ann <Lee> & Co", "0-4", "10.5", "1", "10.5"]
+    ]
+
+def test_small_chunks_produce_the_same_bytes(monkeypatch):
+    sheet = capitation_report_sheet(report())
+    expected = {fmt: collect(sheet, fmt) for fmt in ("csv", "pdf")}
+    monkeypatch.setattr(export, "EXPORT_CHUNK_SIZE", 16)
+    chunks = list(iter_export(sheet, "csv"))
+    assert len(chunks) > 1
+    assert b"".join(chunks) == expected["csv"]
+    assert collect(sheet, "pdf") == expected["pdf"]
+
+def test_xlsx_opens_with_the_same_cells():
+    openpyxl = pytest.importorskip("openpyxl")
+    workbook = openpyxl.load_workbook(io.BytesIO(collect(capitation_report_sheet(report()), "xlsx")))
+    sheet = workbook.active
+    assert sheet.title == "Provider Capitation Report"
+    values = [list(row) for row in sheet.iter_rows(values_only=True)]
+    assert values[0] == ["Provider", "Age Range", "Capitation Amount", "Quantity", "Total Amount"]
+    assert values[3] == ["Ann <Lee> & Co", "0-4", 10.5, 1, 10.5]
+    assert len(values) == 4
+
+def test_pdf_is_well_formed():
+    pdf = collect(capitation_report_sheet(report()), "pdf")
+    assert pdf.startswith(b"%PDF-1.4") and pdf.rstrip().endswith(b"%%EOF")
+    startxref = int(re.search(rb"startxref\n(\d+)", pdf).group(1))
+    assert pdf[startxref:startxref + 4] == b"xref"
+    # Every object offset in the xref table points at that object
+    offsets = [int(offset) for offset in re.findall(rb"(\d{10}) 00000 n", pdf)]
+    for object_id, offset in enumerate(offsets, start=1):
+        assert pdf[offset:].startswith(f"{object_id} 0 obj".encode())
+    streams = re.findall(rb"stream\r?\n(.*?)\r?\nendstream", pdf, re.S)
+    text = b"".join(zlib.decompress(stream) if b"/FlateDecode" in pdf else stream for stream in streams)
+    assert b"(Grand Total)" in text
+    assert b"(Ann <Lee> & Co)" in text
+
+def test_income_providers_export():
+    sheet = income_providers_sheet({"practiceId": 1, "totalRecords": 1, "results": [{"patientID": 7, "fullName": "Ann Lee", "providerID": "P7"}]})
+    rows = list(csv.reader(io.StringIO(collect(sheet, "csv").decode("utf-8-sig"))))
+    assert rows == [["Patient ID", "Provider Name", "Provider ID"], ["7", "Ann Lee", "P7"]]
+
+def test_empty_report_and_unknown_format():
+    assert collect(capitation_report_sheet(report(rows=[])), "csv").decode("utf-8-sig").count("\n") == 1
+    with pytest.raises(ValueError):
+        iter_export(capitation_report_sheet(report()), "docx")
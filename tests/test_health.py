@@ -0,0 +1,45 @@
+"""Upstream health probe status handling."""
+
+import asyncio
+
+import pytest
+
+from mcp_server.config import config
+from mcp_server.health import UpstreamHealthProbe
+
+@pytest.mark.parametrize("status", [200, 204, 301, 304, 405])
+def test_serving_statuses_are_healthy(status):
+    assert UpstreamHealthProbe.is_healthy_status(status)
+
+@pytest.mark.parametrize("status", [400, 401, 403, 404, 429, 500, 503])
+def test_error_statuses_are_unhealthy(status):
+    assert not UpstreamHealthProbe.is_healthy_status(status)
+
+def test_probe_does_not_target_report_endpoints():
+    assert config.health_probe_path not in config.indici_api_endpoints.values()
+
+def test_restart_leaves_a_single_probe_loop(monkeypatch):
+    from mcp_server import health as health_module
+
+    probe = UpstreamHealthProbe("http://upstream.invalid/", interval=0.01)
+    loops = []
+
+    async def probe_once():
+        return probe.get_state()
+
+    monkeypatch.setattr(probe, "probe_once", probe_once)
+
+    async def main():
+        monkeypatch.setattr(health_module.http_client, "spawn", lambda coro: loops.append(asyncio.ensure_future(coro)))
+        probe.start()
+        await asyncio.sleep(0.005)
+        # Restarted before the first loop wakes from its sleep
+        probe.stop()
+        probe.start()
+        await asyncio.sleep(0.05)
+        first, second = loops
+        assert first.done() and not second.done()
+        probe.stop()
+        await asyncio.wait_for(second, 1)
+
+    asyncio.run(main())
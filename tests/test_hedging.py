@@ -0,0 +1,56 @@
+"""Hedged requests stay within the upstream scheduler's limits."""
+
+import asyncio
+
+import pytest
+
+from mcp_server import tools
+from mcp_server.scheduler import UpstreamScheduler
+from mcp_server.tools import indici_tools
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """A scheduler of a given size and a fake upstream where the first copy is slow."""
+    calls = []
+
+    async def send_request(*args, **kwargs):
+        calls.append(len(calls))
+        await asyncio.sleep(0.2 if len(calls) == 1 else 0.01)
+        return {"success": True, "copy": len(calls)}
+
+    def make(max_concurrency):
+        scheduler = UpstreamScheduler(max_concurrency=max_concurrency, per_practice_concurrency=max_concurrency)
+        monkeypatch.setattr(tools, "upstream_scheduler", scheduler)
+        return scheduler
+
+    monkeypatch.setattr(indici_tools, "_send_request", send_request)
+    return make, calls
+
+def hedged(scheduler):
+    async def run():
+        # _make_request holds a slot for the first copy
+        await scheduler.acquire(1, "user")
+        try:
+            return await indici_tools._send_hedged(
+                "GET", "http://upstream/report", {}, None, False, 5.0, 0.02, None, 1, "user"
+            )
+        finally:
+            scheduler.release(1)
+    return asyncio.run(run())
+
+def test_hedge_waits_for_a_free_slot(upstream):
+    make, calls = upstream
+    scheduler = make(1)
+    result = hedged(scheduler)
+    assert result["copy"] == 1
+    assert len(calls) == 1
+    assert scheduler._in_flight == 0
+
+def test_hedge_takes_and_frees_its_own_slot(upstream):
+    make, calls = upstream
+    scheduler = make(2)
+    result = hedged(scheduler)
+    assert len(calls) == 2
+    assert result["copy"] == 2
+    assert scheduler.get_stats()["max_in_flight"] == 2
+    assert scheduler._in_flight == 0
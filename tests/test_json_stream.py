@@ -0,0 +1,51 @@
+"""Single-pass and streaming JSON decoding of API responses."""
+
+import json
+
+import pytest
+
+from mcp_server import json_stream
+from mcp_server.json_stream import ResultsStreamParser, decode_json
+
+DOCUMENT = {
+    "success": True,
+    "data": {
+        "totalRecords": 3,
+        "providerName": "Lee, Ann",
+        "results": [
+            {"providerName": "Ann Lee", "ageRange": "0-4", "quantity": 12, "amount": 340.5},
+            {"providerName": "Bob {Ray}", "ageRange": "65+", "quantity": 3, "amount": None, "notes": "a } b"},
+            {"providerName": "Cy Wu", "ageRange": "5-14", "quantity": 0, "amount": 0, "nested": {"x": [1, {"y": 2}]}}
+        ],
+        "dateTo": "2024-03-31T00:00:00"
+    }
+}
+BODY = json.dumps(DOCUMENT).encode()
+
+def stream(body, chunk_size, on_row=None):
+    parser = ResultsStreamParser(on_row=on_row)
+    for start in range(0, len(body), chunk_size):
+        parser.feed(body[start:start + chunk_size])
+    return parser.close()
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 64, len(BODY)])
+def test_streamed_document_matches_a_full_decode(chunk_size):
+    assert stream(BODY, chunk_size) == DOCUMENT
+
+def test_rows_are_handed_over_as_they_complete():
+    seen = []
+    stream(BODY, 16, seen.append)
+    assert seen == DOCUMENT["data"]["results"]
+
+def test_document_without_results_is_decoded_as_is():
+    body = json.dumps({"success": False, "error": "nope"}).encode()
+    assert stream(body, 5) == {"success": False, "error": "nope"}
+
+def test_truncated_body_is_an_error():
+    with pytest.raises(ValueError):
+        stream(BODY[:len(BODY) // 2], 32)
+
+def test_stdlib_fallback_decodes_the_same(monkeypatch):
+    monkeypatch.setattr(json_stream, "_decoder", None)
+    assert decode_json(BODY) == DOCUMENT
+    assert stream(BODY, 9) == DOCUMENT
@@ -0,0 +1,88 @@
+"""Provider name resolution against the cached roster."""
+
+import asyncio
+
+import pytest
+
+from mcp_server.roster import ProviderRoster
+from mcp_server.tools import indici_tools
+
+NAMES = ["Dr John Smith", "Dr Jane Smith", "Liam Walker", "Liam Ngata", "Liam Brown", "Priya Patel"]
+
+def make_roster(practice_id, practice_location_id, names=NAMES):
+    response = {"success": True, "data": {"results": [{"fullName": name} for name in names]}}
+    return ProviderRoster.from_response(practice_id, practice_location_id, response)
+
+@pytest.fixture
+def rosters(monkeypatch):
+    requested = []
+
+    async def get_provider_roster(practice_id=1, practice_location_id=1):
+        requested.append((practice_id, practice_location_id))
+        return make_roster(practice_id, practice_location_id)
+
+    monkeypatch.setattr(indici_tools, "get_provider_roster", get_provider_roster)
+    return requested
+
+def resolve(name, practice_id=1, practice_location_id=1):
+    return asyncio.run(indici_tools.resolve_provider_name(name, practice_id, practice_location_id))
+
+def test_exact_and_confident_matches_use_the_roster_spelling(rosters):
+    assert resolve("john smith")["providerName"] == "Dr John Smith"
+    assert resolve("Priya Patle")["providerName"] == "Priya Patel"
+    assert resolve("Jonh Smiht, priya patel")["providerName"] == "Dr John Smith,Priya Patel"
+
+def test_ambiguous_and_weak_matches_pass_through_with_candidates(rosters):
+    result = resolve("Liam")
+    assert result["providerName"] == "Liam"
+    assert [match["name"] for match in result["candidates"]["Liam"]] == ["Liam Brown", "Liam Ngata", "Liam Walker"]
+
+    result = resolve("Smith")
+    assert result["providerName"] == "Smith"
+    assert len(result["candidates"]["Smith"]) == 2
+
+def test_unknown_names_pass_through(rosters):
+    result = resolve("Zed Quux")
+    assert result == {"providerName": "Zed Quux", "matches": result["matches"], "candidates": {}}
+
+def test_roster_of_the_requested_location_is_used(rosters):
+    resolve("john smith", practice_id=7, practice_location_id=3)
+    assert rosters == [(7, 3)]
+
+def test_without_a_location_names_are_not_resolved(rosters):
+    result = resolve("jonh smiht", practice_id=7, practice_location_id=None)
+    assert result["providerName"] == "jonh smiht"
+    assert rosters == []
+
+def test_reports_do_not_wait_for_a_roster_that_is_not_cached(monkeypatch):
+    from mcp_server.http_client import http_client
+    from mcp_server.roster import ProviderRosterCache
+
+    reports, spawned = [], []
+
+    async def make_request(method, endpoint, params=None, **kwargs):
+        if endpoint == indici_tools.endpoints["provider_capitation_report"]:
+            reports.append(params["providerName"])
+            return {"success": True, "data": {"totalRecords": 0, "results": []}}
+        return {"success": True, "data": {"results": [{"fullName": name} for name in NAMES]}}
+
+    monkeypatch.setattr(indici_tools, "_make_request", make_request)
+    monkeypatch.setattr(indici_tools, "roster_cache", ProviderRosterCache())
+    monkeypatch.setattr(http_client, "spawn", spawned.append)
+    indici_tools.report_cache.clear()
+
+    async def report():
+        return await indici_tools.get_provider_capitation_report(
+            practice_id=7, practice_location_id=3, provider_name="jonh smiht"
+        )
+
+    asyncio.run(report())
+    assert reports == ["jonh smiht"]
+    assert len(spawned) == 1
+
+    # The background load fills the roster for the next request
+    asyncio.run(spawned.pop())
+    asyncio.run(report())
+    assert reports == ["jonh smiht", "Dr John Smith"]
+    assert not spawned
+    indici_tools.report_cache.clear()
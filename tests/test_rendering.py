@@ -0,0 +1,75 @@
+"""Template-based HTML rendering of capitation reports."""
+
+import re
+
+from mcp_server.rendering import (
+    minify_html,
+    render_income_providers_simple_table,
+    render_income_providers_table,
+    render_print_report,
+    render_report_summary
+)
+from mcp_server.report_table import CapitationTable
+from mcp_server.tools import indici_tools
+
+ROWS = [
+    {"providerName": "Bob Ray", "ageRange": "0-4", "capitationAmount": 10.5, "quantity": 2, "totalAmount": 21.0},
+    {"providerName": "Ann Lee", "ageRange": "0-4", "capitationAmount": 10.5, "quantity": 1, "totalAmount": 10.5},
+    {"providerName": "Bob Ray", "ageRange": "65+", "capitationAmount": 30.0, "quantity": 3, "totalAmount": 90.0}
+]
+
+def report(rows=ROWS, **data):
+    return {"success": True, "data": {"totalRecords": len(rows), "results": list(rows), **data}}
+
+def test_summary_has_one_section_per_provider_with_totals():
+    html = render_report_summary(CapitationTable(ROWS), total_records=3)
+    assert re.findall(r"<h5[^>]*>([^<]+)</h5>", html) == ["Bob Ray", "Ann Lee"]
+    assert "<strong>Total Records:</strong> 3" in html
+    assert html.count('<tr style="background-color: #ffffff;">') == 3
+    totals = re.findall(r'font-weight: bold;">([\d.]+)</td>', html)
+    assert totals == ["5", "111.00", "1", "10.50"]
+
+def test_only_later_sections_get_a_top_margin():
+    html = render_report_summary(CapitationTable(ROWS), total_records=3)
+    assert re.findall(r'<div class="mb-3 w-100 ([^"]*)">', html) == ["", "mt-3"]
+
+def test_print_layout_shows_the_period():
+    html = render_print_report(CapitationTable(ROWS), "Period Date: 2024-01-01 to 2024-03-31")
+    assert "<p>Period Date: 2024-01-01 to 2024-03-31</p>" in html
+    assert re.findall(r"<h3>([^<]+)</h3>", html) == ["Bob Ray", "Ann Lee"]
+    assert "<p>" not in render_print_report(CapitationTable(ROWS))
+
+def test_formatters_render_through_the_templates():
+    data = report(dateFrom="2024-01-01T00:00:00", dateTo="2024-03-31T00:00:00")
+    assert indici_tools.format_report_summary(data) == render_report_summary(CapitationTable(ROWS), 3)
+    assert "Period Date: 2024-01-01 to 2024-03-31" in indici_tools.format_print_report(data)
+
+def test_empty_report_shows_no_records():
+    html = indici_tools.format_report_summary(report(rows=[], providerName="Cy Wu"))
+    assert "No record found for this provider (Cy Wu)" in html
+
+def visible_text(html):
+    return " ".join(re.sub(r"<[^>]+>", " ", html).split())
+
+def test_compact_summary_has_the_same_content_without_inline_styles():
+    table = CapitationTable(ROWS)
+    full = render_report_summary(table, 3)
+    compact = render_report_summary(table, 3, compact=True)
+    assert visible_text(compact) == visible_text(full)
+    assert "style=" not in compact
+    assert "\n" not in compact
+    assert len(compact) < len(full) / 2
+
+def test_compact_income_providers_keep_every_name():
+    data = {
+        "totalRecords": 2,
+        "results": [{"patientID": 1, "fullName": "Ann  Lee", "providerID": "P1"}, {"patientID": 2, "fullName": "Bob Ray", "providerID": "P2"}]
+    }
+    for render in (render_income_providers_table, render_income_providers_simple_table):
+        compact = render(data, compact=True)
+        assert visible_text(compact) == visible_text(render(data))
+        # Values are inserted after minifying, so their whitespace is kept
+        assert "Ann  Lee" in compact
+
+def test_minify_only_touches_markup_whitespace():
+    assert minify_html("<div>\n    <p>a  b</p>\n</div>\n") == "<div><p>a b</p></div>"
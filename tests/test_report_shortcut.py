@@ -0,0 +1,82 @@
+"""Local date resolution and the no-LLM report shortcut."""
+
+from datetime import date
+
+import pytest
+
+from chatbot.intent_classifier import ProfessionalIntentClassifier
+from mcp_server.dates import find_relative_dates, resolve_relative
+
+TODAY = date(2026, 10, 17)
+
+@pytest.fixture(scope="module")
+def classifier():
+    return ProfessionalIntentClassifier()
+
+@pytest.mark.parametrize("message", [
+    "capitation report for last quarter",
+    "Capitation report last quarter",
+    "print provider report since March",
+    "please generate the provider capitation report for the last 3 months",
+    "show me the capitation report for March 2024",
+])
+def test_plain_report_requests_take_the_shortcut(classifier, message):
+    result = classifier.classify_report_request(message)
+    assert result is not None
+    expected = resolve_relative(message)
+    assert (result.parameters["date_from"], result.parameters["date_to"]) == expected.iso()
+    assert "provider_name" not in result.parameters
+
+def test_print_flag_is_kept(classifier):
+    result = classifier.classify_report_request("print provider report since March")
+    assert result.parameters["print_report"] is True
+
+@pytest.mark.parametrize("message", [
+    "practice 7 capitation report last quarter",
+    "capitation report last quarter practices 1,2,3",
+    "how do I read the capitation report for March 2024?",
+    "compare last quarter vs this quarter",
+    "capitation report last quarter vs this quarter",
+    "capitation report for Dr Smith last quarter",
+    "capitation report last quarter sorted by amount",
+    "capitation report last quarter location 3",
+    "capitation report",
+])
+def test_other_requests_go_to_the_llm(classifier, message):
+    assert classifier.classify_report_request(message) is None
+
+def test_expressions_are_taken_in_text_order():
+    ranges = find_relative_dates("compare last quarter vs this quarter", TODAY)
+    assert [r.label for r in ranges] == ["last quarter", "this quarter"]
+    assert ranges[0].iso() == ("2026-07-01", "2026-09-30")
+    assert ranges[1].iso() == ("2026-10-01", "2026-10-17")
+
+    ranges = find_relative_dates("this quarter compared with last quarter", TODAY)
+    assert [r.label for r in ranges] == ["this quarter", "last quarter"]
+    assert resolve_relative("this quarter compared with last quarter", TODAY).label == "this quarter"
+
+def test_overlapping_expressions_keep_priority():
+    ranges = find_relative_dates("report nov 2024 - feb 2025", TODAY)
+    assert len(ranges) == 1
+    assert ranges[0].iso() == ("2024-11-01", "2025-02-28")
+
+    ranges = find_relative_dates("report for the last 3 months", TODAY)
+    assert [r.label for r in ranges] == ["last months"]
+
+@pytest.mark.parametrize("message", [
+    "capitation report for May Chen",
+    "show the report for Jan Smith",
+    "report of Dr Patel since May Chen joined",
+])
+def test_provider_names_are_not_read_as_months(message):
+    assert find_relative_dates(message, TODAY) == []
+
+@pytest.mark.parametrize("message, expected", [
+    ("capitation report for May", ("2026-05-01", "2026-05-31")),
+    ("capitation report for May 2025 for May Chen", ("2025-05-01", "2025-05-31")),
+    ("capitation report for Jan, Dr Smith", ("2026-01-01", "2026-01-31")),
+    ("Report since March for Jan Smith", ("2026-03-01", "2026-10-17")),
+])
+def test_months_next_to_names_still_resolve(message, expected):
+    ranges = find_relative_dates(message, TODAY)
+    assert [r.iso() for r in ranges] == [expected]
@@ -0,0 +1,40 @@
+"""Columnar capitation report table."""
+
+from mcp_server.report_table import CapitationTable
+
+ROWS = [
+    {"providerName": "Bob Ray", "ageRange": "0-4", "capitationAmount": 10.5, "quantity": 2, "totalAmount": 21.0},
+    {"providerName": "Ann Lee", "ageRange": "0-4", "capitationAmount": 10.5, "quantity": 1, "totalAmount": 10.5},
+    {"providerName": "Bob Ray", "ageRange": "65+", "capitationAmount": 30.0, "quantity": None, "totalAmount": None},
+    {"providerName": "Ann Lee", "ageRange": "5-14", "capitationAmount": 8.0, "quantity": 4, "totalAmount": 32.0},
+    {"ageRange": "15-24", "capitationAmount": 6.0, "quantity": 1, "totalAmount": 6.0}
+]
+
+def test_rows_group_by_provider_in_first_seen_order():
+    table = CapitationTable(ROWS)
+    groups = [(view.name, [row[0] for row in view.rows()]) for view in table.group_by_provider()]
+    assert groups == [("Bob Ray", ["0-4", "65+"]), ("Ann Lee", ["0-4", "5-14"]), ("Unknown", ["15-24"])]
+
+def test_provider_totals_treat_missing_values_as_zero():
+    table = CapitationTable(ROWS)
+    bob = table.provider("Bob Ray")
+    assert (bob.total_quantity, bob.total_amount) == (2, 21.0)
+    assert table.provider("Ann Lee").total_amount == 42.5
+    assert table.provider("Nobody") is None
+
+def test_round_trip_keeps_upstream_order():
+    table = CapitationTable(ROWS)
+    rows = table.to_rows()
+    assert len(table) == len(rows) == len(ROWS)
+    assert [row["providerName"] for row in rows] == ["Bob Ray", "Ann Lee", "Bob Ray", "Ann Lee", "Unknown"]
+    assert rows[2]["quantity"] == 0 and rows[2]["totalAmount"] == 0.0
+
+def test_fractional_quantities_are_kept():
+    table = CapitationTable([{"providerName": "A", "ageRange": "0-4", "quantity": 1.5, "totalAmount": 3}])
+    assert table.provider("A").total_quantity == 1.5
+
+def test_table_is_built_once_per_report():
+    report = {"data": {"results": list(ROWS)}}
+    assert CapitationTable.for_report(report) is CapitationTable.for_report(report)
+    assert CapitationTable.for_report({"data": {"results": list(ROWS)}}) is not CapitationTable.for_report(report)
+    assert CapitationTable.for_report({"data": {"results": []}}) is None
@@ -0,0 +1,45 @@
+"""Circuit breaker probe slots survive cancelled calls."""
+
+import asyncio
+
+from mcp_server.resilience import CircuitBreaker
+from mcp_server.tools import indici_tools
+
+def open_then_half_open(breaker):
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure("boom")
+    assert breaker.state == CircuitBreaker.OPEN
+    breaker.recovery_timeout = 0
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+def test_release_frees_the_half_open_slot():
+    breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout=30)
+    open_then_half_open(breaker)
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.release()
+    assert breaker.allow()
+
+def test_cancelled_probe_does_not_wedge_the_breaker(monkeypatch):
+    endpoint = "/api/test/cancelled-probe"
+    breaker = indici_tools.circuit_breakers.get(endpoint)
+    open_then_half_open(breaker)
+
+    async def send_forever(*args, **kwargs):
+        await asyncio.sleep(3600)
+
+    monkeypatch.setattr(indici_tools, "_send_request", send_forever)
+    monkeypatch.setattr(indici_tools, "_hedge_delay", lambda *args: None)
+
+    async def cancel_probe():
+        task = asyncio.ensure_future(indici_tools._make_request("GET", endpoint))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    asyncio.run(cancel_probe())
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow()
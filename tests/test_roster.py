@@ -0,0 +1,101 @@
+"""Stale-while-revalidate provider roster cache."""
+
+import asyncio
+
+from mcp_server.roster import ProviderRoster, ProviderRosterCache
+
+def roster_response(*names):
+    results = [{"patientID": index, "fullName": name, "providerID": f"P{index}"} for index, name in enumerate(names)]
+    return {"success": True, "data": {"totalRecords": len(results), "results": results}}
+
+class Loader:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return self.responses[min(self.calls, len(self.responses)) - 1]
+
+def age(cache, seconds, key=(1, 1)):
+    cache._rosters[key].fetched_at -= seconds
+
+def test_fresh_roster_is_served_without_fetching():
+    cache = ProviderRosterCache(fresh_ttl=60, max_age=600)
+    loader = Loader(roster_response("Ann Lee"))
+
+    async def main():
+        first = await cache.get(1, 1, loader)
+        second = await cache.get(1, 1, loader)
+        return first, second
+
+    first, second = asyncio.run(main())
+    assert first is second
+    assert loader.calls == 1
+    assert cache.peek(1, 1).names == ["Ann Lee"]
+
+def test_stale_roster_is_served_while_one_refresh_runs():
+    cache = ProviderRosterCache(fresh_ttl=60, max_age=600)
+    loader = Loader(roster_response("Ann Lee"), roster_response("Ann Lee", "Bob Ray"))
+
+    async def main():
+        await cache.get(1, 1, loader)
+        age(cache, 120)
+        stale = [await cache.get(1, 1, loader) for _ in range(3)]
+        await asyncio.sleep(0.05)
+        return stale
+
+    stale = asyncio.run(main())
+    assert all(len(response["data"]["results"]) == 1 for response in stale)
+    assert loader.calls == 2
+    assert cache.peek(1, 1).names == ["Ann Lee", "Bob Ray"]
+    stats = cache.get_stats()
+    assert (stats["stale_hits"], stats["background_refreshes"]) == (3, 1)
+
+def test_failed_refresh_keeps_the_old_roster():
+    cache = ProviderRosterCache(fresh_ttl=60, max_age=600)
+    loader = Loader(roster_response("Ann Lee"), {"success": False, "error": "HTTP 503"})
+
+    async def main():
+        await cache.get(1, 1, loader)
+        age(cache, 120)
+        await cache.get(1, 1, loader)
+        await asyncio.sleep(0.05)
+
+    asyncio.run(main())
+    assert cache.peek(1, 1).names == ["Ann Lee"]
+    assert cache.get_stats()["refresh_failures"] == 1
+
+def test_expired_roster_is_fetched_before_returning():
+    cache = ProviderRosterCache(fresh_ttl=60, max_age=600)
+    loader = Loader(roster_response("Ann Lee"), roster_response("Bob Ray"))
+
+    async def main():
+        await cache.get(1, 1, loader)
+        age(cache, 700)
+        return await cache.get(1, 1, loader)
+
+    response = asyncio.run(main())
+    assert response["data"]["results"][0]["fullName"] == "Bob Ray"
+    assert cache.get_stats()["misses"] == 2
+
+def test_invalidated_roster_is_not_resurrected_by_an_inflight_fetch():
+    cache = ProviderRosterCache(fresh_ttl=60, max_age=600)
+    loader = Loader(roster_response("Ann Lee"))
+
+    async def main():
+        await cache.get(1, 1, loader)
+        age(cache, 700)
+        fetch = asyncio.ensure_future(cache.get(1, 1, loader))
+        await asyncio.sleep(0)
+        cache.invalidate(practice_id=1)
+        await fetch
+
+    asyncio.run(main())
+    assert cache.peek(1, 1) is None
+
+def test_roster_from_response():
+    roster = ProviderRoster.from_response(1, 2, roster_response("Ann Lee"))
+    assert roster.providers[0].provider_id == "P0"
+    assert roster.names == ["Ann Lee"]
@@ -0,0 +1,92 @@
+"""Upstream request scheduler: caps, priorities and fairness."""
+
+import asyncio
+
+import pytest
+
+from mcp_server.scheduler import (
+    BACKGROUND,
+    INTERACTIVE,
+    PREFETCH,
+    SchedulerBusy,
+    UpstreamScheduler,
+    current_client,
+    current_priority,
+    upstream_context
+)
+
+def run_requests(scheduler, requests, duration=0.02):
+    """Run (practice, client, priority) requests concurrently; returns the admission order and peak counts."""
+    order = []
+    running = {"total": 0, "peak": 0, "by_practice": {}, "peak_by_practice": {}}
+
+    async def request(index, practice, client, priority):
+        async def work():
+            order.append(index)
+            running["total"] += 1
+            running["peak"] = max(running["peak"], running["total"])
+            count = running["by_practice"][practice] = running["by_practice"].get(practice, 0) + 1
+            running["peak_by_practice"][practice] = max(running["peak_by_practice"].get(practice, 0), count)
+            await asyncio.sleep(duration)
+            running["total"] -= 1
+            running["by_practice"][practice] -= 1
+        await scheduler.run(work(), practice, client, priority)
+
+    async def main():
+        await asyncio.gather(*(request(i, *spec) for i, spec in enumerate(requests)))
+
+    asyncio.run(main())
+    return order, running
+
+def test_global_and_per_practice_caps_hold():
+    scheduler = UpstreamScheduler(max_concurrency=3, per_practice_concurrency=2)
+    requests = [(1 + i % 2, "user", INTERACTIVE) for i in range(10)]
+    _, running = run_requests(scheduler, requests)
+    assert running["peak"] == 3
+    assert max(running["peak_by_practice"].values()) == 2
+    assert scheduler.get_stats()["in_flight"] == 0
+
+def test_interactive_requests_jump_the_background_queue():
+    scheduler = UpstreamScheduler(max_concurrency=1, background_concurrency=1)
+    requests = [(1, "warmer", PREFETCH)] * 3 + [(1, "user", BACKGROUND), (1, "user", INTERACTIVE)]
+    order, _ = run_requests(scheduler, requests)
+    # The first prefetch request got the free slot; everything interactive goes next
+    assert order[:3] == [0, 4, 3]
+
+def test_background_work_is_capped():
+    scheduler = UpstreamScheduler(max_concurrency=4, background_concurrency=1)
+    _, running = run_requests(scheduler, [(i, "warmer", PREFETCH) for i in range(4)])
+    assert running["peak"] == 1
+
+def test_clients_are_served_round_robin():
+    scheduler = UpstreamScheduler(max_concurrency=1, per_practice_concurrency=1)
+    requests = [(1, "batch", INTERACTIVE)] * 4 + [(1, "alice", INTERACTIVE), (1, "bob", INTERACTIVE)]
+    order, _ = run_requests(scheduler, requests)
+    # After the first batch request, alice and bob don't wait behind the rest of the batch
+    assert order.index(4) < 3 and order.index(5) < 4
+
+def test_queue_timeout_raises_busy_and_frees_nothing():
+    scheduler = UpstreamScheduler(max_concurrency=1, queue_timeout=0.02)
+
+    async def main():
+        await scheduler.acquire(1, "a")
+        with pytest.raises(SchedulerBusy):
+            await scheduler.acquire(1, "b")
+        scheduler.release(1)
+
+    asyncio.run(main())
+    stats = scheduler.get_stats()
+    assert (stats["in_flight"], stats["queue_depth"], stats["queue_timeouts"]) == (0, 0, 1)
+
+def test_context_tags_requests_and_is_inherited_by_tasks():
+    async def read():
+        return current_priority(), current_client()
+
+    async def main():
+        with upstream_context(priority=PREFETCH, client="cache-warmer"):
+            inside = await asyncio.ensure_future(read())
+        return inside, await read()
+
+    inside, outside = asyncio.run(main())
+    assert inside == (PREFETCH, "cache-warmer")
+    assert outside == (INTERACTIVE, None)
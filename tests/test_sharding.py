@@ -0,0 +1,100 @@
+"""Merging month shards gives the same report as one unsharded call over the range."""
+
+import pytest
+
+from mcp_server.sharding import merge_capitation_reports, parse_sort, sort_capitation_rows
+
+AGE_RANGES = ["00-04", "05-14", "15-24", "65-74", "75+"]
+
+def row(provider, age, rate, quantity):
+    return {
+        "providerName": provider,
+        "ageRange": age,
+        "capitationAmount": rate,
+        "quantity": quantity,
+        "totalAmount": round(rate * quantity, 2)
+    }
+
+RATES = {"00-04": 10.0, "05-14": 12.5, "15-24": 20.0, "65-74": 40.0, "75+": 55.0}
+
+# Patient register: (provider, age range, first month, last month enrolled).
+# "aaron lee" and the 75+ range only join in February; nobody leaves.
+PATIENTS = (
+    [("Dr Zoe King", "00-04", 1, 3)] * 5 + [("Dr Zoe King", "00-04", 2, 3)] * 2 + [("Dr Zoe King", "05-14", 1, 3)] * 3
+    + [("Dr Mia Chen", "15-24", 1, 3)] * 7 + [("Dr Mia Chen", "15-24", 2, 3)] + [("Dr Mia Chen", "75+", 2, 3)] * 4
+    + [("Dr Mia Chen", "00-04", 3, 3)] * 9 + [("aaron lee", "65-74", 2, 3)] + [("aaron lee", "65-74", 3, 3)] * 2
+)
+
+def upstream_report(first_month, last_month, patients=PATIENTS, sort_by=None):
+    """What the API returns for months first..last of 2025: each enrolled patient counted once."""
+    counts = {}
+    for provider, age, joined, left in patients:
+        if joined <= last_month and left >= first_month:
+            counts[(provider, age)] = counts.get((provider, age), 0) + 1
+    rows = [row(provider, age, RATES[age], quantity) for (provider, age), quantity in counts.items()]
+    field, descending = parse_sort(sort_by)
+    rows.sort(key=lambda r: (r["providerName"].casefold(), AGE_RANGES.index(r["ageRange"])))
+    if field == "providerName":
+        rows.sort(key=lambda r: r["providerName"].casefold(), reverse=descending)
+    else:
+        rows.sort(key=lambda r: r[field], reverse=descending)
+    last_day = {1: 31, 2: 28, 3: 31}[last_month]
+    return response(rows, f"2025-{first_month:02d}-01T00:00:00", f"2025-{last_month:02d}-{last_day}T00:00:00")
+
+def response(rows, date_from, date_to):
+    return {"success": True, "data": {"totalRecords": len(rows), "providerName": "", "dateFrom": date_from, "dateTo": date_to, "results": rows}}
+
+@pytest.mark.parametrize("sort_by", [None, "providerName", "name desc", "totalAmount desc", "-quantity", "quantity asc"])
+def test_merged_rows_match_the_single_call(sort_by):
+    shards = [upstream_report(month, month, sort_by=sort_by) for month in (1, 2, 3)]
+    merged = merge_capitation_reports(shards, *parse_sort(sort_by))
+
+    expected = upstream_report(1, 3, sort_by=sort_by)["data"]
+    assert merged["data"]["results"] == expected["results"]
+    assert merged["data"]["totalRecords"] == expected["totalRecords"]
+    assert merged["data"]["dateFrom"] == "2025-01-01T00:00:00"
+    assert merged["data"]["dateTo"] == "2025-03-31T00:00:00"
+
+def test_patients_are_not_counted_once_per_month():
+    merged = merge_capitation_reports([upstream_report(month, month) for month in (1, 2, 3)])
+    rows = {(r["providerName"], r["ageRange"]): r for r in merged["data"]["results"]}
+    assert rows[("Dr Zoe King", "05-14")]["quantity"] == 3
+    assert rows[("Dr Zoe King", "05-14")]["totalAmount"] == 37.5
+
+def test_leavers_give_the_peak_monthly_register():
+    patients = [("Dr Zoe King", "00-04", 1, 1)] * 4 + [("Dr Zoe King", "00-04", 1, 2)] * 2 + [("Dr Zoe King", "00-04", 2, 2)]
+    merged = merge_capitation_reports([upstream_report(month, month, patients) for month in (1, 2)])
+    assert merged["data"]["results"][0]["quantity"] == 6
+    assert upstream_report(1, 2, patients)["data"]["results"][0]["quantity"] == 7
+
+def test_null_values_are_read_as_zero():
+    empty = {"providerName": "Dr Zoe King", "ageRange": "00-04", "capitationAmount": None, "quantity": None, "totalAmount": None}
+    merged = merge_capitation_reports([
+        response([empty], "", ""),
+        response([dict(empty)], "", ""),
+        response([row("Dr Mia Chen", "00-04", 10.0, 1), dict(empty, providerName="Dr Mia Chen")], "", ""),
+    ])
+    rows = {r["providerName"]: r for r in merged["data"]["results"]}
+    assert (rows["Dr Zoe King"]["quantity"], rows["Dr Zoe King"]["totalAmount"], rows["Dr Zoe King"]["capitationAmount"]) == (0, 0, 0)
+    assert rows["Dr Mia Chen"]["quantity"] == 1
+
+def test_provider_first_seen_in_a_later_month_is_not_last():
+    merged = merge_capitation_reports([upstream_report(1, 1), upstream_report(2, 2)])
+    assert [r["providerName"] for r in merged["data"]["results"]][0] == "aaron lee"
+
+@pytest.mark.parametrize("sort_by, expected", [
+    (None, ("providerName", False)),
+    ("", ("providerName", False)),
+    ("unknownField", ("providerName", False)),
+    ("totalAmount", ("totalAmount", False)),
+    ("totalAmount DESC", ("totalAmount", True)),
+    ("-quantity", ("quantity", True)),
+    ("age range", ("ageRange", False)),
+])
+def test_parse_sort(sort_by, expected):
+    assert parse_sort(sort_by) == expected
+
+def test_age_ranges_sort_numerically():
+    rows = [row("A", age, 1.0, 1) for age in ["75+", "05-14", "15-24", "00-04"]]
+    sort_capitation_rows(rows, "ageRange")
+    assert [r["ageRange"] for r in rows] == ["00-04", "05-14", "15-24", "75+"]
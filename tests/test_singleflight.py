@@ -0,0 +1,95 @@
+"""Single-flight coalescing across event loops and threads."""
+
+import asyncio
+import threading
+
+import pytest
+
+from mcp_server.singleflight import SingleFlight
+
+def test_concurrent_calls_on_different_loops_share_one_execution():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    async def work():
+        calls.append(1)
+        started.set()
+        while not release.is_set():
+            await asyncio.sleep(0.005)
+        return {"rows": 3}
+
+    results = []
+
+    def run_on_own_loop():
+        results.append(asyncio.run(flight.do("key", work)))
+
+    leader = threading.Thread(target=run_on_own_loop)
+    leader.start()
+    assert started.wait(2)
+    waiters = [threading.Thread(target=run_on_own_loop) for _ in range(3)]
+    for thread in waiters:
+        thread.start()
+    while flight.get_stats()["coalesced"] < 3:
+        threading.Event().wait(0.005)
+    release.set()
+    for thread in [leader, *waiters]:
+        thread.join(2)
+
+    assert calls == [1]
+    assert results == [{"rows": 3}] * 4
+    assert flight.get_stats() == {"in_flight": 0, "executed": 1, "coalesced": 3}
+
+def test_waiters_get_the_leaders_exception():
+    flight = SingleFlight()
+
+    async def failing():
+        await asyncio.sleep(0.02)
+        raise ValueError("upstream broke")
+
+    async def main():
+        return await asyncio.gather(flight.do("k", failing), flight.do("k", failing), return_exceptions=True)
+
+    outcomes = asyncio.run(main())
+    assert all(isinstance(outcome, ValueError) for outcome in outcomes)
+    assert flight.get_stats()["executed"] == 1
+
+def test_a_waiter_takes_over_from_a_cancelled_leader():
+    flight = SingleFlight()
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return len(calls)
+
+    async def main():
+        leader = asyncio.ensure_future(flight.do("k", work))
+        await asyncio.sleep(0.01)
+        waiter = asyncio.ensure_future(flight.do("k", work))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await waiter
+
+    assert asyncio.run(main()) == 2
+    assert len(calls) == 2
+
+def test_a_cancelled_waiter_does_not_affect_the_others():
+    flight = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def main():
+        leader = asyncio.ensure_future(flight.do("k", work))
+        await asyncio.sleep(0.01)
+        waiter = asyncio.ensure_future(flight.do("k", work))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        return await leader
+
+    assert asyncio.run(main()) == "done"
@@ -0,0 +1,67 @@
+"""Structured JSON tool output."""
+
+import json
+import re
+
+import pytest
+
+from mcp_server.structured import capitation_report_payload, embed_payload, income_providers_payload
+
+ROWS = [
+    {"providerName": "Bob Ray", "ageRange": "0-4", "capitationAmount": 10.5, "quantity": 2, "totalAmount": 21.0},
+    {"providerName": "Ann Lee", "ageRange": "0-4", "capitationAmount": 10.5, "quantity": 1, "totalAmount": 10.5},
+    {"providerName": "Bob Ray", "ageRange": "65+", "capitationAmount": 30.0, "quantity": 3, "totalAmount": 90.0}
+]
+
+def report(rows=ROWS):
+    return {
+        "success": True,
+        "data": {"totalRecords": len(rows), "providerName": "", "dateFrom": "2024-01-01", "dateTo": "2024-03-31", "results": list(rows)}
+    }
+
+def test_rows_are_grouped_with_interned_age_ranges():
+    payload = capitation_report_payload(report())
+    assert payload["ageRanges"] == ["0-4", "65+"]
+    bob, ann = payload["providers"]
+    assert bob["name"] == "Bob Ray" and ann["name"] == "Ann Lee"
+    assert bob["rows"] == [[0, 10.5, 2, 21.0], [1, 30.0, 3, 90.0]]
+    # Each positional row expands back to the upstream row
+    expanded = [dict(zip(payload["rowFields"], [payload["ageRanges"][row[0]], *row[1:]])) for row in bob["rows"]]
+    assert expanded[1] == {"ageRange": "65+", "capitationAmount": 30.0, "quantity": 3, "totalAmount": 90.0}
+
+def test_totals_and_shares():
+    payload = capitation_report_payload(report())
+    bob, ann = payload["providers"]
+    assert (bob["totalQuantity"], bob["totalAmount"], ann["totalAmount"]) == (5, 111.0, 10.5)
+    assert bob["share"] + ann["share"] == pytest.approx(1.0, abs=1e-4)
+    assert payload["totals"]["quantity"] == 6
+    assert payload["totals"]["amount"] == 121.5
+    assert payload["totals"]["ageRanges"] == [{"quantity": 3, "amount": 31.5}, {"quantity": 3, "amount": 90.0}]
+    assert payload["meta"]["dateTo"] == "2024-03-31"
+
+def test_empty_and_failed_reports():
+    empty = capitation_report_payload(report(rows=[]))
+    assert empty["success"] is True and empty["providers"] == []
+    failed = capitation_report_payload({"success": False, "error": "HTTP 503"})
+    assert failed == {"kind": "capitation_report", "success": False, "error": "HTTP 503"}
+
+def test_income_providers_payload():
+    payload = income_providers_payload({"totalRecords": 1, "results": [{"fullName": "Ann Lee"}]})
+    assert payload == {"kind": "income_providers", "success": True, "totalRecords": 1, "providers": ["Ann Lee"]}
+    assert income_providers_payload({})["success"] is False
+
+def test_embedded_payload_cannot_close_its_script_element():
+    payload = income_providers_payload({"totalRecords": 1, "results": [{"fullName": "</script><b>x</b>"}]})
+    html = embed_payload(payload)
+    body = re.search(r'<script type="application/json">(.*)</script></div>$', html).group(1)
+    assert "</" not in body
+    assert json.loads(body) == payload
+
+def test_cached_payload_keeps_the_suggestions_of_each_request():
+    from mcp_server.tools import indici_tools
+
+    plain = report()
+    hinted = {**plain, "providerCandidates": {"Bobb": [{"name": "Bob Ray", "score": 0.9}]}}
+    assert indici_tools.format_report_data(plain)["meta"]["providerSuggestions"] == []
+    assert indici_tools.format_report_data(hinted)["meta"]["providerSuggestions"] == ["Bob Ray"]
+    assert indici_tools.format_report_data(plain)["meta"]["providerSuggestions"] == []
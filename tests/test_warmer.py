@@ -0,0 +1,101 @@
+"""Cron schedule and cache warming runs."""
+
+import asyncio
+from datetime import date, datetime
+
+import pytest
+
+from mcp_server import warmer as warmer_module
+from mcp_server.dates import resolve_relative
+from mcp_server.warmer import CacheWarmer, CronSchedule, warm_ranges
+
+@pytest.mark.parametrize("expression, moment, expected", [
+    # Weekdays at 06:00: Friday evening runs on Monday
+    ("0 6 * * 1-5", datetime(2026, 10, 16, 18, 30), datetime(2026, 10, 19, 6, 0)),
+    ("0 6 * * 1-5", datetime(2026, 10, 19, 5, 59, 30), datetime(2026, 10, 19, 6, 0)),
+    # The current minute never matches again
+    ("0 6 * * 1-5", datetime(2026, 10, 19, 6, 0), datetime(2026, 10, 20, 6, 0)),
+    ("*/15 * * * *", datetime(2026, 10, 17, 9, 14), datetime(2026, 10, 17, 9, 15)),
+    ("0-30/10 8 * * *", datetime(2026, 10, 17, 8, 21), datetime(2026, 10, 17, 8, 30)),
+    ("30 23 31 12 *", datetime(2026, 10, 17), datetime(2026, 12, 31, 23, 30)),
+    ("0 0 29 2 *", datetime(2026, 3, 1), datetime(2028, 2, 29, 0, 0)),
+    # Sunday as 7, and day-of-month OR day-of-week when both are restricted
+    ("0 12 * * 7", datetime(2026, 10, 17, 13, 0), datetime(2026, 10, 18, 12, 0)),
+    ("0 0 1 * 1", datetime(2026, 10, 17), datetime(2026, 10, 19, 0, 0)),
+])
+def test_next_after(expression, moment, expected):
+    assert CronSchedule(expression).next_after(moment) == expected
+
+@pytest.mark.parametrize("expression", ["0 6 * *", "60 6 * * *", "0 6 0 * *", "0 6 * * 8", "0 6 30 2 *"])
+def test_invalid_or_impossible_schedules(expression):
+    with pytest.raises(ValueError):
+        CronSchedule(expression).next_after(datetime(2026, 10, 17))
+
+@pytest.fixture
+def tools(monkeypatch):
+    calls = []
+
+    async def income_providers(practice_id, practice_location_id):
+        calls.append(("roster", practice_id, practice_location_id))
+        return {"success": True}
+
+    async def report(**kwargs):
+        calls.append(("report", kwargs["practice_id"], kwargs["date_from"], kwargs["date_to"], kwargs["cache_live_ttl"]))
+        return {"success": kwargs["practice_id"] != 9}
+
+    monkeypatch.setattr(warmer_module.indici_tools, "get_all_income_providers", income_providers)
+    monkeypatch.setattr(warmer_module.indici_tools, "get_provider_capitation_report", report)
+    monkeypatch.setattr(warmer_module.indici_tools, "get_recent_practices", lambda window: [(9, 1), (1, 2)])
+    monkeypatch.setattr(warmer_module.health_probe, "is_healthy", lambda: True)
+    return calls
+
+def test_warm_loads_roster_month_and_year_for_each_practice(tools):
+    warmer = CacheWarmer(practices=[{"practice_id": 1, "practice_location_id": 2}], live_ttl=600)
+    summary = asyncio.run(warmer.warm())
+
+    today = date.today()
+    assert [call[1] for call in tools if call[0] == "roster"] == [1, 9]
+    assert ("report", 1, today.replace(day=1).isoformat(), today.isoformat(), 600) in tools
+    assert ("report", 1, date(today.year, 1, 1).isoformat(), today.isoformat(), 600) in tools
+    ranges = len(warm_ranges(today))
+    assert (summary["practices"], summary["warmed"], summary["failed"]) == (2, ranges + 2, ranges)
+    assert warmer.get_stats()["runs"] == 1
+
+def test_warm_pauses_while_upstream_is_unhealthy(tools, monkeypatch):
+    monkeypatch.setattr(warmer_module.health_probe, "is_healthy", lambda: False)
+    summary = asyncio.run(CacheWarmer(practices=[{"practice_id": 1}]).warm())
+    assert summary["paused"] and tools == []
+
+def iso_ranges(today):
+    return {(date_from.isoformat(), date_to.isoformat()) for date_from, date_to in warm_ranges(today)}
+
+def test_warmed_ranges_are_the_ones_the_chat_requests():
+    today = date.today()
+    warmed = iso_ranges(today)
+    assert resolve_relative("this month", today).iso() in warmed
+    assert resolve_relative("this year", today).iso() in warmed
+
+    from chatbot.intent_classifier import ProfessionalIntentClassifier
+    classifier = ProfessionalIntentClassifier()
+    assert (classifier._get_current_month_start(), classifier._get_current_date()) in warmed
+    assert (classifier._get_current_year_start(), classifier._get_current_date()) in warmed
+
+    from chatbot.openrouter_client import OpenRouterChatbot
+    for dates in (OpenRouterChatbot._get_current_month_dates(None), OpenRouterChatbot._get_current_year_dates(None)):
+        assert (dates["date_from"], dates["date_to"]) in warmed
+
+def test_groq_ranges_are_warmed():
+    groq_client = pytest.importorskip("chatbot.groq_client")
+    warmed = iso_ranges(date.today())
+    for method in (groq_client.GroqChatbot._get_current_month_dates, groq_client.GroqChatbot._get_current_year_dates):
+        dates = method(None)
+        assert (dates["date_from"], dates["date_to"]) in warmed
+
+@pytest.mark.parametrize("today, expected", [
+    (date(2026, 10, 17), 4),
+    # Month-to-date and the calendar month coincide on the last day
+    (date(2026, 10, 31), 3),
+    (date(2026, 12, 31), 2),
+])
+def test_warm_ranges_are_distinct(today, expected):
+    assert len(warm_ranges(today)) == expected
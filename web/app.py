@@ -1,10 +1,11 @@
 """Flask web application for indici MCP Chatbot."""
 
 import asyncio
+import atexit
 import logging
 import json
 import traceback
-from flask import Flask, render_template, request, jsonify, make_response, session, g, redirect, url_for
+from flask import Flask, Response, render_template, request, jsonify, make_response, session, g, redirect, url_for
 from flask_socketio import SocketIO, emit
 from datetime import datetime, timedelta
 try:
@@ -22,7 +23,14 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from mcp_server.config import config
 from chatbot.chat_handler import chat_handler
 from chatbot.mcp_client import mcp_client
-from web.auth import auth_manager, require_teams_auth, get_current_user, get_teams_token
+from mcp_server.http_client import http_client
+from mcp_server.health import health_probe
+from mcp_server.warmer import cache_warmer
+from mcp_server.tools import indici_tools
+from mcp_server.scheduler import INTERACTIVE, upstream_context
+from mcp_server.structured import to_json
+from mcp_server.export import EXPORT_FORMATS, capitation_report_sheet, income_providers_sheet, iter_export
+from web.auth import auth_manager, require_teams_auth, get_current_user, get_teams_token, get_username
 
 # Configure logging for production (Render.com compatible)
 def setup_production_logging():
@@ -133,6 +141,12 @@ def init_mcp_client():
 # Initialize MCP client on startup
 init_mcp_client()
 
+# Shared upstream connection pool lives for the lifetime of the app
+http_client.start()
+atexit.register(http_client.shutdown)
+health_probe.start()
+cache_warmer.start()
+
 @app.route('/')
 def index():
     """Main chat interface."""
@@ -340,10 +354,7 @@ def verify_auth():
                         user_payload.get('preferred_username', '').split('@')[0] or
                         'User').strip()
 
-            user_email = (user_payload.get('preferred_username') or
-                         user_payload.get('email') or
-                         user_payload.get('upn') or
-                         user_payload.get('unique_name') or '')
+            user_email = get_username(user_payload)
 
             # Log available fields for debugging
             logger.info(f"[AUTH] Available token fields: {list(user_payload.keys())}")
@@ -592,7 +603,7 @@ def token_exchange():
 
         # Call AD login endpoint to get user profile and practice information
         logger.info("🔄 Step 4: Calling AD login endpoint...")
-        username = user_info.get('userPrincipalName') or user_info.get('mail')
+        username = get_username(user_info)
         if username:
             import asyncio
             loop = asyncio.new_event_loop()
@@ -684,8 +695,11 @@ def get_user():
 
 @app.route('/auth/logout', methods=['POST'])
 def auth_logout():
-    """Logout user and clear session."""
+    """Logout user, clear session and drop the user's cached AD login."""
     try:
+        username = get_username(session.get('user_info'))
+        if username:
+            auth_manager.forget_ad_login(username)
         session.clear()
         return jsonify({
             "success": True,
@@ -756,6 +770,215 @@ def get_metrics():
         logger.error(f"Error getting metrics: {e}")
         return jsonify({"error": str(e)}), 500
 
+@app.route('/api/upstream-stats')
+def get_upstream_stats():
+    """Get indici API upstream statistics (connection pool, etc.)."""
+    try:
+        return jsonify({**indici_tools.get_upstream_stats(), "cache_warmer": cache_warmer.get_stats()})
+    except Exception as e:
+        logger.error(f"Error getting upstream stats: {e}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/cache-warmer/run', methods=['POST'])
+def run_cache_warmer():
+    """Start a cache warming run now, outside the schedule."""
+    try:
+        http_client.spawn(cache_warmer.warm())
+        return jsonify({"success": True, "message": "Cache warming run started"}), 202
+    except Exception as e:
+        logger.error(f"Error starting cache warming run: {e}")
+        return jsonify({"error": str(e), "success": False}), 500
+
+@app.route('/api/provider-roster/invalidate', methods=['POST'])
+def invalidate_provider_roster():
+    """Drop cached income provider rosters (optionally for one practice/location)."""
+    try:
+        data = request.get_json(silent=True) or {}
+        removed = indici_tools.invalidate_provider_roster(
+            practice_id=data.get('practice_id'),
+            practice_location_id=data.get('practice_location_id')
+        )
+        return jsonify({"success": True, "removed": removed})
+    except Exception as e:
+        logger.error(f"Error invalidating provider roster: {e}")
+        return jsonify({"error": str(e), "success": False}), 500
+
+@app.route('/api/aggregates/invalidate', methods=['POST'])
+def invalidate_aggregate_month():
+    """Drop a stored month of capitation aggregates after upstream corrections."""
+    try:
+        data = request.get_json(silent=True) or {}
+        practice_id = data.get('practice_id')
+        month = data.get('month')
+
+        if practice_id is None or not month:
+            return jsonify({"error": "practice_id and month (YYYY-MM) are required", "success": False}), 400
+
+        try:
+            practice_id = int(practice_id)
+            # Stored months are keyed as zero-padded YYYY-MM
+            month = datetime.strptime(str(month), "%Y-%m").strftime("%Y-%m")
+        except (TypeError, ValueError):
+            return jsonify({"error": "practice_id must be an integer and month must be YYYY-MM", "success": False}), 400
+
+        return jsonify(indici_tools.invalidate_aggregate_month(practice_id, month))
+    except Exception as e:
+        logger.error(f"Error invalidating aggregate month: {e}")
+        return jsonify({"error": str(e), "success": False}), 500
+
+def _not_modified(etag, weak=False):
+    """Return a 304 response if the request's If-None-Match matches etag, else None."""
+    # If-None-Match always uses weak comparison, so W/"x" also matches "x"
+    if request.if_none_match.contains_weak(etag):
+        response = make_response('', 304)
+        response.set_etag(etag, weak=weak)
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
+    return None
+
+def _fetch_report_for_request(report):
+    """
+    Fetch a capitation report or income providers list from the query parameters.
+
+    Query parameters mirror the tool arguments (practice_id, date_from, date_to,
+    provider_name, location_id, practice_location_id). Reports come through the
+    tools, so a report that was just viewed is served from the cache.
+
+    Returns:
+        Tuple of (result, error response or None)
+    """
+    if report not in ('capitation-report', 'income-providers'):
+        return None, (jsonify({"error": f"Unknown report: {report}", "success": False}), 404)
+
+    practice_id = request.args.get('practice_id', 1, type=int)
+    practice_location_id = request.args.get('practice_location_id', type=int)
+
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        if report == 'capitation-report':
+            result = loop.run_until_complete(indici_tools.get_provider_capitation_report(
+                practice_id=practice_id,
+                date_from=request.args.get('date_from'),
+                date_to=request.args.get('date_to'),
+                provider_name=request.args.get('provider_name'),
+                location_id=request.args.get('location_id'),
+                practice_location_id=practice_location_id
+            ))
+        else:
+            result = loop.run_until_complete(indici_tools.get_all_income_providers(
+                practice_id=practice_id,
+                practice_location_id=practice_location_id or 1
+            ))
+    finally:
+        loop.close()
+
+    if not result.get("success", True):
+        return None, (jsonify({"error": result.get("error", "Unknown error"), "success": False}), 502)
+    return result, None
+
+@app.route('/api/print/<handle>')
+def print_report_view(handle):
+    """Render the print layout of a report delivered with a print handle."""
+    try:
+        report_data = indici_tools.get_print_report(handle)
+        if report_data is None:
+            return jsonify({"error": "This report is no longer available for printing. Please run it again.", "success": False}), 404
+
+        validator, weak = indici_tools.result_etag(report_data)
+        etag = f"{validator}-print"
+        not_modified = _not_modified(etag, weak)
+        if not_modified is not None:
+            return not_modified
+
+        response = make_response(indici_tools.format_print_report(report_data))
+        response.headers['Content-Type'] = 'text/html; charset=utf-8'
+        response.headers['Cache-Control'] = 'private, no-cache'
+        response.set_etag(etag, weak=weak)
+        return response
+    except Exception as e:
+        logger.error(f"Error rendering print view: {e}")
+        return jsonify({"error": str(e), "success": False}), 500
+
+@app.route('/api/reports/<report>')
+def get_report_data(report):
+    """
+    Get a capitation report or income providers list as structured JSON.
+
+    Takes the same query parameters as the export endpoint. Responses carry an
+    ETag, so clients revalidating an unchanged report get a 304 without the
+    payload being rebuilt or sent.
+    """
+    try:
+        result, error = _fetch_report_for_request(report)
+        if error is not None:
+            return error
+
+        validator, weak = indici_tools.result_etag(result)
+        etag = f"{validator}-json"
+        not_modified = _not_modified(etag, weak)
+        if not_modified is not None:
+            return not_modified
+
+        if report == 'capitation-report':
+            payload = indici_tools.format_report_data(result)
+        else:
+            payload = indici_tools.format_income_providers_data(result.get("data", {}))
+
+        response = make_response(to_json(payload))
+        response.headers['Content-Type'] = 'application/json'
+        response.headers['Cache-Control'] = 'private, no-cache'
+        response.set_etag(etag, weak=weak)
+        return response
+    except Exception as e:
+        logger.error(f"Error getting {report} data: {e}")
+        return jsonify({"error": str(e), "success": False}), 500
+
+@app.route('/api/export/<report>')
+def export_report(report):
+    """
+    Stream a capitation report or income providers list as CSV, XLSX or PDF.
+
+    Takes the report query parameters plus format. Exporting a report that
+    was just viewed is served from the report cache, and an unchanged export
+    revalidated with If-None-Match is answered with a 304.
+    """
+    export_format = request.args.get('format', 'csv').lower()
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({"error": f"format must be one of: {', '.join(EXPORT_FORMATS)}", "success": False}), 400
+
+    try:
+        result, error = _fetch_report_for_request(report)
+        if error is not None:
+            return error
+
+        validator, weak = indici_tools.result_etag(result)
+        etag = f"{validator}-{export_format}"
+        not_modified = _not_modified(etag, weak)
+        if not_modified is not None:
+            return not_modified
+
+        if report == 'capitation-report':
+            sheet = capitation_report_sheet(result)
+        else:
+            sheet = income_providers_sheet(result.get("data", {}))
+
+        filename = f"{report}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.{export_format}"
+        # A generator body is sent with chunked transfer encoding
+        response = Response(
+            iter_export(sheet, export_format),
+            content_type=EXPORT_FORMATS[export_format],
+            headers={
+                'Content-Disposition': f'attachment; filename="{filename}"',
+                'Cache-Control': 'private, no-cache'
+            }
+        )
+        response.set_etag(etag, weak=weak)
+        return response
+    except Exception as e:
+        logger.error(f"Error exporting {report}: {e}")
+        return jsonify({"error": str(e), "success": False}), 500
+
 @app.route('/api/diagnose', methods=['POST'])
 def diagnose_message():
     """Diagnose how a message would be processed."""
@@ -947,11 +1170,13 @@ def handle_user_message(data):
                 loop = asyncio.new_event_loop()
                 asyncio.set_event_loop(loop)
 
-                # Handle the message
+                # Handle the message; upstream requests are queued fairly per user
                 logger.info(f"🤖 Calling chat_handler.handle_message...")
-                response_data = loop.run_until_complete(
-                    chat_handler.handle_message(message, session_id)
-                )
+                client = (user_context or {}).get('userPrincipalName') or session_id
+                with upstream_context(priority=INTERACTIVE, client=client):
+                    response_data = loop.run_until_complete(
+                        chat_handler.handle_message(message, session_id)
+                    )
                 logger.info(f"✅ Chat handler response: {response_data}")
 
                 loop.close()
@@ -496,6 +496,22 @@ class TeamsAuthManager:
             sso_logger.error(f"[AD_LOGIN] Exception during AD login for user {username}: {str(e)}")
             return None
 
+    def forget_ad_login(self, username: str) -> bool:
+        """
+        Drop the cached AD login of a user who signed out.
+
+        Args:
+            username: User's email/username from Teams authentication
+
+        Returns:
+            True if a cached login was removed
+        """
+        from mcp_server.tools import indici_tools
+
+        removed = indici_tools.invalidate_ad_login(username)
+        sso_logger.info(f"[AD_LOGIN] Cached AD login {'cleared' if removed else 'not found'} for user: {username}")
+        return removed
+
 # Global authentication manager instance
 auth_manager = TeamsAuthManager()
 
@@ -613,3 +629,23 @@ def get_current_user() -> Optional[Dict[str, Any]]:
 def get_teams_token() -> Optional[str]:
     """Get current Teams token from Flask's g object."""
     return getattr(g, 'teams_token', None)
+
+# Claims holding the sign-in name, in the order the AD login uses them:
+# Teams/Azure AD token claims first, then Microsoft Graph user fields
+USERNAME_CLAIMS = ('preferred_username', 'email', 'upn', 'unique_name', 'userPrincipalName', 'mail')
+
+def get_username(user_info: Optional[Dict[str, Any]]) -> str:
+    """
+    Get the username the AD login is keyed by from token claims or Graph user info.
+
+    Args:
+        user_info: Token payload or Microsoft Graph user info
+
+    Returns:
+        The first non-empty username claim, or an empty string
+    """
+    for claim in USERNAME_CLAIMS:
+        value = (user_info or {}).get(claim)
+        if value:
+            return value
+    return ''
@@ -1,30 +1,44 @@
 // Indici Reports Assistant - Frontend JavaScript
 
 // Global print function for provider capitation reports - Teams compatible
-window.openPrintWindow = function(printContent) {
+window.openPrintWindow = function(printContent, printHandle) {
     console.log('Opening print window...');
 
+    // Reports delivered with a print handle have their print layout rendered on demand
+    if (!printContent && !printHandle) {
+        const chatMessages = document.getElementById('chat-messages');
+        const handleElement = chatMessages && chatMessages.lastElementChild
+            ? chatMessages.lastElementChild.querySelector('[data-print-handle]')
+            : null;
+        printHandle = handleElement ? handleElement.dataset.printHandle : null;
+    }
+
+    if (!printContent && printHandle) {
+        fetchPrintContent(printHandle)
+            .then(content => window.openPrintWindow(content))
+            .catch(error => {
+                console.error('Error loading print view:', error);
+                alert(error.message || 'Could not load the print view. Please run the report again.');
+            });
+        return;
+    }
+
     // If no content provided, try to get it from the page
     if (!printContent) {
         // Look for print content in the latest chat message
         const chatMessages = document.getElementById('chat-messages');
         const lastMessage = chatMessages.lastElementChild;
         if (lastMessage) {
-            const printContentElement = lastMessage.querySelector('#printContent');
-            if (printContentElement) {
-                printContent = printContentElement.innerHTML;
-            } else {
-                // Extract table content from the message
-                const tables = lastMessage.querySelectorAll('table');
-                if (tables.length > 0) {
-                    let extractedContent = '<div class="print-container">';
-                    extractedContent += '<div class="print-header"><h2>Provider Capitation Report</h2></div>';
-                    tables.forEach(table => {
-                        extractedContent += table.outerHTML;
-                    });
-                    extractedContent += '</div>';
-                    printContent = extractedContent;
-                }
+            // Extract table content from the message
+            const tables = lastMessage.querySelectorAll('table');
+            if (tables.length > 0) {
+                let extractedContent = '<div class="print-container">';
+                extractedContent += '<div class="print-header"><h2>Provider Capitation Report</h2></div>';
+                tables.forEach(table => {
+                    extractedContent += table.outerHTML;
+                });
+                extractedContent += '</div>';
+                printContent = extractedContent;
             }
         }
     }
@@ -64,6 +78,16 @@ window.openPrintWindow = function(printContent) {
     }
 };
 
+// Fetch the print layout of a report handle from the server
+async function fetchPrintContent(printHandle) {
+    const response = await fetch(`/api/print/${encodeURIComponent(printHandle)}`);
+    if (!response.ok) {
+        const data = await response.json().catch(() => ({}));
+        throw new Error(data.error || `Print view unavailable (HTTP ${response.status})`);
+    }
+    return response.text();
+}
+
 // Extract table data directly from the current page for MS Teams
 function extractAndFormatTableData() {
     console.log('🖨️ TEAMS: Extracting table data directly from current page');
@@ -835,6 +859,16 @@ window.sendMessage = function(message) {
     }
 };
 
+// Escape text for safe insertion into HTML built from structured data
+function escapeHtml(value) {
+    return String(value)
+        .replace(/&/g, '&amp;')
+        .replace(/</g, '&lt;')
+        .replace(/>/g, '&gt;')
+        .replace(/"/g, '&quot;')
+        .replace(/'/g, '&#39;');
+}
+
 class IndiciChatApp {
     constructor() {
         this.socket = null;
@@ -1097,6 +1131,7 @@ class IndiciChatApp {
             const reportContainer = document.createElement('div');
             reportContainer.className = 'report-container';
             reportContainer.innerHTML = text;
+            this.renderStructuredReports(reportContainer);
             content.appendChild(reportContainer);
 
             // Check if this is a print request and auto-trigger print
@@ -1172,6 +1207,164 @@ class IndiciChatApp {
     clearChatMessages() {
         this.chatMessages.innerHTML = '';
     }
+
+    // Render structured (JSON) tool output embedded in a bot message
+    renderStructuredReports(container) {
+        container.querySelectorAll('.structured-report').forEach(element => {
+            const script = element.querySelector('script[type="application/json"]');
+            if (!script) return;
+
+            let data;
+            try {
+                data = JSON.parse(script.textContent);
+            } catch (error) {
+                console.error('Invalid structured report data:', error);
+                element.innerHTML = '<div class="alert alert-danger">❌ Could not display report data</div>';
+                return;
+            }
+
+            if (data.kind === 'capitation_report') {
+                element.innerHTML = this.renderCapitationReport(data, 'report');
+
+                // Providers can be re-sorted without another server round trip
+                element.addEventListener('change', (event) => {
+                    if (event.target.classList.contains('rpt-sort')) {
+                        element.innerHTML = this.renderCapitationReport(data, event.target.value);
+                    }
+                });
+            } else if (data.kind === 'batch_capitation_report') {
+                element.innerHTML = this.renderBatchReport(data);
+
+                // Each section's providers can be re-sorted on their own
+                element.addEventListener('change', (event) => {
+                    if (!event.target.classList.contains('rpt-sort')) return;
+                    const container = event.target.closest('.rpt-batch-report');
+                    const section = container && data.sections[Number(container.dataset.section)];
+                    if (section && section.report) {
+                        container.innerHTML = this.renderCapitationReport(section.report, event.target.value);
+                    }
+                });
+            } else if (data.kind === 'income_providers') {
+                element.innerHTML = this.renderIncomeProviders(data);
+            }
+        });
+    }
+
+    renderCapitationReport(data, sortKey) {
+        if (!data.success) {
+            return `<div class="alert alert-danger">❌ Report generation failed: ${escapeHtml(data.error || 'Unknown error')}</div>`;
+        }
+
+        if (!data.providers.length) {
+            const filter = data.meta.providerName ? ` for this provider (${escapeHtml(data.meta.providerName)})` : '';
+            const suggestions = (data.meta.providerSuggestions || []).length
+                ? `<br><small>Did you mean: ${escapeHtml(data.meta.providerSuggestions.join(', '))}?</small>`
+                : '';
+            return `<div class="w-100 rpt-wrap"><div class="alert alert-danger text-center"><strong>No record found${filter}</strong>${suggestions}</div></div>`;
+        }
+
+        const providers = data.providers.slice();
+        if (sortKey === 'name') {
+            providers.sort((a, b) => a.name.localeCompare(b.name));
+        } else if (sortKey === 'amount') {
+            providers.sort((a, b) => b.totalAmount - a.totalAmount);
+        }
+
+        const sortOptions = [['report', 'Report order'], ['name', 'Provider name'], ['amount', 'Total amount']]
+            .map(([value, label]) => `<option value="${value}"${value === sortKey ? ' selected' : ''}>${label}</option>`)
+            .join('');
+
+        const parts = [
+            '<div class="w-100 rpt-wrap"><div class="card border-0 w-100">',
+            '<div class="card-header bg-primary text-white"><h4 class="mb-0">📊 Provider Capitation Report</h4></div>',
+            '<div class="card-body p-2 w-100">',
+            `<div class="mb-2 d-flex justify-content-between align-items-center"><span><strong>Total Records:</strong> ${data.meta.totalRecords}</span>`,
+            `<select class="form-select form-select-sm w-auto rpt-sort" aria-label="Sort providers">${sortOptions}</select></div>`
+        ];
+
+        providers.forEach((provider, position) => {
+            parts.push(
+                `<div class="mb-3 w-100 ${position > 0 ? 'mt-3' : ''}">`,
+                `<h5 class="rpt-provider">${escapeHtml(provider.name)}</h5>`,
+                '<table class="table table-bordered mb-1 w-100 rpt-table"><thead><tr>',
+                '<th scope="col">AgeRange</th><th scope="col" class="text-end">CapitationAmount</th>',
+                '<th scope="col" class="text-end">Quantity</th><th scope="col" class="text-end">TotalAmount</th>',
+                '</tr></thead><tbody>'
+            );
+            provider.rows.forEach(([ageIndex, capitationAmount, quantity, totalAmount]) => {
+                parts.push(
+                    `<tr><td>${escapeHtml(data.ageRanges[ageIndex])}</td>`,
+                    `<td class="text-end">${capitationAmount.toFixed(2)}</td>`,
+                    `<td class="text-end">${quantity}</td>`,
+                    `<td class="text-end">${totalAmount.toFixed(2)}</td></tr>`
+                );
+            });
+            parts.push(
+                '<tr class="rpt-total"><td>Total</td><td></td>',
+                `<td class="text-end">${provider.totalQuantity}</td>`,
+                `<td class="text-end">${provider.totalAmount.toFixed(2)}</td></tr>`,
+                '</tbody></table></div>'
+            );
+        });
+
+        parts.push('</div></div></div>');
+        return parts.join('');
+    }
+
+    renderBatchReport(data) {
+        if (!data.success && !data.sections) {
+            return `<div class="alert alert-danger">❌ Report generation failed: ${escapeHtml(data.error || 'Unknown error')}</div>`;
+        }
+
+        const meta = data.meta;
+        const period = meta.dateFrom && meta.dateTo ? `${meta.dateFrom} to ${meta.dateTo}` : (meta.dateFrom ? `from ${meta.dateFrom}` : 'All dates');
+        const parts = [
+            '<div class="w-100 rpt-wrap"><div class="card border-0 w-100">',
+            `<div class="card-header bg-primary text-white"><h4 class="mb-0">📊 Provider Capitation Report - ${data.sections.length} Reports</h4></div>`,
+            '<div class="card-body p-2 w-100">',
+            `<div class="mb-2"><strong>Period:</strong> ${escapeHtml(period)} &nbsp;&nbsp;&nbsp; `,
+            `<strong>Reports:</strong> ${meta.succeeded} of ${data.sections.length} &nbsp;&nbsp;&nbsp; `,
+            `<strong>Total Quantity:</strong> ${data.totals.quantity} &nbsp;&nbsp;&nbsp; `,
+            `<strong>Total Amount:</strong> ${Number(data.totals.amount).toFixed(2)}</div>`
+        ];
+
+        data.sections.forEach((section, index) => {
+            parts.push(
+                '<div class="w-100 mt-3 pt-2 rpt-section">',
+                `<h4 class="rpt-section-title">${escapeHtml(section.label)}</h4>`
+            );
+            if (!section.success) {
+                parts.push(`<div class="alert alert-warning mb-0">⚠️ Report could not be retrieved: ${escapeHtml(section.error || 'Unknown error')}</div></div>`);
+                return;
+            }
+            parts.push(
+                `<div class="mb-2"><strong>Total Quantity:</strong> ${section.totals.quantity} &nbsp;&nbsp;&nbsp; `,
+                `<strong>Total Amount:</strong> ${Number(section.totals.amount).toFixed(2)}</div>`,
+                `<div class="rpt-batch-report" data-section="${index}">${this.renderCapitationReport(section.report, 'report')}</div>`,
+                '</div>'
+            );
+        });
+
+        parts.push('</div></div></div>');
+        return parts.join('');
+    }
+
+    renderIncomeProviders(data) {
+        if (!data.success || !data.providers.length) {
+            return '<div class="w-100 rpt-wrap"><div class="alert alert-info text-center"><strong>No income providers found for Provider Capitation Report</strong></div></div>';
+        }
+
+        const rows = data.providers.map(name => `<tr><td>${escapeHtml(name)}</td></tr>`).join('');
+        return [
+            '<div class="w-100 rpt-wrap"><div class="card border-0 shadow-sm">',
+            '<div class="card-header bg-info text-white"><h4 class="mb-0">👥 Income Providers for Provider Capitation Report</h4></div>',
+            '<div class="card-body p-2 w-100">',
+            `<div class="mb-2"><strong>Total Providers:</strong> ${data.totalRecords}</div>`,
+            '<div class="table-responsive"><table class="table table-striped table-hover mb-0 ip-simple">',
+            `<thead class="table-dark"><tr><th>Provider Full Name</th></tr></thead><tbody>${rows}</tbody>`,
+            '</table></div></div></div></div>'
+        ].join('');
+    }
     
     async loadSampleQueries() {
         try {